@@ -0,0 +1,78 @@
+import math
+import os
+import sys
+import time
+
+# Lets this script import the program modules from src
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import numpy as np
+from DoBotArm.CommandDispatcher import CommandDispatcher
+from DoBotArm.DobotArm import DobotArm
+
+# Drives DobotArm on the simulated link ("sim" backend) through the command dispatcher the way the tracker does (one target per camera frame)
+# and reports how long commands take to be accepted, how many were coalesced and how many faulted, with immediate
+# CP moves and with queued CP streaming. "lag" is how far the simulated arm trails the target, sampled every frame,
+# "restarts" counts CP motions that started from rest instead of blending into the previous one.
+# Usage: python armLoadTest.py [seconds] [latency ms]
+
+FRAME_RATES = [15, 30, 60]
+MODES = {"immediate": None, "streamed": {"enabled": True, "lookahead": 3, "lookahead_ms": 60}}
+CIRCLE_CENTER = (220, 0, 30)
+CIRCLE_RADIUS = 60
+CIRCLE_PERIOD = 6.0  # Seconds per lap of the target path
+
+
+def run(frame_rate, seconds, latency_ms, streaming):
+    arm = DobotArm(backend="sim", streaming=streaming,
+                   simulation={"latency_ms": latency_ms, "jitter_ms": latency_ms * 0.4, "seed": 1})
+    arm.connect("simulated", 115200)
+    dispatcher = CommandDispatcher(arm)
+
+    acks = []
+    faults = []
+    lags = []
+    submitted = 0
+    start = time.perf_counter()
+    next_frame = start
+    while next_frame - start < seconds:
+        now = time.perf_counter()
+        angle = 2 * math.pi * (now - start) / CIRCLE_PERIOD
+        x = CIRCLE_CENTER[0] + CIRCLE_RADIUS * math.cos(angle)
+        y = CIRCLE_CENTER[1] + CIRCLE_RADIUS * math.sin(angle)
+
+        def done(future, sent=now):
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                faults.append(future.exception())
+            else:
+                acks.append(time.perf_counter() - sent)
+        dispatcher.move_to(x, y, CIRCLE_CENTER[2]).add_done_callback(done)
+        submitted += 1
+        if now - start > 1.0:  # Skip the approach from the home position
+            pose = arm.link.controller.GetPose()
+            lags.append(math.dist(pose[:2], (x, y)))
+
+        next_frame += 1 / frame_rate
+        time.sleep(max(next_frame - time.perf_counter(), 0))
+
+    dispatcher.stop()
+    p50, p95, p99 = (np.percentile(acks, [50, 95, 99]) * 1000).tolist() if acks else (0.0, 0.0, 0.0)
+    lag = float(np.mean(lags)) if lags else 0.0
+    restarts = arm.link.controller.cp_restarts
+    arm.disconnect()
+    return submitted, len(acks), dispatcher.coalesced, len(faults), p50, p95, p99, arm.link.command_counts["SetCPCmd"], lag, restarts
+
+
+if __name__ == "__main__":
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    latency_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 10.0
+
+    print(f"{'mode':<9} {'fps':>4} | {'sent':>5} {'acked':>5} {'merged':>6} {'faults':>6} {'SetCPCmd/s':>10} | "
+          f"{'ack p50':>8} {'p95':>7} {'p99':>7} ms | {'lag':>6} mm {'restarts/s':>10}")
+    for mode, streaming in MODES.items():
+        for frame_rate in FRAME_RATES:
+            submitted, acked, coalesced, faults, p50, p95, p99, sent, lag, restarts = run(frame_rate, seconds, latency_ms, streaming)
+            print(f"{mode:<9} {frame_rate:>4} | {submitted:>5} {acked:>5} {coalesced:>6} {faults:>6} {sent / seconds:>10.1f} | "
+                  f"{p50:>8.1f} {p95:>7.1f} {p99:>7.1f}    | {lag:>6.1f}    {restarts / seconds:>10.1f}")
@@ -0,0 +1,92 @@
+import ctypes
+import ctypes.util
+import os
+import platform
+import sys
+import time
+
+# Lets this script import the program modules from src
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from ctypes import POINTER, byref, c_bool, c_int, c_uint64
+from DoBotArm import DobotDllType as dType
+
+# Measures the Python side cost of one DobotDllType call on the hot SetCPCmd and GetPose paths: the wrappers as they
+# were (fresh structs/out-params, c_int()/byref() per argument), the current wrappers (per thread buffers, plain ints
+# and cached pointers) and the current wrappers with argtypes declared (which DobotDllType leaves out for this cost). The DLL itself is replaced by a
+# C function that returns 0 straight away (abs() of the handle's masterId, which is 0 while nothing is connected), so only the
+# ctypes marshalling and wrapper overhead is timed. Each figure is the best of REPEATS batches.
+# Usage: python dllCallBenchmark.py [calls]
+
+REPEATS = 5
+
+
+def stubFunction():
+    libc = ctypes.cdll.msvcrt if platform.system() == "Windows" else ctypes.CDLL(ctypes.util.find_library("c"))
+    return libc["abs"]  # Indexing returns a new function object every time, so each can get its own prototype
+
+
+ARGTYPES = {
+    "SetCPCmd": [c_int, c_int, POINTER(dType.CPCmd), c_bool, POINTER(c_uint64)],
+    "GetPose": [c_int, c_int, POINTER(dType.Pose)],
+}
+
+
+# Stands in for the loaded DLL, one stub function per benchmarked symbol, with argtypes declared when checked
+class StubApi:
+    def __init__(self, checked=False):
+        for name, argtypes in ARGTYPES.items():
+            function = stubFunction()
+            if checked:
+                function.argtypes = argtypes
+            setattr(self, name, function)
+
+
+# The wrappers before the prototypes, kept here as the baseline
+def legacySetCPCmd(api, cpMode, x, y, z, velocity, isQueued=0):
+    cmd = dType.CPCmd()
+    cmd.cpMode = cpMode
+    cmd.x = x
+    cmd.y = y
+    cmd.z = z
+    cmd.velocity = velocity
+    queuedCmdIndex = c_uint64(0)
+    result = dType.callWithRetry(api.SetCPCmd, c_int(api.masterId), c_int(api.slaveId), byref(cmd), isQueued, byref(queuedCmdIndex))
+    return [queuedCmdIndex.value]
+
+
+def legacyGetPose(api):
+    pose = dType.Pose()
+    result = dType.callWithRetry(api.GetPose, c_int(api.masterId), c_int(api.slaveId), byref(pose))
+    return [pose.x, pose.y, pose.z, pose.rHead, pose.joint1Angle, pose.joint2Angle, pose.joint3Angle, pose.joint4Angle]
+
+
+def timeCalls(call, calls):
+    call()
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for _ in range(calls // REPEATS):
+            call()
+        best = min(best, (time.perf_counter() - start) / (calls // REPEATS))
+    return best * 1e6
+
+
+if __name__ == "__main__":
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    legacy_api = dType.DobotHandle(StubApi())
+    buffered_api = dType.DobotHandle(StubApi())
+    checked_api = dType.DobotHandle(StubApi(checked=True))
+
+    cases = [
+        ("SetCPCmd", lambda: legacySetCPCmd(legacy_api, 0, 200.0, 0.0, 50.0, 100.0),
+         lambda: dType.SetCPCmd(buffered_api, 0, 200.0, 0.0, 50.0, 100.0),
+         lambda: dType.SetCPCmd(checked_api, 0, 200.0, 0.0, 50.0, 100.0)),
+        ("GetPose", lambda: legacyGetPose(legacy_api), lambda: dType.GetPose(buffered_api), lambda: dType.GetPose(checked_api)),
+    ]
+    print(f"{'call':<9} | {'legacy':>8} {'buffers':>8} {'checked':>8} us/call | {'saved':>6}")
+    for name, legacy, buffered, checked in cases:
+        before = timeCalls(legacy, calls)
+        after = timeCalls(buffered, calls)
+        with_checks = timeCalls(checked, calls)
+        print(f"{name:<9} | {before:>8.2f} {after:>8.2f} {with_checks:>8.2f}         | {(1 - after / before) * 100:>5.0f}%")
@@ -0,0 +1,68 @@
+import os
+import sys
+import time
+
+# Lets this script import the program modules from src
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import cv2
+from GUI.HandDetector import createHandDetector
+
+# Compares per-frame hand inference latency (wall clock and CPU time) across detector settings.
+# Usage: python inferenceBenchmark.py [camera index or image path]
+
+FRAMES = 100
+WARMUP_FRAMES = 10
+FRAME_SIZE = (1080, 720)  # Same size the tracker hands to inference
+
+SETTINGS = [
+    {"model_complexity": 1, "max_num_hands": 2, "input_scale": 1.0, "roi_tracking": False},  # MediaPipe defaults (previous tracker setup)
+    {"model_complexity": 1, "max_num_hands": 1, "input_scale": 1.0, "roi_tracking": False},
+    {"model_complexity": 0, "max_num_hands": 1, "input_scale": 1.0, "roi_tracking": False},
+    {"model_complexity": 0, "max_num_hands": 1, "input_scale": 0.5, "roi_tracking": False},
+    {"model_complexity": 0, "max_num_hands": 1, "input_scale": 0.33, "roi_tracking": False},
+    {"model_complexity": 0, "max_num_hands": 1, "input_scale": 1.0, "roi_tracking": True},
+]
+
+
+# Grab a single test frame so every setting sees exactly the same image
+def loadFrame(source):
+    if source is not None and os.path.isfile(source):
+        img = cv2.imread(source)
+    else:
+        cap = cv2.VideoCapture(int(source) if source is not None else 0)
+        success, img = cap.read()
+        cap.release()
+        if not success:
+            print("Error: Could not read a frame from the camera.")
+            sys.exit(1)
+    return cv2.cvtColor(cv2.resize(img, FRAME_SIZE), cv2.COLOR_BGR2RGB)
+
+
+def benchmark(settings, imgRGB):
+    start = time.perf_counter()
+    detector = createHandDetector(settings)
+    loadTime = time.perf_counter() - start
+
+    for _ in range(WARMUP_FRAMES):
+        detector.process(imgRGB)
+
+    found = 0
+    wallStart, cpuStart = time.perf_counter(), time.process_time()
+    for _ in range(FRAMES):
+        if detector.process(imgRGB).multi_hand_landmarks:
+            found += 1
+    wallTime = (time.perf_counter() - wallStart) / FRAMES
+    cpuTime = (time.process_time() - cpuStart) / FRAMES
+    detector.close()
+    return loadTime, wallTime, cpuTime, found
+
+
+if __name__ == "__main__":
+    imgRGB = loadFrame(sys.argv[1] if len(sys.argv) > 1 else None)
+
+    print(f"{'complexity':>10} {'hands':>5} {'scale':>5} {'roi':>5} | {'load s':>7} {'wall ms':>8} {'cpu ms':>7} {'fps':>6} {'found':>6}")
+    for settings in SETTINGS:
+        loadTime, wallTime, cpuTime, found = benchmark(settings, imgRGB)
+        print(f"{settings['model_complexity']:>10} {settings['max_num_hands']:>5} {settings['input_scale']:>5} {str(settings['roi_tracking']):>5} | "
+              f"{loadTime:>7.2f} {wallTime * 1000:>8.2f} {cpuTime * 1000:>7.2f} {1 / wallTime:>6.1f} {found:>3}/{FRAMES}")
@@ -0,0 +1,84 @@
+import math
+import os
+import random
+import sys
+import timeit
+from types import SimpleNamespace
+
+# Lets this script import the program modules from src
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import numpy as np
+from DoBotArm import gestureInterpretation, coordProcessing
+
+# Microbenchmark of the per-frame Python overhead of landmark handling: the code from before the helpers were
+# moved into coordProcessing (old) vs the current helpers (new), plus the (21, 3) array a recorded frame adds
+
+FRAMES = 20000
+WRIST_IDX = 0
+MID_KNUCKLE_IDX = 9
+RING_KNUCKLE_IDX = 13
+THRESHOLD = 0.1
+PIX_W, PIX_H = 1080, 720
+
+
+# Random hand.landmark list, real MediaPipe protobufs when available (attribute access costs more on those)
+def fakeLandmarks():
+    try:
+        from mediapipe.framework.formats import landmark_pb2
+        hand = landmark_pb2.NormalizedLandmarkList()
+        for _ in range(21):
+            hand.landmark.add(x=random.random(), y=random.random(), z=random.random())
+        return hand.landmark
+    except ImportError:
+        return [SimpleNamespace(x=random.random(), y=random.random(), z=random.random()) for _ in range(21)]
+
+
+# *** Old per-frame path (copied from before the helpers were moved) ***
+def oldDetermineFingers(landmarks):
+    first = abs(landmarks[8].y - landmarks[5].y) > THRESHOLD
+    middle = abs(landmarks[12].y - landmarks[9].y) > THRESHOLD
+    ring = abs(landmarks[16].y - landmarks[13].y) > THRESHOLD
+    pinky = abs(landmarks[20].y - landmarks[17].y) > THRESHOLD+0.04
+    thumb = abs(math.hypot(landmarks[3].x - landmarks[5].x, landmarks[3].y - landmarks[5].y)) > THRESHOLD-0.02
+    return (first, middle, ring, pinky, thumb)
+
+def oldDetermineZCoord(landmarks):
+    distance = math.sqrt((landmarks[MID_KNUCKLE_IDX].x - landmarks[WRIST_IDX].x) ** 2 +
+                         (landmarks[MID_KNUCKLE_IDX].y - landmarks[WRIST_IDX].y) ** 2)
+    distance = max(min(distance, 0.5), 0.3)
+    return (distance - 0.3) / (0.5 - 0.3) * 180 - 90
+
+def oldFrame(landmarks):
+    sum_x = sum_y = 0
+    for datapoint_id, point in enumerate(landmarks):
+        x, y = int(point.x * PIX_W), int(point.y * PIX_H)
+        if datapoint_id in [MID_KNUCKLE_IDX, RING_KNUCKLE_IDX, WRIST_IDX]:
+            sum_x += x
+            sum_y += y
+    palm = (sum_x / 3, sum_y / 3)
+    return palm, oldDetermineZCoord(landmarks), oldDetermineFingers(landmarks)
+
+
+# *** New per-frame path ***
+def newFrame(landmarks):
+    pixels = [(int(point.x * PIX_W), int(point.y * PIX_H)) for point in landmarks]
+    palm = coordProcessing.palmCentroid(landmarks, PIX_W, PIX_H)
+    return palm, coordProcessing.CoordinateProcessing.determineZCoord(landmarks), gestureInterpretation.determineFingers(landmarks)
+
+
+if __name__ == "__main__":
+    frames = [fakeLandmarks() for _ in range(100)]
+    out = np.empty((coordProcessing.NUM_LANDMARKS, 3), dtype=np.float32)
+
+    # Both paths must agree on the gesture before their timings mean anything
+    for landmarks in frames:
+        assert oldFrame(landmarks)[2] == newFrame(landmarks)[2]
+
+    oldTime = timeit.timeit(lambda: [oldFrame(l) for l in frames], number=FRAMES // len(frames))
+    newTime = timeit.timeit(lambda: [newFrame(l) for l in frames], number=FRAMES // len(frames))
+    recordTime = timeit.timeit(lambda: [coordProcessing.landmarksToArray(l, out) for l in frames], number=FRAMES // len(frames))
+
+    print(f"Old (attribute access): {oldTime / FRAMES * 1e6:.1f} us/frame")
+    print(f"New (helpers):          {newTime / FRAMES * 1e6:.1f} us/frame")
+    print(f"Recording array:        +{recordTime / FRAMES * 1e6:.1f} us/frame")
@@ -0,0 +1,61 @@
+import os
+import sys
+import tempfile
+
+# Lets this script import the program modules from src
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import numpy as np
+from DoBotArm import coordProcessing
+from GUI.SessionRecording import SessionRecorder, SessionReader, SessionReplay
+
+# Checks session replay end to end on a synthetic recording: a hand held perfectly still in arm mode, tracking on.
+# A still hand never gets past HandPhysics' speed threshold, so every frame goes through the "no prediction" path
+# (which used to hand back a tuple that replay could not .tolist()). Every frame must replay to the same move_to.
+# Exits non-zero on failure.
+# Usage: python replayCheck.py
+
+PIX_W, PIX_H = 1080, 720
+FRAMES = 30
+FRAME_INTERVAL = 1 / 30
+
+
+# Landmarks of a hand whose palm maps to about (200, 0, 0) on the Dobot, fingers and thumb closed
+def stationaryHand():
+    points = np.zeros((coordProcessing.NUM_LANDMARKS, 3), dtype=np.float32)
+    points[:, 0] = 0.5
+    points[:, 1] = 0.6
+    points[coordProcessing.WRIST_IDX] = (0.5, 0.8, 0.0)
+    points[coordProcessing.MID_KNUCKLE_IDX] = (0.5, 0.4, 0.0)  # Wrist to knuckle 0.4 maps to z = 0
+    points[coordProcessing.RING_KNUCKLE_IDX] = (0.5, 0.54, 0.0)
+    return points
+
+
+def check(condition, message):
+    if not condition:
+        print(f"FAIL: {message}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    points = stationaryHand()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "stationary.hgsr")
+        recorder = SessionRecorder(path, PIX_W, PIX_H)
+        for frame in range(FRAMES):
+            recorder.writeFrame(frame * FRAME_INTERVAL, points)
+        recorder.close()
+        frames = list(SessionReader(path))
+
+    replay = SessionReplay(pix_w=PIX_W, pix_h=PIX_H)
+    replay.track = True
+    replay.controlMode = 2
+    targets = []
+    for frame, commands in replay.run(frames):
+        moves = [args for name, args in commands if name == "move_to"]
+        check(len(moves) == 1, f"frame at {frame.timestamp:.3f}s sent {commands}, expected one move_to")
+        targets.append(moves[0])
+
+    check(len(targets) == FRAMES, f"replayed {len(targets)} of {FRAMES} frames")
+    check(all(np.allclose(target, targets[0]) for target in targets), "a still hand moved the target")
+    print(f"OK: {FRAMES} stationary frames replayed to move_to{tuple(round(value, 1) for value in targets[0])}")
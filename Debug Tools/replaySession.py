@@ -0,0 +1,78 @@
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import Future
+
+# Lets this script import the program modules from src
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from DoBotArm.ShadowState import ShadowArm
+from fileLoading.fileLoader import load_json_file
+from GUI.SessionRecording import SessionReader, SessionReplay, commandsMatch
+
+# Replays a recorded session (python -m GUI.Tracker --record session.hgsr) through gesture interpretation and
+# coordinate processing as fast as possible, reports throughput and every frame whose commands differ from the recording.
+# The replayed commands also go through the shadow state filter to show how many would actually reach the arm.
+# Usage: python replaySession.py session.hgsr [config.json] [--realtime]
+
+MAX_REPORTED_MISMATCHES = 20
+
+
+# Stands in for the command dispatcher behind the shadow state filter, counts what gets through
+class CommandCounter:
+    def __init__(self):
+        self.counts = Counter()
+
+    def __getattr__(self, name):
+        def command(*args):
+            self.counts[name] += 1
+            future = Future()
+            future.set_result(None)
+            return future
+        return command
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    if not args:
+        print("Usage: python replaySession.py session.hgsr [config.json] [--realtime]")
+        sys.exit(1)
+
+    config_path = args[1] if len(args) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "fileLoading", "config.json")
+    config = load_json_file(config_path) or {}
+
+    loadStart = time.perf_counter()
+    reader = SessionReader(args[0])
+    frames = list(reader)
+    loadTime = time.perf_counter() - loadStart
+
+    replay = SessionReplay(config.get("gesture_settings"), reader.pix_w, reader.pix_h, config.get("jog_settings"))
+    sent = CommandCounter()
+    shadow = ShadowArm(sent, config.get("shadow_settings"))
+    handFrames = commands = 0
+    replayedCommands = []
+    mismatches = []
+    start = time.perf_counter()
+    for frame, replayed in replay.run(frames, realtime="--realtime" in sys.argv):
+        handFrames += frame.points is not None
+        commands += len(replayed)
+        replayedCommands.extend(replayed)
+        if not commandsMatch(frame.commands, replayed):
+            mismatches.append((frame, replayed))
+    elapsed = time.perf_counter() - start
+
+    for name, args in replayedCommands:
+        getattr(shadow, name)(*args)
+
+    for frame, replayed in mismatches[:MAX_REPORTED_MISMATCHES]:
+        print(f"t={frame.timestamp - frames[0].timestamp:8.3f}s recorded {frame.commands} replayed {replayed}")
+
+    duration = frames[-1].timestamp - frames[0].timestamp if frames else 0.0
+    print(f"{len(frames)} frames ({handFrames} with a hand) spanning {duration:.1f}s, loaded in {loadTime * 1000:.1f} ms")
+    print(f"replayed in {elapsed * 1000:.1f} ms: {len(frames) / max(elapsed, 1e-9):.0f} frames/s, "
+          f"{duration / max(elapsed, 1e-9):.0f}x real time, {elapsed / max(len(frames), 1) * 1e6:.1f} us/frame")
+    print(f"{commands} commands replayed, {len(mismatches)} frames differ from the recording")
+    print(f"{sum(sent.counts.values())} would reach the arm after the shadow state filter "
+          f"({', '.join(f'{name} {count}' for name, count in sorted(shadow.suppressed.items())) or 'nothing'} dropped)")
+    sys.exit(1 if mismatches else 0)
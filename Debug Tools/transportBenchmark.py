@@ -0,0 +1,135 @@
+import argparse
+import os
+import socket
+import sys
+import time
+
+# Lets this script import the program modules from src
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import numpy as np
+from DoBotArm import DobotProtocol as protocol
+from DoBotArm.DobotEmulator import DobotEmulator, parseAddress
+from DoBotArm.DobotSerialDriver import DobotSerialDriver
+
+# Measures the cost of the Dobot serial protocol itself (framing, round trips, timeouts and retries) against the
+# emulator: one request at a time like the DLL wrappers, then through DobotSerialDriver waiting on every call
+# and pipelined. Starts an emulator in this process for every scenario unless an address is given, --drop-rate
+# overrides the packet loss of those scenarios.
+# Usage: python transportBenchmark.py [host:port] [--drop-rate 0.01]
+
+REQUESTS = 500
+TIMEOUT = 0.05  # Seconds before a request is considered lost and sent again
+SCENARIOS = [
+    {"latency_ms": 0.0, "jitter_ms": 0.0},
+    {"latency_ms": 5.0, "jitter_ms": 2.0},
+    {"latency_ms": 5.0, "jitter_ms": 2.0, "drop_rate": 0.02, "corrupt_rate": 0.02},
+]
+
+
+# Send one request and wait for its answer, resending on timeout or a corrupted answer (like the DLL's retry loops)
+def roundTrip(connection, parser, packet, command_id):
+    retries = 0
+    while True:
+        connection.sendall(packet)
+        deadline = time.perf_counter() + TIMEOUT
+        while time.perf_counter() < deadline:
+            connection.settimeout(max(deadline - time.perf_counter(), 1e-4))
+            try:
+                data = connection.recv(4096)
+            except socket.timeout:
+                break
+            for response_id, _, params in parser.feed(data):
+                if response_id == command_id:
+                    return params, retries
+        retries += 1
+
+
+def benchmark(address, name, packet, command_id):
+    connection = socket.create_connection(address)
+    connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    parser = protocol.PacketParser()
+    times = []
+    retries = 0
+    for _ in range(REQUESTS):
+        start = time.perf_counter()
+        _, tries = roundTrip(connection, parser, packet, command_id)
+        times.append(time.perf_counter() - start)
+        retries += tries
+    connection.close()
+    p50, p95, p99 = (np.percentile(times, [50, 95, 99]) * 1000).tolist()
+    return p50, p95, p99, retries, REQUESTS / sum(times)
+
+
+# SetCPCmd through the driver, waiting for every answer or keeping its pipeline full
+def driverBenchmark(address, label):
+    driver = DobotSerialDriver(timeout=TIMEOUT)
+    driver.connect(f"tcp://{address[0]}:{address[1]}", 115200)
+
+    start = time.perf_counter()
+    for i in range(REQUESTS):
+        try:
+            driver.SetCPCmd(1, 200 + i % 20, 0, 50, 100)
+        except Exception:
+            pass
+    sequential = (time.perf_counter() - start) / REQUESTS
+
+    start = time.perf_counter()
+    futures = [driver.send("SetCPCmd", 1, 200.0 + i % 20, 0.0, 50.0, 100.0, write=True) for i in range(REQUESTS)]
+    answered = 0
+    for future in futures:
+        try:
+            future.result(1.0)
+            answered += 1
+        except Exception:
+            pass
+    pipelined = (time.perf_counter() - start) / REQUESTS
+    driver.disconnect()
+
+    print(f"{label:<38} driver    | {sequential * 1000:>7.2f} ms/call waiting, {pipelined * 1000:.2f} ms/call pipelined "
+          f"({answered}/{REQUESTS} answered, {driver.lost} lost, {driver.resent} resent)")
+
+
+def packingBenchmark():
+    command = protocol.COMMANDS["SetCPCmd"]
+    packet = protocol.encodePacket(command, protocol.CTRL_WRITE, 1, 200.0, 0.0, 50.0, 100.0)
+    for name, pack in [("encodePacket", lambda: protocol.encodePacket(command, protocol.CTRL_WRITE, 1, 200.0, 0.0, 50.0, 100.0)),
+                       ("packInto", lambda: protocol.packInto(packet, command, protocol.CTRL_WRITE, 1, 200.0, 0.0, 50.0, 100.0))]:
+        start = time.perf_counter()
+        for _ in range(100000):
+            pack()
+        print(f"{name:<12} {(time.perf_counter() - start) * 10:.2f} us/packet")
+
+
+def run(address, label):
+    requests = [
+        ("GetPose", protocol.encodePacket(protocol.COMMANDS["GetPose"], 0), protocol.COMMANDS["GetPose"].id),
+        ("SetCPCmd", protocol.encodePacket(protocol.COMMANDS["SetCPCmd"], protocol.CTRL_WRITE, 1, 200.0, 0.0, 50.0, 100.0),
+         protocol.COMMANDS["SetCPCmd"].id),
+    ]
+    for name, packet, command_id in requests:
+        p50, p95, p99, retries, rate = benchmark(address, name, packet, command_id)
+        print(f"{label:<38} {name:<9} | {p50:>7.2f} {p95:>7.2f} {p99:>7.2f} ms | {retries:>7} {rate:>8.0f}/s")
+    driverBenchmark(address, label)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dobot serial protocol benchmark against the emulator")
+    parser.add_argument("address", nargs="?", help="Emulator already running at host:port (default: start one per scenario)")
+    parser.add_argument("--drop-rate", type=float, default=None, help="Share of packets the in-process emulator drops")
+    args = parser.parse_args()
+    if args.address and args.drop_rate is not None:
+        parser.error("--drop-rate only applies to the in-process emulator, start the remote one with its own --drop-rate")
+
+    print(f"{'scenario':<38} {'command':<9} | {'p50':>7} {'p95':>7} {'p99':>7}    | {'retries':>7} {'rate':>10}")
+    if args.address:
+        run(parseAddress(args.address), args.address)
+    else:
+        for settings in SCENARIOS:
+            if args.drop_rate is not None:
+                settings = dict(settings, drop_rate=args.drop_rate)
+            emulator = DobotEmulator(dict(settings, seed=1))
+            address = emulator.startTcp()
+            run(address, ", ".join(f"{key} {value}" for key, value in settings.items()))
+            emulator.stop()
+    packingBenchmark()
@@ -0,0 +1,137 @@
+import math
+import threading
+import time
+from DoBotArm import DobotDllType as dType
+
+# Default streaming settings, overridden by the arm's "cp_streaming" entry in config.json
+DEFAULT_STREAMING_SETTINGS = {
+    "enabled": False,
+    "lookahead": 3,        # Most CP points queued ahead of the arm (a cap, the queue normally holds fewer)
+    "lookahead_ms": 60,    # Queued motion kept ahead of the arm, more blends more safely but trails the hand further
+    "velocity": 100,       # CP velocity sent with every point
+    "min_step_mm": 1.0     # Targets closer than this to the last queued point are not worth a queue slot
+}
+
+
+# Streams motion targets to the controller as queued (isQueued=1) absolute CP points, so the arm blends from one
+# point into the next instead of aborting and restarting a motion on every frame.
+#
+# A new point is only queued when the motion already queued is about to run out (less than lookahead_ms of travel
+# left at the streaming velocity, estimated locally from the queued points), so each point is the freshest target
+# at the moment the arm needs one and the queue never fills with stale targets. A target arriving earlier is held
+# back: the newest held target replaces any older one and is queued by a timer once the queue has drained that far,
+# so the last target of a hand that stopped moving (no further frames) still reaches the arm.
+#
+# On top of that the queue is capped at lookahead points: every queued command returns its queue index and
+# GetQueuedCmdCurrentIndex reports the last one finished, their difference is the depth. The index is only read
+# back when the queue looks full, so a frame costs at most a single SetCPCmd. A full queue holds the target too.
+#
+# call(name, *args, **kwargs) runs one DobotDllType-style command on the arm's link, index_source (optional)
+# returns the last finished index as sampled by the arm's telemetry, which saves the read when it shows room
+class CPStreamer:
+    def __init__(self, call, settings=None, index_source=None):
+        merged = dict(DEFAULT_STREAMING_SETTINGS)
+        merged.update(settings or {})
+        self.call = call
+        self.index_source = index_source
+        self.lookahead = max(int(merged["lookahead"]), 1)
+        self.lookahead_time = merged["lookahead_ms"] / 1000
+        self.velocity = merged["velocity"]
+        self.min_step = merged["min_step_mm"]
+
+        self.queued_index = 0     # Index of the last point queued, 0 when nothing has been queued since the last reset
+        self.finished_index = 0   # Last index the controller reported as finished
+        self.last_target = None
+        self.queue_end = 0.0      # Estimated time.monotonic() at which the arm reaches the last queued point
+        self.pending = None       # Newest held target as (target, start), None when nothing is held
+        self.timer = None         # Queues the held target once there is room for it
+        self.lock = threading.RLock()  # push runs on the dispatcher thread, the held target is sent from the timer's
+
+        self.sent = 0             # Points queued
+        self.skipped = 0          # Targets too close to the previous point
+        self.held = 0             # Times a target was held because enough motion was still queued
+        self.full = 0             # Times a target was held because the queue was full
+        self.index_reads = 0      # GetQueuedCmdCurrentIndex round trips
+        self.flush_errors = 0     # Held targets whose SetCPCmd failed on the timer thread
+
+    # Points queued but not finished yet, reads the controller's index only when the estimate says the queue is full
+    def depth(self):
+        if self.queued_index - self.finished_index >= self.lookahead and self.index_source is not None:
+            self.finished_index = max(self.finished_index, self.index_source() or 0)
+        if self.queued_index - self.finished_index >= self.lookahead:
+            self.finished_index = self.call("GetQueuedCmdCurrentIndex")[0]
+            self.index_reads += 1
+        return max(self.queued_index - self.finished_index, 0)
+
+    # Queue a target, or hold it until the queue has room for it. Returns False only when it was skipped (too
+    # close to the last queued point, where the arm is going anyway), True when it was queued or is held.
+    # start: where the arm is heading when nothing has been streamed yet (its commanded pose), None when unknown
+    def push(self, x, y, z, start=None):
+        with self.lock:
+            target = (x, y, z)
+            if self.last_target is not None and math.dist(self.last_target, target) < self.min_step:
+                self.pending = None  # The hand came back to the last queued point, an older held target is stale
+                self.skipped += 1
+                return False
+            self.pending = (target, start)
+            self.sendPending()
+            return True
+
+    # Queue the held target when there is room for it, otherwise keep it and arm the timer to try again
+    def sendPending(self):
+        (x, y, z), start = self.pending
+        now = time.monotonic()
+        if self.queued_index:
+            wait = self.queue_end - now - self.lookahead_time
+            if wait > 0:
+                self.held += 1
+                self.schedule(wait)
+                return
+            if self.depth() >= self.lookahead:
+                self.full += 1
+                self.schedule(max(self.lookahead_time, 0.01))
+                return
+        index = self.call("SetCPCmd", dType.ContinuousPathMode.CPAbsoluteMode, x, y, z, self.velocity, isQueued=1)[0]
+        self.pending = None
+        if not self.queued_index:
+            # First point after a reset, the controller's index may have moved on while nothing was streamed
+            self.finished_index = index - 1
+        previous = self.last_target if self.last_target is not None else start
+        distance = math.dist(previous, (x, y, z)) if previous is not None else 0.0
+        self.queue_end = max(now, self.queue_end) + (distance / self.velocity if self.velocity > 0 else 0.0)
+        self.queued_index = index
+        self.last_target = (x, y, z)
+        self.sent += 1
+
+    def schedule(self, delay):
+        if self.timer is not None:
+            return  # Already armed, it sends whichever target is held when it fires
+        self.timer = threading.Timer(delay, self.flush)
+        self.timer.daemon = True
+        self.timer.start()
+
+    # Timer thread: send the held target if nothing newer has sent or replaced it meanwhile
+    def flush(self):
+        with self.lock:
+            self.timer = None
+            if self.pending is None:
+                return
+            try:
+                self.sendPending()
+            except Exception as e:
+                print(f"Streaming held CP point {self.pending[0]} failed: {e}")
+                self.flush_errors += 1
+                self.reset()
+
+    # Forget the stream (and any held target), call after anything that clears the controller queue or moves the
+    # arm directly, and before disconnecting
+    def reset(self):
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            self.pending = None
+            self.queued_index = 0
+            self.finished_index = 0
+            self.last_target = None
+            self.queue_end = 0.0
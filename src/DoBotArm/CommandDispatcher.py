@@ -0,0 +1,104 @@
+import threading
+import queue
+from collections import deque
+from concurrent.futures import Future
+
+MAX_PENDING_COMMANDS = 8
+
+# Commands that replace each other, only the newest target of each kind is worth sending
+MOTION_COMMANDS = ("move_to", "rail_move_to", "jog")
+
+
+# Runs robotic arm commands on a worker thread so the camera loop never waits on the serial link
+class CommandDispatcher:
+    def __init__(self, robotic_arm, max_pending=MAX_PENDING_COMMANDS, name="ArmCommandDispatcher"):
+        self.robotic_arm = robotic_arm
+        self.max_pending = max_pending
+        self.pending = deque()  # Entries are [name, args, future]
+        self.condition = threading.Condition()
+        self.coalesced = 0      # Motion targets replaced by a newer one before being sent
+        self.rejected = 0       # Commands refused because the queue was full
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name=name, daemon=True)
+        self.thread.start()
+
+    # Queue a call to robotic_arm.<name>(*args) and return a Future for its result
+    # callback (optional) is called with the finished Future
+    def submit(self, name, *args, callback=None):
+        future = Future()
+        if callback is not None:
+            future.add_done_callback(callback)
+
+        with self.condition:
+            if not self.running:
+                future.set_exception(RuntimeError("Command dispatcher has been stopped."))
+                return future
+
+            # A newer motion target supersedes one still waiting directly behind it in the queue.
+            # Only the tail is coalesced so motions never jump over mode or gripper changes.
+            if name in MOTION_COMMANDS and self.pending and self.pending[-1][0] == name:
+                superseded = self.pending.pop()
+                superseded[2].cancel()
+                self.coalesced += 1
+            elif len(self.pending) >= self.max_pending:
+                # Make room by dropping the oldest motion target, never a mode or gripper change
+                oldest_motion = next((entry for entry in self.pending if entry[0] in MOTION_COMMANDS), None)
+                if oldest_motion is None:
+                    self.rejected += 1
+                    future.set_exception(queue.Full(f"Arm command queue is full, dropped {name}."))
+                    return future
+                self.pending.remove(oldest_motion)
+                oldest_motion[2].cancel()
+                self.coalesced += 1
+
+            self.pending.append([name, args, future])
+            self.condition.notify()
+        return future
+
+    def move_to(self, x, y, z, callback=None):
+        return self.submit("move_to", x, y, z, callback=callback)
+
+    def enableRail(self, enable, callback=None):
+        return self.submit("enableRail", enable, callback=callback)
+
+    def rail_move_to(self, x, y, z, l, r=0, callback=None):
+        return self.submit("rail_move_to", x, y, z, l, r, callback=callback)
+
+    def jog(self, cmd, speed_ratio=100, callback=None):
+        return self.submit("jog", cmd, speed_ratio, callback=callback)
+
+    def setJogParams(self, velocity, acceleration, rail_velocity, rail_acceleration, callback=None):
+        return self.submit("setJogParams", velocity, acceleration, rail_velocity, rail_acceleration, callback=callback)
+
+    def set_gripper_state(self, state, callback=None):
+        return self.submit("set_gripper_state", state, callback=callback)
+
+    def pendingCount(self):
+        with self.condition:
+            return len(self.pending)
+
+    # Worker thread: pop commands in order and run them against the arm
+    def run(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.pending or not self.running)
+                if not self.pending:
+                    return
+                name, args, future = self.pending.popleft()
+
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            try:
+                future.set_result(getattr(self.robotic_arm, name)(*args))
+            except Exception as e:
+                print(f"Arm command {name}{args} failed: {e}")
+                future.set_exception(e)
+
+    # Stop accepting commands, let already queued commands finish (up to timeout seconds)
+    def stop(self, timeout=2.0):
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        if self.thread.is_alive() and self.thread is not threading.current_thread():
+            self.thread.join(timeout)
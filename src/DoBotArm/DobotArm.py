@@ -1,72 +1,207 @@
 from DoBotArm import DobotDllType as dType
+from DoBotArm.CPStreaming import CPStreamer
+from DoBotArm.Telemetry import ArmTelemetry
 import atexit
+import platform
+import time
 
+HOME_POSE = (170, 0, 0)
+POSE_RESYNC_INTERVAL = 2.0  # Seconds a cached pose is trusted before it is refreshed with GetPose
+
+# "dll" talks to the arm through DobotDll (Windows), "serial" through the pure Python protocol driver,
+# "sim" to an in-process SimulatedController (no hardware)
+DEFAULT_BACKEND = "dll" if platform.system() == "Windows" else "serial"
 
-class DobotArm:
 
-    def __init__(self):
+# Calls the DobotDllType wrappers with the loaded DLL filled in as their api argument,
+# so DobotArm calls the DLL and the serial driver the same way
+class DllLink:
+    # retry_policy: overrides for dType.RETRY_POLICY (deadlines and backoff of failed DLL calls)
+    def __init__(self, retry_policy=None):
         self.api = None
-        self.gobal_version = None
+        if retry_policy:
+            dType.SetRetryPolicy(**retry_policy)
 
     def connect(self, port, baudrate):
         self.api = dType.load()
-        state = dType.ConnectDobot(self.api, port, baudrate)[0]
-        if state == dType.DobotConnect.DobotConnect_NoError:
-            self.gobal_version = dType.GetDeviceVersion(self.api)
-            dType.SetQueuedCmdClear(self.api)
-            dType.SetHOMEParams(self.api, 170, 0, 0, -90, 0)
-            dType.SetPTPCommonParams(self.api, 100, 100, isQueued=0)
-            dType.SetCPCommonParams(self.api, 100, 100, isQueued=0)
-            dType.SetCPRHoldEnable(self.api, True)
-            dType.SetPTPCmd(self.api, 2, 170, 0, 0, -90, isQueued=0)
+        return dType.ConnectDobot(self.api, port, baudrate)[0] == dType.DobotConnect.DobotConnect_NoError
+
+    def disconnect(self):
+        dType.DisconnectDobot(self.api)
+
+    def __getattr__(self, name):
+        function = getattr(dType, name)
+        return lambda *args, **kwargs: function(self.api, *args, **kwargs)
+
+
+# simulation: settings of the "sim" backend (see SimulatedDobot.DEFAULT_SIMULATION_SETTINGS)
+def createLink(backend, retry_policy=None, simulation=None):
+    if backend in (None, "auto"):
+        backend = DEFAULT_BACKEND
+    if backend == "dll":
+        return DllLink(retry_policy)
+    if backend == "serial":
+        from DoBotArm.DobotSerialDriver import DobotSerialDriver
+        return DobotSerialDriver()
+    if backend == "sim":
+        from DoBotArm.SimulatedDobot import SimulatedLink
+        return SimulatedLink(simulation)
+    raise ValueError(f"Unknown Dobot backend '{backend}', use 'dll', 'serial' or 'sim'.")
+
+
+class DobotArm:
+
+    # backend: "dll", "serial", "sim" or "auto"/None for the platform default (see DEFAULT_BACKEND)
+    # retry_policy: deadlines and backoff for DLL calls that fail (see dType.RETRY_POLICY)
+    # streaming: CP streaming settings (see CPStreaming.DEFAULT_STREAMING_SETTINGS), move_to queues targets when enabled
+    # telemetry: background state sampling settings (see Telemetry.DEFAULT_TELEMETRY_SETTINGS), read through self.telemetry
+    # simulation: settings of the "sim" backend
+    def __init__(self, cp_mode=dType.ContinuousPathMode.CPAbsoluteMode, backend=None, retry_policy=None, streaming=None,
+                 telemetry=None, simulation=None):
+        self.link = createLink(backend, retry_policy, simulation)
+        self.gobal_version = None
+
+        # Absolute CP moves need no knowledge of the current pose (one serial transaction per move).
+        # Relative CP moves are computed against the locally cached commanded pose instead of a GetPose per frame.
+        self.cp_mode = cp_mode
+        self.pose = None            # Last commanded [x, y, z], None when unknown (startup or after an error)
+        self.last_pose_sync = 0.0
+        self.streamer = None
+        self.telemetry = None
+        self.jog_ratio = None       # JOG velocity ratio last sent, None when unknown
+        call = lambda name, *args, **kwargs: getattr(self.link, name)(*args, **kwargs)
+        if telemetry and telemetry.get("enabled"):
+            self.telemetry = ArmTelemetry(call, telemetry)
+        if streaming and streaming.get("enabled"):
+            self.streamer = CPStreamer(call, streaming, self.telemetry.queueIndex if self.telemetry is not None else None)
+
+    def connect(self, port, baudrate):
+        if self.link.connect(port, baudrate):
+            self.gobal_version = self.link.GetDeviceVersion()
+            self.link.SetQueuedCmdClear()
+            self.link.SetHOMEParams(170, 0, 0, -90, 0)
+            self.link.SetPTPCommonParams(100, 100, isQueued=0)
+            self.link.SetCPCommonParams(100, 100, isQueued=0)
+            self.link.SetCPRHoldEnable(True)
+            self.link.SetPTPCmd(2, HOME_POSE[0], HOME_POSE[1], HOME_POSE[2], -90, isQueued=0)
+            self.pose = list(HOME_POSE)
+            if self.streamer is not None:
+                self.link.SetQueuedCmdStartExec()  # Streamed points run from the controller queue
+            if self.telemetry is not None:
+                self.telemetry.start()
             print("Connected to Dobot and moved to home position!")
             # if we have connected to the dobot then make sure anytime we exit we disconnect
-            atexit.register(self.turnOffAnnoyingThing)
+            # (atexit runs these last-registered-first, so the gripper is turned off before disconnecting)
             atexit.register(self.disconnect)
+            atexit.register(self.turnOffAnnoyingThing)
             return True
         print("Failed to connect to Dobot.")
         return False
 
+    # Re-read the real pose from the arm, clearing anything left in the controller queue first
+    def sync_pose(self):
+        self.clearQueue()
+        pose = self.link.GetPose()
+        self.pose = [pose[0], pose[1], pose[2]]
+        self.last_pose_sync = time.time()
+        return self.pose
+
+    def get_cached_pose(self):
+        return None if self.pose is None else tuple(self.pose)
+
+    # Drop everything waiting in the controller queue (including streamed points)
+    def clearQueue(self):
+        self.link.SetQueuedCmdClear()
+        if self.streamer is not None:
+            self.streamer.reset()
+
+    # Returns whether the target goes out to the arm, False when the CP streamer skipped it
     def move_to(self, x, y, z):
-        dType.SetQueuedCmdClear(self.api)
-        pose = dType.GetPose(self.api)
-        current_x, current_y, current_z = pose[0], pose[1], pose[2]
-        x -= current_x
-        y -= current_y
-        z -= current_z
-        dType.SetCPCmd(self.api, 0, x, y, z, 100, isQueued=0)
+        if self.streamer is not None:
+            try:
+                queued = self.streamer.push(x, y, z, self.pose)
+            except Exception:
+                self.streamer.reset()
+                raise
+            if queued:
+                self.pose = [x, y, z]
+            return queued
+        try:
+            if self.cp_mode == dType.ContinuousPathMode.CPAbsoluteMode:
+                self.link.SetCPCmd(self.cp_mode, x, y, z, 100, isQueued=0)
+            else:
+                # Only go back to the arm for its pose periodically, or when the cache was invalidated
+                if self.pose is None or time.time() - self.last_pose_sync > POSE_RESYNC_INTERVAL:
+                    self.sync_pose()
+                self.link.SetCPCmd(self.cp_mode, x - self.pose[0], y - self.pose[1], z - self.pose[2], 100, isQueued=0)
+        except Exception:
+            self.pose = None  # Where the arm ended up is unknown, resync before the next relative move
+            raise
+        self.pose = [x, y, z]
+        return True
+
+    # JOG velocities (mm/s) and accelerations (mm/s^2) of the cartesian axes and the rail at a 100% ratio
+    def setJogParams(self, velocity, acceleration, rail_velocity, rail_acceleration):
+        self.link.SetJOGCoordinateParams(velocity, acceleration, velocity, acceleration, velocity, acceleration,
+                                         velocity, acceleration, isQueued=0)
+        self.link.SetJOGLParams(rail_velocity, rail_acceleration, isQueued=0)
+        self.jog_ratio = None
+
+    # Start jogging with a dType.JC command (JogIdle stops) at speed_ratio percent of the JOG velocities
+    def jog(self, cmd, speed_ratio=100):
+        if self.streamer is not None and self.streamer.queued_index:
+            self.clearQueue()  # Streamed points still queued would fight the JOG motion
+        self.pose = None  # Jogging leaves the arm wherever it stops
+        try:
+            if cmd != dType.JC.JogIdle and speed_ratio != self.jog_ratio:
+                self.link.SetJOGCommonParams(speed_ratio, 100, isQueued=0)
+                self.jog_ratio = speed_ratio
+            self.link.SetJOGCmd(0, cmd, isQueued=0)
+        except Exception:
+            self.jog_ratio = None
+            raise
 
     def enableRail(self, enable):
-        dType.SetQueuedCmdClear(self.api)
-        dType.SetDeviceWithL(self.api, enable, self.gobal_version[0], 0)
+        self.clearQueue()
+        self.link.SetDeviceWithL(enable, self.gobal_version[0], 0)
 
     def rail_move_to(self, x, y, z, l, r=0):  # Linear Rail System Movement
-        dType.SetQueuedCmdClear(self.api)
-        dType.SetPTPWithLCmd(self.api, 1, x, y, z, r, l, isQueued=0)
+        self.clearQueue()
+        try:
+            self.link.SetPTPWithLCmd(1, x, y, z, r, l, isQueued=0)
+        except Exception:
+            self.pose = None
+            raise
+        self.pose = [x, y, z]
 
     def set_gripper_state(self, state):
-        dType.SetQueuedCmdClear(self.api)
-        dType.SetEndEffectorGripper(self.api, 1, state, isQueued=0)
+        self.clearQueue()
+        self.link.SetEndEffectorGripper(1, state, isQueued=0)
 
     # Turn off air compressor on close program bc its really annoying
     def turnOffAnnoyingThing(self):
-        dType.SetQueuedCmdClear(self.api)
-        dType.SetEndEffectorGripper(self.api, 0, 0, isQueued=0)
+        self.clearQueue()
+        self.link.SetEndEffectorGripper(0, 0, isQueued=0)
 
     def disconnect(self):
         """
         Safely disconnects the Dobot.
-        Intentionally suppresses a known harmless AttributeError that can occur during SetQueuedCmdStop.
+        Intentionally suppresses the known harmless errors that can occur during SetQueuedCmdStop.
         """
         try:
             # Attempt to stop any queued commands before disconnecting
-            dType.SetQueuedCmdStop(self.api)
-        except AttributeError:
-            # This error occurs if the Dobot is already disconnected or the API is invalid.
-            # It is safe to ignore in this context.
+            self.link.SetQueuedCmdStop()
+        except (AttributeError, ConnectionError):
+            # This error occurs if the Dobot is already disconnected or the API is invalid
+            # (the serial driver raises ConnectionError). It is safe to ignore in this context.
             pass
 
+        if self.streamer is not None:
+            self.streamer.reset()  # A held point must not go out on a closed link
+        if self.telemetry is not None:
+            self.telemetry.stop()
+
         # Disconnect from the Dobot regardless
-        dType.DisconnectDobot(self.api)
+        self.link.disconnect()
         print("Disconnected from Dobot.")
 
@@ -2,6 +2,7 @@ from ctypes import *
 import time,  platform
 import os
 import math
+import threading
 from fileLoading import fileLoader
 
 def enum(**enums):
@@ -58,9 +59,6 @@ class DeviceID(Structure):
         ("deviceID3", c_uint32)
     ]
 
-masterId = 0
-slaveId = 0
-
 class DeviceVersion(Structure):
     _pack_ = 1
     _fields_ = [
@@ -581,12 +579,73 @@ DobotCommunicate = enum(
     )
 
 isUsingLinearRail = False
+##################  Call buffers   ##################
+
+# Command structs and out-params reused by the hot path wrappers (SetCPCmd, GetPose, GetQueuedCmdCurrentIndex, ...),
+# one set per thread so the dispatcher and anything polling the arm on another thread never share a buffer.
+# The *Ref attributes are their byref() pointers, made once; the wrappers pass those and plain ints, which ctypes
+# hands to C without any conversion. No argtypes are declared on purpose: ctypes would then run a from_param per
+# argument, which costs more than the buffers save (see Debug Tools/dllCallBenchmark.py).
+class CallBuffers:
+    def __init__(self):
+        self.pose = Pose()
+        self.l = c_float(0)
+        self.cpCmd = CPCmd()
+        self.ptpCmd = PTPCmd()
+        self.ptpWithLCmd = PTPWithLCmd()
+        self.jogCmd = JOGCmd()
+        self.queuedCmdIndex = c_uint64(0)
+        self.queuedCmdIndex1 = c_uint64(0)
+        for name in ("pose", "l", "cpCmd", "ptpCmd", "ptpWithLCmd", "jogCmd", "queuedCmdIndex", "queuedCmdIndex1"):
+            setattr(self, name + "Ref", byref(getattr(self, name)))
+
+
+threadBuffers = threading.local()
+
+
+def callBuffers():
+    try:
+        return threadBuffers.buffers
+    except AttributeError:
+        threadBuffers.buffers = CallBuffers()
+        return threadBuffers.buffers
+
 ##################  API func   ##################
 
 #parker add 2018 8 29 添加Wifi设置模块退出标志位
 QuitDobotApiFlag = True
 
+# One connection to a Dobot: the loaded DLL plus the device ids and types ConnectDobot assigned to this connection,
+# which every wrapper passes along with its call. Give each arm its own handle (load() returns a new one every
+# time) and several arms can be driven from one process. DLL functions are looked up once and cached on the handle.
+class DobotHandle:
+    def __init__(self, dll):
+        self.dll = dll
+        self.masterId = 0
+        self.slaveId = 0
+        self.masterDevType = 0
+        self.slaveDevType = 0
+
+    def __getattr__(self, name):
+        function = getattr(self.dll, name)
+        setattr(self, name, function)
+        return function
+
+
+loadedDll = None  # The DLL is loaded once per process, the handles share it
+loadLock = threading.Lock()
+
+
+# A new connection handle on the DobotDll, loading the DLL the first time
 def load():
+    global loadedDll
+    with loadLock:
+        if loadedDll is None:
+            loadedDll = loadDll()
+    return DobotHandle(loadedDll)
+
+
+def loadDll():
     if platform.system() == "Windows":
         # print("您用的dll是64位，为了顺利运行，请保证您的python环境也是64位")
         # print("python环境是：",platform.architecture())
@@ -616,7 +675,7 @@ def load():
         return CDLL(file_path,  RTLD_GLOBAL)
     elif platform.system() == "Linux":
         #TODO make program functional on linux
-        return cdll.loadLibrary("libDobotDll.so")
+        return cdll.LoadLibrary("libDobotDll.so")
 
 
 def dSleep(ms):
@@ -626,6 +685,123 @@ def gettime():
     return [time.time()]
 
 
+##################  Retry policy  ##################
+
+# Every wrapper below goes through callWithRetry: DLL calls that do not answer DobotCommunicate_NoError are
+# retried with exponential backoff until a deadline, instead of forever. Errors that retrying cannot fix
+# (bad params, no device) raise straight away, so control code can drop the command and keep going.
+RETRY_POLICY = {
+    "timeout_ms": 1000,             # Deadline for a call whose answers time out
+    "buffer_full_timeout_ms": 5000, # Deadline while the arm's command queue is full (it drains as the arm moves)
+    "initial_delay_ms": 2,          # First wait between attempts, doubled after every attempt
+    "max_delay_ms": 50
+}
+
+RETRYABLE_RESULTS = (DobotCommunicate.DobotCommunicate_BufferFull, DobotCommunicate.DobotCommunicate_Timeout)
+RESULT_NAMES = {value: name for name, value in vars(DobotCommunicate).items() if name.startswith("DobotCommunicate_")}
+
+
+class DobotCommunicateError(Exception):
+    def __init__(self, name, result, attempts):
+        self.name = name
+        self.result = result
+        self.attempts = attempts
+        super().__init__(f"{name} failed with {RESULT_NAMES.get(result, result)} after {attempts} attempt(s)")
+
+
+# Raised when a retryable error outlasted the call's deadline (usually a disconnected or unresponsive arm)
+class DobotTimeoutError(DobotCommunicateError):
+    pass
+
+
+retryStatsLock = threading.Lock()
+retryStats = {"calls": 0, "retries": 0, "timeouts": 0, "failures": 0, "results": {}}
+retryDeadlines = threading.local()
+
+
+# Change the shared policy, e.g. SetRetryPolicy(timeout_ms=200)
+def SetRetryPolicy(**settings):
+    unknown = set(settings) - set(RETRY_POLICY)
+    if unknown:
+        raise KeyError(f"Unknown retry settings: {', '.join(sorted(unknown))}")
+    RETRY_POLICY.update(settings)
+
+
+# Counters since start (or the last reset): calls, retries, timeouts, failures and errors seen by result name
+def GetRetryStats():
+    with retryStatsLock:
+        stats = dict(retryStats)
+        stats["results"] = dict(retryStats["results"])
+    return stats
+
+
+def ResetRetryStats():
+    with retryStatsLock:
+        retryStats.update(calls=0, retries=0, timeouts=0, failures=0, results={})
+
+
+# Per-call deadline for the calls made inside the with block on this thread, overriding the policy timeouts:
+#   with dType.retryDeadline(50):
+#       pose = dType.GetPose(api)
+class retryDeadline:
+    def __init__(self, timeout_ms):
+        self.timeout_ms = timeout_ms
+
+    def __enter__(self):
+        self.previous = getattr(retryDeadlines, "timeout_ms", None)
+        retryDeadlines.timeout_ms = self.timeout_ms
+        return self
+
+    def __exit__(self, *exc):
+        retryDeadlines.timeout_ms = self.previous
+
+
+def countResult(key, result=None):
+    with retryStatsLock:
+        retryStats[key] += 1
+        if result is not None:
+            name = RESULT_NAMES.get(result, str(result))
+            retryStats["results"][name] = retryStats["results"].get(name, 0) + 1
+
+
+# Call a DLL function until it answers DobotCommunicate_NoError, returns that result
+def callWithRetry(function, *args):
+    result = function(*args)
+    if result == DobotCommunicate.DobotCommunicate_NoError:
+        with retryStatsLock:
+            retryStats["calls"] += 1
+        return result
+
+    name = getattr(function, "__name__", str(function))
+    start = time.perf_counter()
+    deadline_ms = getattr(retryDeadlines, "timeout_ms", None)
+    delay = RETRY_POLICY["initial_delay_ms"]
+    attempts = 1
+    countResult("calls")
+    while True:
+        if result not in RETRYABLE_RESULTS:
+            countResult("failures", result)
+            raise DobotCommunicateError(name, result, attempts)
+        if deadline_ms is not None:
+            timeout_ms = deadline_ms
+        elif result == DobotCommunicate.DobotCommunicate_BufferFull:
+            timeout_ms = RETRY_POLICY["buffer_full_timeout_ms"]
+        else:
+            timeout_ms = RETRY_POLICY["timeout_ms"]
+        remaining = timeout_ms - (time.perf_counter() - start) * 1000
+        if remaining <= 0:
+            countResult("timeouts", result)
+            raise DobotTimeoutError(name, result, attempts)
+
+        dSleep(min(delay, remaining))
+        delay = min(delay * 2, RETRY_POLICY["max_delay_ms"])
+        countResult("retries", result)
+        attempts += 1
+        result = function(*args)
+        if result == DobotCommunicate.DobotCommunicate_NoError:
+            return result
+
+
 def SetDebugEnable(api, flag=False):
     result = api.SetDebugEnable(flag)
 
@@ -649,15 +825,7 @@ def SearchDobot(api,  maxLen=1000):
         
     return list(fix(ret.split(" ")))
     
-masterId = 0
-slaveId = 0
-masterDevType = 0
-slaveDevType = 0
-
-
 def ConnectDobot(api, portName, baudrate):
-    global masterId, slaveId, masterDevType, slaveDevType
-
     szPara = create_string_buffer(100)
     szPara.raw = portName.encode("utf-8") 
     connectInfo = ConnectInfo()
@@ -665,42 +833,42 @@ def ConnectDobot(api, portName, baudrate):
     result = api.ConnectDobot(szPara, baudrate, byref(connectInfo))
     if result != DobotConnect.DobotConnect_NoError:
         return [result, 0, 0, 0, 0, 0, 0, 0]
-    masterId = connectInfo.masterDevInfo.devId
-    masterDevType = connectInfo.masterDevInfo.type
+    api.masterId = connectInfo.masterDevInfo.devId
+    api.masterDevType = connectInfo.masterDevInfo.type
     try:
-        if masterDevType == DevType.Conntroller:
+        if api.masterDevType == DevType.Conntroller:
             if connectInfo.slaveDevInfo1.type == 0 and connectInfo.slaveDevInfo2.type == 0:
-                slaveId = -1
-                slaveDevType = 0
+                api.slaveId = -1
+                api.slaveDevType = 0
                 try:
                     fwName = str(connectInfo.masterDevInfo.firmwareName, encoding="utf-8").strip(b'\x00'.decode())
                     fwVer = str(connectInfo.masterDevInfo.firwareVersion, encoding="utf-8").strip(b'\x00'.decode())
-                    # print("masterId: ", masterId, connectInfo.slaveDevInfo1.devId, connectInfo.slaveDevInfo2.devId, fwName, fwVer)
+                    # print("masterId: ", api.masterId, connectInfo.slaveDevInfo1.devId, connectInfo.slaveDevInfo2.devId, fwName, fwVer)
                 except Exception as e:
                     print(e)
             else:
-                slaveId = connectInfo.slaveDevInfo1.devId if connectInfo.slaveDevInfo1.type != DevType.Idle else connectInfo.slaveDevInfo2.devId
+                api.slaveId = connectInfo.slaveDevInfo1.devId if connectInfo.slaveDevInfo1.type != DevType.Idle else connectInfo.slaveDevInfo2.devId
                 fwName = str(connectInfo.slaveDevInfo1.firmwareName, encoding="utf-8").strip(b'\x00'.decode()) if connectInfo.slaveDevInfo1.type != DevType.Idle else str(connectInfo.slaveDevInfo2.firmwareName, encoding="utf-8").strip(b'\x00'.decode())
                 fwVer = str(connectInfo.slaveDevInfo1.firwareVersion, encoding="utf-8").strip(b'\x00'.decode()) if connectInfo.slaveDevInfo1.type != DevType.Idle else str(connectInfo.slaveDevInfo2.firwareVersion, encoding="utf-8").strip(b'\x00'.decode())
-                slaveDevType = connectInfo.slaveDevInfo1.type if connectInfo.slaveDevInfo1.type != DevType.Idle else connectInfo.slaveDevInfo2.type
-                # slaveDevType = dType.DevType.MagicianLite  # for test
+                api.slaveDevType = connectInfo.slaveDevInfo1.type if connectInfo.slaveDevInfo1.type != DevType.Idle else connectInfo.slaveDevInfo2.type
+                # api.slaveDevType = dType.DevType.MagicianLite  # for test
         else:
-            slaveId = 0
-            slaveDevType = 0
+            api.slaveId = 0
+            api.slaveDevType = 0
             fwName = str(connectInfo.masterDevInfo.firmwareName, encoding="utf-8").strip(b'\x00'.decode())
             fwVer = str(connectInfo.masterDevInfo.firwareVersion, encoding="utf-8").strip(b'\x00'.decode())
 
     except Exception as e:
         print(e)
-    return [result, masterDevType, slaveDevType, fwName, fwVer, masterId, slaveId, connectInfo.masterDevInfo.runTime]
+    return [result, api.masterDevType, api.slaveDevType, fwName, fwVer, api.masterId, api.slaveId, connectInfo.masterDevInfo.runTime]
 
 
 def DisconnectDobot(api):
-    api.DisconnectDobot(c_int(masterId))
+    api.DisconnectDobot(c_int(api.masterId))
 
 
 def GetMarlinVersion(api):
-    api.GetMarlinVersion(c_int(masterId), c_int(slaveId))
+    api.GetMarlinVersion(c_int(api.masterId), c_int(api.slaveId))
 
 
 def PeriodicTask(api):
@@ -708,7 +876,7 @@ def PeriodicTask(api):
 
 
 def SetCmdTimeout(api, times):
-    api.SetCmdTimeout(c_int(masterId), times)
+    api.SetCmdTimeout(c_int(api.masterId), times)
 
 
 
@@ -717,47 +885,25 @@ def DobotExec(api):
 
 
 def GetQueuedCmdCurrentIndex(api):
-    queuedCmdIndex = c_uint64(0)
-    queuedCmdIndex1 = c_uint64(0)
-    if masterDevType == DevType.Conntroller and slaveDevType == DevType.MagicianLite:
+    buffers = callBuffers()
+    queuedCmdIndex = buffers.queuedCmdIndex
+    queuedCmdIndex1 = buffers.queuedCmdIndex1
+    queuedCmdIndex.value = 0
+    queuedCmdIndex1.value = 0
+    if api.masterDevType == DevType.Conntroller and api.slaveDevType == DevType.MagicianLite:
         # if isUsingLinearRail:
-        while(True):
-            result = api.GetQueuedCmdCurrentIndex(c_int(masterId), c_int(-1), byref(queuedCmdIndex1))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(2)
-                continue
-            break
-        while(True):
-            result = api.GetQueuedCmdCurrentIndex(c_int(masterId), c_int(slaveId), byref(queuedCmdIndex))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(2)
-                continue
-            break
-    elif masterDevType == DevType.Conntroller and slaveDevType == DevType.Idle: 
-        while(True):
-            result = api.GetQueuedCmdCurrentIndex(c_int(masterId), c_int(-1), byref(queuedCmdIndex1))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(2)
-                continue
-            break
+        result = callWithRetry(api.GetQueuedCmdCurrentIndex, api.masterId, -1, buffers.queuedCmdIndex1Ref)
+        result = callWithRetry(api.GetQueuedCmdCurrentIndex, api.masterId, api.slaveId, buffers.queuedCmdIndexRef)
+    elif api.masterDevType == DevType.Conntroller and api.slaveDevType == DevType.Idle: 
+        result = callWithRetry(api.GetQueuedCmdCurrentIndex, api.masterId, -1, buffers.queuedCmdIndex1Ref)
     else:
-        while(True):
-            result = api.GetQueuedCmdCurrentIndex(c_int(masterId), c_int(slaveId), byref(queuedCmdIndex))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(2)
-                continue
-            break
+        result = callWithRetry(api.GetQueuedCmdCurrentIndex, api.masterId, api.slaveId, buffers.queuedCmdIndexRef)
     return [queuedCmdIndex.value, queuedCmdIndex1.value]
 
 
 def GetQueuedCmdMotionFinish(api):
     isFinish = c_bool(False)
-    while(True):
-        result = api.GetQueuedCmdMotionFinish(c_int(masterId), c_int(slaveId),byref(isFinish))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(2)
-            continue
-        break
+    result = callWithRetry(api.GetQueuedCmdMotionFinish, c_int(api.masterId), c_int(api.slaveId),byref(isFinish))
 
     if isFinish.value != None:
         return [isFinish.value]
@@ -767,198 +913,78 @@ def GetQueuedCmdMotionFinish(api):
 
 def SetQueuedCmdStartExec(api):
     # 特殊处理
-    if slaveDevType == DevType.Magician:
-        while (True):
-            result = api.SetQueuedCmdStartExec(c_int(masterId), c_int(slaveId))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
-    elif masterDevType == DevType.Conntroller and slaveDevType == DevType.MagicianLite:
-        while (True):
-            result = api.SetQueuedCmdStartExec(c_int(masterId), c_int(-1))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
-        while (True):
-            result = api.SetQueuedCmdStartExec(c_int(masterId), c_int(slaveId))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
-    elif masterDevType == DevType.Conntroller and slaveDevType == DevType.Idle:
-        while(True):
-            result = api.SetQueuedCmdStartExec(c_int(masterId), c_int(-1))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
+    if api.slaveDevType == DevType.Magician:
+        result = callWithRetry(api.SetQueuedCmdStartExec, c_int(api.masterId), c_int(api.slaveId))
+    elif api.masterDevType == DevType.Conntroller and api.slaveDevType == DevType.MagicianLite:
+        result = callWithRetry(api.SetQueuedCmdStartExec, c_int(api.masterId), c_int(-1))
+        result = callWithRetry(api.SetQueuedCmdStartExec, c_int(api.masterId), c_int(api.slaveId))
+    elif api.masterDevType == DevType.Conntroller and api.slaveDevType == DevType.Idle:
+        result = callWithRetry(api.SetQueuedCmdStartExec, c_int(api.masterId), c_int(-1))
     else:
-        while (True):
-            result = api.SetQueuedCmdStartExec(c_int(masterId), c_int(slaveId))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
+        result = callWithRetry(api.SetQueuedCmdStartExec, c_int(api.masterId), c_int(api.slaveId))
 
 
 
 def SetQueuedCmdStopExec(api):
     # 滑轨特殊处理
-    if slaveDevType == DevType.Magician:
-        while (True):
-            result = api.SetQueuedCmdStopExec(c_int(masterId), c_int(slaveId))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
-    elif masterDevType == DevType.Conntroller and slaveDevType == DevType.MagicianLite:
-        while (True):
-            result = api.SetQueuedCmdStopExec(c_int(masterId), c_int(-1))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
-        while (True):
-            result = api.SetQueuedCmdStopExec(c_int(masterId), c_int(slaveId))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
-    elif masterDevType == DevType.Conntroller and slaveDevType == DevType.Idle:
-        while(True):
-            result = api.SetQueuedCmdStartExec(c_int(masterId), c_int(-1))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
+    if api.slaveDevType == DevType.Magician:
+        result = callWithRetry(api.SetQueuedCmdStopExec, c_int(api.masterId), c_int(api.slaveId))
+    elif api.masterDevType == DevType.Conntroller and api.slaveDevType == DevType.MagicianLite:
+        result = callWithRetry(api.SetQueuedCmdStopExec, c_int(api.masterId), c_int(-1))
+        result = callWithRetry(api.SetQueuedCmdStopExec, c_int(api.masterId), c_int(api.slaveId))
+    elif api.masterDevType == DevType.Conntroller and api.slaveDevType == DevType.Idle:
+        result = callWithRetry(api.SetQueuedCmdStartExec, c_int(api.masterId), c_int(-1))
     else:
-        while (True):
-            result = api.SetQueuedCmdStopExec(c_int(masterId), c_int(slaveId))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
+        result = callWithRetry(api.SetQueuedCmdStopExec, c_int(api.masterId), c_int(api.slaveId))
 
        
  
 def SetQueuedCmdForceStopExec(api):
     # 滑轨特殊处理
-    if slaveDevType == DevType.Magician:
-        while (True):
-            result = api.SetQueuedCmdForceStopExec(c_int(masterId), c_int(slaveId))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
-    elif masterDevType == DevType.Conntroller and slaveDevType == DevType.MagicianLite:
-        while (True):
-            result = api.SetQueuedCmdForceStopExec(c_int(masterId), c_int(-1))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
-        while (True):
-            result = api.SetQueuedCmdForceStopExec(c_int(masterId), c_int(slaveId))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
-    elif masterDevType == DevType.Conntroller and slaveDevType == DevType.Idle:
-        while(True):
-            result = api.SetQueuedCmdForceStopExec(c_int(masterId), c_int(-1))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
+    if api.slaveDevType == DevType.Magician:
+        result = callWithRetry(api.SetQueuedCmdForceStopExec, c_int(api.masterId), c_int(api.slaveId))
+    elif api.masterDevType == DevType.Conntroller and api.slaveDevType == DevType.MagicianLite:
+        result = callWithRetry(api.SetQueuedCmdForceStopExec, c_int(api.masterId), c_int(-1))
+        result = callWithRetry(api.SetQueuedCmdForceStopExec, c_int(api.masterId), c_int(api.slaveId))
+    elif api.masterDevType == DevType.Conntroller and api.slaveDevType == DevType.Idle:
+        result = callWithRetry(api.SetQueuedCmdForceStopExec, c_int(api.masterId), c_int(-1))
     else:
-        while (True):
-            result = api.SetQueuedCmdForceStopExec(c_int(masterId), c_int(slaveId))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
+        result = callWithRetry(api.SetQueuedCmdForceStopExec, c_int(api.masterId), c_int(api.slaveId))
 
     
 
 def SetQueuedCmdStartDownload(api,  totalLoop, linePerLoop):
-    while(True):
-        result = api.SetQueuedCmdStartDownload(c_int(masterId), c_int(slaveId), totalLoop, linePerLoop)
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetQueuedCmdStartDownload, c_int(api.masterId), c_int(api.slaveId), totalLoop, linePerLoop)
         
 
 def SetQueuedCmdStopDownload(api):
-    while(True):
-        result = api.SetQueuedCmdStopDownload(c_int(masterId), c_int(slaveId))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetQueuedCmdStopDownload, c_int(api.masterId), c_int(api.slaveId))
     
 
 def SetQueuedCmdClear(api):
     # 滑轨特殊处理
-    # return [api.SetQueuedCmdClear(c_int(masterId), c_int(slaveId))]
-    if slaveDevType == DevType.Magician:
-        while(True):
-            result = api.SetQueuedCmdClear(c_int(masterId), c_int(slaveId))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
-    elif masterDevType == DevType.Conntroller and slaveDevType == DevType.MagicianLite:
-        while (True):
-            result = api.SetQueuedCmdClear(c_int(masterId), c_int(-1))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
-        while (True):
-            result = api.SetQueuedCmdClear(c_int(masterId), c_int(slaveId))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
-    elif masterDevType == DevType.Conntroller and slaveDevType == DevType.Idle:
-        while(True):
-            result = api.SetQueuedCmdClear(c_int(masterId), c_int(-1))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
-    else:
-        while (True):
-            result = api.SetQueuedCmdClear(c_int(masterId), c_int(slaveId))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
+    # return [api.SetQueuedCmdClear(c_int(api.masterId), c_int(api.slaveId))]
+    if api.slaveDevType == DevType.Magician:
+        result = callWithRetry(api.SetQueuedCmdClear, c_int(api.masterId), c_int(api.slaveId))
+    elif api.masterDevType == DevType.Conntroller and api.slaveDevType == DevType.MagicianLite:
+        result = callWithRetry(api.SetQueuedCmdClear, c_int(api.masterId), c_int(-1))
+        result = callWithRetry(api.SetQueuedCmdClear, c_int(api.masterId), c_int(api.slaveId))
+    elif api.masterDevType == DevType.Conntroller and api.slaveDevType == DevType.Idle:
+        result = callWithRetry(api.SetQueuedCmdClear, c_int(api.masterId), c_int(-1))
+    else:
+        result = callWithRetry(api.SetQueuedCmdClear, c_int(api.masterId), c_int(api.slaveId))
     return [result]
 
 
 def SetDeviceSN(api, str): 
     szPara = create_string_buffer(25)
     szPara.raw = str.encode("utf-8")
-    while(True):
-        result = api.SetDeviceSN(c_int(masterId), c_int(slaveId), szPara)
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetDeviceSN, c_int(api.masterId), c_int(api.slaveId), szPara)
 
 
 def GetDeviceSN(api): 
     szPara = create_string_buffer(25)
-    while(True):
-        result = api.GetDeviceSN(c_int(masterId), c_int(slaveId), szPara,  25)
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetDeviceSN, c_int(api.masterId), c_int(api.slaveId), szPara,  25)
     ret = szPara.value.decode("utf-8") 
     return [ret]
 
@@ -966,114 +992,68 @@ def GetDeviceSN(api):
 def SetDeviceName(api, str):
     szPara = create_string_buffer(len(str) * 4)
     szPara.raw = str.encode("utf-8")
-    while(True):
-        result = api.SetDeviceName(c_int(masterId), c_int(slaveId), szPara)
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetDeviceName, c_int(api.masterId), c_int(api.slaveId), szPara)
         
 
 def SetDeviceNumName(api, num): 
     cNum = c_int(num)
-    while(True):
-        result = api.SetDeviceName(c_int(masterId), c_int(slaveId), cNum)
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetDeviceName, c_int(api.masterId), c_int(api.slaveId), cNum)
 
 
 def GetDeviceName(api): 
     szPara = create_string_buffer(66)
-    while(True):
-        result = api.GetDeviceName(c_int(masterId), c_int(slaveId), szPara,  100)
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetDeviceName, c_int(api.masterId), c_int(api.slaveId), szPara,  100)
     ret = szPara.value.decode("utf-8")
     return [ret]
     
 
 def GetDeviceVersion(api):
     deviceVersion = DeviceVersion()
-    if (masterDevType == DevType.Conntroller and (slaveDevType == DevType.MagicianLite or slaveDevType == DevType.Idle)):
-        while(True):
-            result = api.GetDeviceVersion(c_int(masterId), c_int(-1), byref(deviceVersion))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
+    if (api.masterDevType == DevType.Conntroller and (api.slaveDevType == DevType.MagicianLite or api.slaveDevType == DevType.Idle)):
+        result = callWithRetry(api.GetDeviceVersion, c_int(api.masterId), c_int(-1), byref(deviceVersion))
         return [deviceVersion.fw_majorVersion, deviceVersion.fw_minorVersion, deviceVersion.fw_revision, deviceVersion.fw_alphaVersion,
             deviceVersion.hw_majorVersion, deviceVersion.hw_minorVersion, deviceVersion.hw_revision, deviceVersion.hw_alphaVersion]
-    elif masterDevType == DevType.MagicianLite:
-        while(True):
-            result = api.GetDeviceVersion(c_int(masterId), c_int(slaveId), byref(deviceVersion))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
+    elif api.masterDevType == DevType.MagicianLite:
+        result = callWithRetry(api.GetDeviceVersion, c_int(api.masterId), c_int(api.slaveId), byref(deviceVersion))
         return [deviceVersion.fw_majorVersion, deviceVersion.fw_minorVersion, deviceVersion.fw_revision, deviceVersion.fw_alphaVersion,
             deviceVersion.hw_majorVersion, deviceVersion.hw_minorVersion, deviceVersion.hw_revision, deviceVersion.hw_alphaVersion]
 
-    elif masterDevType == DevType.Magician:
-        while(True):
-            result = api.GetDeviceVersion(c_int(masterId), c_int(slaveId), byref(deviceVersion))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
+    elif api.masterDevType == DevType.Magician:
+        result = callWithRetry(api.GetDeviceVersion, c_int(api.masterId), c_int(api.slaveId), byref(deviceVersion))
         return [deviceVersion.fw_majorVersion, deviceVersion.fw_minorVersion, deviceVersion.fw_revision, deviceVersion.fw_alphaVersion]
 
 
 def SetDeviceWithL(api, isWithL, version=0, isQueued=0):
     # 滑轨的特殊处理
-    if slaveDevType == DevType.Magician:
-        tempSlaveId = slaveId
-    elif masterDevType == DevType.Conntroller and (slaveDevType == DevType.MagicianLite or slaveDevType == DevType.Idle):
+    if api.slaveDevType == DevType.Magician:
+        tempSlaveId = api.slaveId
+    elif api.masterDevType == DevType.Conntroller and (api.slaveDevType == DevType.MagicianLite or api.slaveDevType == DevType.Idle):
         tempSlaveId = -1
     else:
-        tempSlaveId = slaveId
+        tempSlaveId = api.slaveId
 
     queuedCmdIndex = c_uint64(0)
-    while(True):
-        print(tempSlaveId)
-        result = api.SetDeviceWithL(c_int(masterId), c_int(tempSlaveId), c_bool(isWithL), c_uint8(version), c_bool(isQueued), byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetDeviceWithL, c_int(api.masterId), c_int(tempSlaveId), c_bool(isWithL), c_uint8(version), c_bool(isQueued), byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
 
 
 def GetDeviceWithL(api):
     # 滑轨的特殊处理
-    if slaveDevType == DevType.Magician:
-        tempSlaveId = slaveId
-    elif masterDevType == DevType.Conntroller and (slaveDevType == DevType.MagicianLite or slaveDevType == DevType.Idle):
+    if api.slaveDevType == DevType.Magician:
+        tempSlaveId = api.slaveId
+    elif api.masterDevType == DevType.Conntroller and (api.slaveDevType == DevType.MagicianLite or api.slaveDevType == DevType.Idle):
         tempSlaveId = -1
     else:
-        tempSlaveId = slaveId
+        tempSlaveId = api.slaveId
 
     isWithL = c_bool(False)
-    while(True):
-        result = api.GetDeviceWithL(c_int(masterId), c_int(tempSlaveId), byref(isWithL))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetDeviceWithL, c_int(api.masterId), c_int(tempSlaveId), byref(isWithL))
     return [isWithL.value]
 
 
 def GetDeviceTime(api):
     time = c_uint32(0)
-    while(True):
-        result = api.GetDeviceTime(c_int(masterId), c_int(slaveId), byref(time))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetDeviceTime, c_int(api.masterId), c_int(api.slaveId), byref(time))
     return [time.value]
 
 
@@ -1082,7 +1062,7 @@ def GetDeviceID(api):
     CommunicateCount = 0
     timeout = False
     while(True):
-        result = api.GetDeviceID(c_int(masterId), c_int(-1), byref(deviceID))
+        result = api.GetDeviceID(c_int(api.masterId), c_int(-1), byref(deviceID))
         if result != DobotCommunicate.DobotCommunicate_NoError:
             if CommunicateCount > 3:
                 timeout = True
@@ -1101,53 +1081,35 @@ def GetDeviceID(api):
 
 def GetDeviceInfo(api):
     info = DeviceCountInfo()
-    while(True):
-        result = api.GetDeviceInfo(c_int(masterId), c_int(slaveId), byref(info))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetDeviceInfo, c_int(api.masterId), c_int(api.slaveId), byref(info))
     return [info.deviceRunTime, info.devicePowerOn, info.devicePowerOff]
 
 
 def ResetPose(api, manual, rearArmAngle, frontArmAngle):
     c_rearArmAngle = c_float(rearArmAngle)
     c_frontArmAngle = c_float(frontArmAngle)
-    while(True):
-        result = api.ResetPose(c_int(masterId), c_int(slaveId), manual, c_rearArmAngle, c_frontArmAngle)
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.ResetPose, c_int(api.masterId), c_int(api.slaveId), manual, c_rearArmAngle, c_frontArmAngle)
 
 
 def GetPose(api):
-    pose = Pose()
-    while(True):
-        result = api.GetPose(c_int(masterId), c_int(slaveId), byref(pose))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    buffers = callBuffers()
+    pose = buffers.pose
+    result = callWithRetry(api.GetPose, api.masterId, api.slaveId, buffers.poseRef)
     return [pose.x, pose.y, pose.z,pose.rHead, pose.joint1Angle, pose.joint2Angle, pose.joint3Angle, pose.joint4Angle]
 
 
 def GetPoseL(api):
     # 滑轨的特殊处理
-    if slaveDevType == DevType.Magician:
-        tempSlaveId = slaveId
-    elif masterDevType == DevType.Conntroller and (slaveDevType == DevType.MagicianLite or slaveDevType == DevType.Idle):
+    if api.slaveDevType == DevType.Magician:
+        tempSlaveId = api.slaveId
+    elif api.masterDevType == DevType.Conntroller and (api.slaveDevType == DevType.MagicianLite or api.slaveDevType == DevType.Idle):
         tempSlaveId = -1
     else:
-        tempSlaveId = slaveId
+        tempSlaveId = api.slaveId
 
-    l = c_float(0)
-    while(True):
-        result = api.GetPoseL(c_int(masterId), c_int(tempSlaveId), byref(l))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    buffers = callBuffers()
+    l = buffers.l
+    result = callWithRetry(api.GetPoseL, api.masterId, tempSlaveId, buffers.lRef)
     #parker add 20190524  判断返回的值是否为空
     if not math.isnan(l.value):
         return [l.value]
@@ -1157,12 +1119,7 @@ def GetPoseL(api):
 
 def GetKinematics(api):
     kinematics = Kinematics()
-    while(True):
-        result = api.GetKinematics(c_int(masterId), c_int(slaveId), byref(kinematics))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetKinematics, c_int(api.masterId), c_int(api.slaveId), byref(kinematics))
     return [kinematics.velocity, kinematics.acceleration]
 
 
@@ -1170,32 +1127,17 @@ def GetAlarmsState(api,  maxLen=1000):
     alarmsState = create_string_buffer(maxLen) 
     #alarmsState = c_byte(0)
     len = c_int(0)
-    while(True):
-        result = api.GetAlarmsState(c_int(masterId), c_int(slaveId), alarmsState, byref(len),  maxLen)
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetAlarmsState, c_int(api.masterId), c_int(api.slaveId), alarmsState, byref(len),  maxLen)
     return [alarmsState.raw, len.value]
     
 
 def ClearAllAlarmsState(api):
-    while(True):
-        result = api.ClearAllAlarmsState(c_int(masterId), c_int(slaveId))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.ClearAllAlarmsState, c_int(api.masterId), c_int(api.slaveId))
 
 
 def GetUserParams(api):
     param = UserParams()
-    while(True):
-        result = api.GetUserParams(c_int(masterId), c_int(slaveId), byref(param))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetUserParams, c_int(api.masterId), c_int(api.slaveId), byref(param))
     return [param.params1,param.params2,param.params3,param.params4,param.params5,param.params6,param.params7,param.params8]
 
 
@@ -1206,23 +1148,13 @@ def SetHOMEParams(api,  x,  y,  z,  r,  isQueued=0):
     param.z = z
     param.r = r
     queuedCmdIndex = c_uint64(0)
-    while(True):
-        result = api.SetHOMEParams(c_int(masterId), c_int(slaveId), byref(param),  isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetHOMEParams, c_int(api.masterId), c_int(api.slaveId), byref(param),  isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
 
 
 def GetHOMEParams(api):
     param = HOMEParams()
-    while(True):
-        result = api.GetHOMEParams(c_int(masterId), c_int(slaveId), byref(param))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetHOMEParams, c_int(api.masterId), c_int(api.slaveId), byref(param))
     return [param.x, param.y, param.z, param.r]
 
 
@@ -1232,46 +1164,21 @@ def SetHOMECmd(api, temp, isQueued=0):
     queuedCmdIndex = c_uint64(0)
     queuedCmdIndex1 = c_uint64(0)
     # 滑轨的特殊处理
-    if masterDevType == DevType.Magician:
+    if api.masterDevType == DevType.Magician:
         # 只有Magician
-        while(True):
-            result = api.SetHOMECmd(c_int(masterId), c_int(slaveId), byref(cmd), isQueued, byref(queuedCmdIndex))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
-    elif masterDevType == DevType.Conntroller and slaveDevType == DevType.MagicianLite:
+        result = callWithRetry(api.SetHOMECmd, c_int(api.masterId), c_int(api.slaveId), byref(cmd), isQueued, byref(queuedCmdIndex))
+    elif api.masterDevType == DevType.Conntroller and api.slaveDevType == DevType.MagicianLite:
         # 外部控制器加MagicianLite
         # if isUsingLinearRail:#如果使用了滑轨，发给控制盒
-        while(True):
-            result = api.SetHOMECmd(c_int(masterId), c_int(-1), byref(cmd), isQueued, byref(queuedCmdIndex1))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
-        while(True):
-            result = api.SetHOMECmd(c_int(masterId), c_int(slaveId), byref(cmd), isQueued, byref(queuedCmdIndex))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
-    elif masterDevType == DevType.Conntroller and slaveDevType == DevType.Idle:
+        result = callWithRetry(api.SetHOMECmd, c_int(api.masterId), c_int(-1), byref(cmd), isQueued, byref(queuedCmdIndex1))
+        result = callWithRetry(api.SetHOMECmd, c_int(api.masterId), c_int(api.slaveId), byref(cmd), isQueued, byref(queuedCmdIndex))
+    elif api.masterDevType == DevType.Conntroller and api.slaveDevType == DevType.Idle:
         # 外部控制器
         # if isUsingLinearRail:
-        while(True):
-            result = api.SetHOMECmd(c_int(masterId), c_int(-1), byref(cmd), isQueued, byref(queuedCmdIndex1))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
+        result = callWithRetry(api.SetHOMECmd, c_int(api.masterId), c_int(-1), byref(cmd), isQueued, byref(queuedCmdIndex1))
     else:
         # 其他情况
-        while(True):
-            result = api.SetHOMECmd(c_int(masterId), c_int(slaveDevType), byref(cmd), isQueued, byref(queuedCmdIndex))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
+        result = callWithRetry(api.SetHOMECmd, c_int(api.masterId), c_int(api.slaveDevType), byref(cmd), isQueued, byref(queuedCmdIndex))
 
     return [queuedCmdIndex.value, queuedCmdIndex1.value]
     
@@ -1281,91 +1188,51 @@ def SetAutoLevelingCmd(api, controlFlag, precision, isQueued=0):
     cmd.controlFlag = controlFlag
     cmd.precision = precision
     queuedCmdIndex = c_uint64(0)
-    while(True):
-        result = api.SetAutoLevelingCmd(c_int(masterId), c_int(slaveId), byref(cmd), isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetAutoLevelingCmd, c_int(api.masterId), c_int(api.slaveId), byref(cmd), isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
 
 
 def GetAutoLevelingResult(api):
     precision = c_float(0)
-    while(True):
-        result = api.GetAutoLevelingResult(c_int(masterId), c_int(slaveId), byref(precision))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetAutoLevelingResult, c_int(api.masterId), c_int(api.slaveId), byref(precision))
     return [precision.value]
 
 
 def SetArmOrientation(api,  armOrientation, isQueued=0):
     queuedCmdIndex = c_uint64(0)
-    while(True):
-        result = api.SetArmOrientation(c_int(masterId), c_int(slaveId), armOrientation, isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetArmOrientation, c_int(api.masterId), c_int(api.slaveId), armOrientation, isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
     
 
 def GetArmOrientation(api):
     armOrientation = c_int32(0)
-    while(True):
-        result = api.GetArmOrientation(c_int(masterId), c_int(slaveId), byref(armOrientation))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetArmOrientation, c_int(api.masterId), c_int(api.slaveId), byref(armOrientation))
     return [armOrientation.value]
     
 
 def SetHHTTrigMode(api, hhtTrigMode):
-    while(True):
-        result = api.SetHHTTrigMode(c_int(masterId), c_int(slaveId), hhtTrigMode)
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetHHTTrigMode, c_int(api.masterId), c_int(api.slaveId), hhtTrigMode)
         
 
 def GetHHTTrigMode(api):
     hhtTrigMode = c_int(0)
-    while(True):
-        result = api.GetHHTTrigMode(c_int(masterId), c_int(slaveId), byref(hhtTrigMode))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetHHTTrigMode, c_int(api.masterId), c_int(api.slaveId), byref(hhtTrigMode))
     return [hhtTrigMode.value]
 
 
 def SetHHTTrigOutputEnabled(api, isEnabled):
-    while(True):
-        result = api.SetHHTTrigOutputEnabled(c_int(masterId), c_int(slaveId), isEnabled)
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetHHTTrigOutputEnabled, c_int(api.masterId), c_int(api.slaveId), isEnabled)
 
 
 def GetHHTTrigOutputEnabled(api):
     isEnabled = c_int32(0)
-    while(True):
-        result = api.GetHHTTrigOutputEnabled(c_int(masterId), c_int(slaveId), byref(isEnabled))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetHHTTrigOutputEnabled, c_int(api.masterId), c_int(api.slaveId), byref(isEnabled))
     return [isEnabled.value]
 
 
 def GetHHTTrigOutput(api):
     isAvailable = c_int32(0)
-    result = api.GetHHTTrigOutput(c_int(masterId), c_int(slaveId), byref(isAvailable))
+    result = api.GetHHTTrigOutput(c_int(api.masterId), c_int(api.slaveId), byref(isAvailable))
     if result != DobotCommunicate.DobotCommunicate_NoError or isAvailable.value == 0:
         return [False]
     return [True]
@@ -1378,92 +1245,53 @@ def SetEndEffectorParams(api, xBias, yBias, zBias, isQueued=0):
     param.yBias = yBias
     param.zBias = zBias
     queuedCmdIndex = c_uint64(0)
-    while(True):
-        result = api.SetEndEffectorParams(c_int(masterId), c_int(slaveId), byref(param),  isQueued,  byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetEndEffectorParams, c_int(api.masterId), c_int(api.slaveId), byref(param),  isQueued,  byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
         
 
 def GetEndEffectorParams(api):
     param = EndTypeParams()
-    while(True):
-        result = api.GetEndEffectorParams(c_int(masterId), c_int(slaveId), byref(param))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetEndEffectorParams, c_int(api.masterId), c_int(api.slaveId), byref(param))
     return [param.xBias, param.yBias, param.zBias]
     
 
 def SetEndEffectorLaser(api, enableCtrl,  on, isQueued=0):
     queuedCmdIndex = c_uint64(0)
-    while(True):
-        result = api.SetEndEffectorLaser(c_int(masterId), c_int(slaveId), enableCtrl,  on,  isQueued,  byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetEndEffectorLaser, c_int(api.masterId), c_int(api.slaveId), enableCtrl,  on,  isQueued,  byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
         
 
 def GetEndEffectorLaser(api):
     isCtrlEnabled = c_int(0)
     isOn = c_int(0)
-    while(True):
-        result = api.GetEndEffectorLaser(c_int(masterId), c_int(slaveId), byref(isCtrlEnabled),  byref(isOn))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetEndEffectorLaser, c_int(api.masterId), c_int(api.slaveId), byref(isCtrlEnabled),  byref(isOn))
     return [isCtrlEnabled.value, isOn.value]
     
 
 def SetEndEffectorSuctionCup(api, enableCtrl,  on, isQueued=0):
     queuedCmdIndex = c_uint64(0)
-    while(True):
-        result = api.SetEndEffectorSuctionCup(c_int(masterId), c_int(slaveId), enableCtrl,  on,  isQueued,  byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetEndEffectorSuctionCup, c_int(api.masterId), c_int(api.slaveId), enableCtrl,  on,  isQueued,  byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
         
 
 def GetEndEffectorSuctionCup(api):
     enableCtrl = c_int(0)
     isOn = c_int(0)
-    while(True):
-        result = api.GetEndEffectorSuctionCup(c_int(masterId), c_int(slaveId), byref(enableCtrl),  byref(isOn))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetEndEffectorSuctionCup, c_int(api.masterId), c_int(api.slaveId), byref(enableCtrl),  byref(isOn))
     return [isOn.value]
     
 
 def SetEndEffectorGripper(api, enableCtrl,  on, isQueued=0):
-    queuedCmdIndex = c_uint64(0)
-    while(True):
-        result = api.SetEndEffectorGripper(c_int(masterId), c_int(slaveId), enableCtrl,  on,  isQueued,  byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    buffers = callBuffers()
+    queuedCmdIndex = buffers.queuedCmdIndex
+    result = callWithRetry(api.SetEndEffectorGripper, api.masterId, api.slaveId, enableCtrl,  on,  isQueued,  buffers.queuedCmdIndexRef)
     return [queuedCmdIndex.value]
         
 
 def GetEndEffectorGripper(api):
     enableCtrl = c_int(0)
     isOn = c_int(0)
-    while(True):
-        result = api.GetEndEffectorGripper(c_int(masterId), c_int(slaveId), byref(enableCtrl),  byref(isOn))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetEndEffectorGripper, c_int(api.masterId), c_int(api.slaveId), byref(enableCtrl),  byref(isOn))
     return [isOn.value]
 
 
@@ -1478,23 +1306,13 @@ def SetJOGJointParams(api, j1Velocity, j1Acceleration, j2Velocity, j2Acceleratio
     jogParam.joint4Velocity = j4Velocity
     jogParam.joint4Acceleration = j4Acceleration
     queuedCmdIndex = c_uint64(0)
-    while(True):
-        result = api.SetJOGJointParams(c_int(masterId), c_int(slaveId), byref(jogParam), isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetJOGJointParams, c_int(api.masterId), c_int(api.slaveId), byref(jogParam), isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
 
 
 def GetJOGJointParams(api):
     param = JOGJointParams()
-    while(True):
-        result = api.GetJOGJointParams(c_int(masterId), c_int(slaveId), byref(param))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetJOGJointParams, c_int(api.masterId), c_int(api.slaveId), byref(param))
     return [param.joint1Velocity, param.joint1Acceleration, param.joint2Velocity, param.joint2Acceleration, param.joint3Velocity, param.joint3Acceleration, param.joint4Velocity, param.joint4Acceleration]
 
 
@@ -1509,64 +1327,44 @@ def SetJOGCoordinateParams(api, xVelocity, xAcceleration, yVelocity, yAccelerati
     param.rVelocity = rVelocity
     param.rAcceleration = rAcceleration
     queuedCmdIndex = c_uint64(0)
-    while(True):
-        result = api.SetJOGCoordinateParams(c_int(masterId), c_int(slaveId), byref(param), isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetJOGCoordinateParams, c_int(api.masterId), c_int(api.slaveId), byref(param), isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
 
 
 def GetJOGCoordinateParams(api):
     param = JOGCoordinateParams()
-    while(True):
-        result = api.GetJOGCoordinateParams(c_int(masterId), c_int(slaveId), byref(param))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetJOGCoordinateParams, c_int(api.masterId), c_int(api.slaveId), byref(param))
     return [param.xVelocity, param.xAcceleration, param.yVelocity, param.yVelocity, param.zVelocity, param.zAcceleration, param.rVelocity, param.rAcceleration]
 
 
 def SetJOGLParams(api, velocity, acceleration, isQueued=0):
     # 滑轨的特殊处理
-    if slaveDevType == DevType.Magician:
-        tempSlaveId = slaveId
-    elif masterDevType == DevType.Conntroller and (slaveDevType == DevType.MagicianLite or slaveDevType == DevType.Idle):
+    if api.slaveDevType == DevType.Magician:
+        tempSlaveId = api.slaveId
+    elif api.masterDevType == DevType.Conntroller and (api.slaveDevType == DevType.MagicianLite or api.slaveDevType == DevType.Idle):
         tempSlaveId = -1
     else:
-        tempSlaveId = slaveId
+        tempSlaveId = api.slaveId
 
     param = JOGLParams()
     param.velocity = velocity
     param.acceleration = acceleration
     queuedCmdIndex = c_uint64(0)
-    while(True):
-        result = api.SetJOGLParams(c_int(masterId), c_int(tempSlaveId), byref(param), isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetJOGLParams, c_int(api.masterId), c_int(tempSlaveId), byref(param), isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
     
 
 def GetJOGLParams(api):
     # 滑轨的特殊处理
-    if slaveDevType == DevType.Magician:
-        tempSlaveId = slaveId
-    elif masterDevType == DevType.Conntroller and (slaveDevType == DevType.MagicianLite or slaveDevType == DevType.Idle):
+    if api.slaveDevType == DevType.Magician:
+        tempSlaveId = api.slaveId
+    elif api.masterDevType == DevType.Conntroller and (api.slaveDevType == DevType.MagicianLite or api.slaveDevType == DevType.Idle):
         tempSlaveId = -1
     else:
-        tempSlaveId = slaveId
+        tempSlaveId = api.slaveId
 
     param = JOGLParams()
-    while(True):
-        result = api.GetJOGLParams(c_int(masterId), c_int(tempSlaveId), byref(param))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetJOGLParams, c_int(api.masterId), c_int(tempSlaveId), byref(param))
     return [param.velocity,  param.acceleration]
 
 
@@ -1577,92 +1375,48 @@ def SetJOGCommonParams(api, value_velocityratio, value_accelerationratio, isQueu
     queuedCmdIndex = c_uint64(0)
 
     # 滑轨的特殊处理
-    if slaveDevType == DevType.Magician:
-        while(True):
-            result = api.SetJOGCommonParams(c_int(masterId), c_int(slaveId), byref(param), isQueued, byref(queuedCmdIndex))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
-    elif masterDevType == DevType.Conntroller and slaveDevType == DevType.MagicianLite:
-        while(True):
-            result = api.SetJOGCommonParams(c_int(masterId), c_int(-1), byref(param), isQueued, byref(queuedCmdIndex))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
-        while(True):
-            result = api.SetJOGCommonParams(c_int(masterId), c_int(slaveId), byref(param), isQueued, byref(queuedCmdIndex))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
-    elif masterDevType == DevType.Conntroller and slaveDevType == DevType.Idle:
-        while(True):
-            result = api.SetJOGCommonParams(c_int(masterId), c_int(-1), byref(param), isQueued, byref(queuedCmdIndex))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
+    if api.slaveDevType == DevType.Magician:
+        result = callWithRetry(api.SetJOGCommonParams, c_int(api.masterId), c_int(api.slaveId), byref(param), isQueued, byref(queuedCmdIndex))
+    elif api.masterDevType == DevType.Conntroller and api.slaveDevType == DevType.MagicianLite:
+        result = callWithRetry(api.SetJOGCommonParams, c_int(api.masterId), c_int(-1), byref(param), isQueued, byref(queuedCmdIndex))
+        result = callWithRetry(api.SetJOGCommonParams, c_int(api.masterId), c_int(api.slaveId), byref(param), isQueued, byref(queuedCmdIndex))
+    elif api.masterDevType == DevType.Conntroller and api.slaveDevType == DevType.Idle:
+        result = callWithRetry(api.SetJOGCommonParams, c_int(api.masterId), c_int(-1), byref(param), isQueued, byref(queuedCmdIndex))
     else:
-        while(True):
-            result = api.SetJOGCommonParams(c_int(masterId), c_int(slaveId), byref(param), isQueued, byref(queuedCmdIndex))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
+        result = callWithRetry(api.SetJOGCommonParams, c_int(api.masterId), c_int(api.slaveId), byref(param), isQueued, byref(queuedCmdIndex))
 
     return [queuedCmdIndex.value]
 
 
 def GetJOGCommonParams(api):
     param = JOGCommonParams()
-    while(True):
-        result = api.GetJOGCommonParams(c_int(masterId), c_int(slaveId), byref(param))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetJOGCommonParams, c_int(api.masterId), c_int(api.slaveId), byref(param))
     return [param.velocityRatio, param.accelerationRatio]
 
 
 def SetJOGCmd(api, isJoint, cmd, isQueued=0):
     # 滑轨的特殊处理
-    if slaveDevType == DevType.Magician:
-        tempSlaveId = slaveId
-    elif masterDevType == DevType.Conntroller and slaveDevType == DevType.MagicianLite:
+    if api.slaveDevType == DevType.Magician:
+        tempSlaveId = api.slaveId
+    elif api.masterDevType == DevType.Conntroller and api.slaveDevType == DevType.MagicianLite:
         if cmd == 9 or cmd == 10:
             tempSlaveId = -1
         else:
-            tempSlaveId = slaveId
+            tempSlaveId = api.slaveId
     else:
-        tempSlaveId = slaveId
+        tempSlaveId = api.slaveId
 
-    cmdParam = JOGCmd()
+    buffers = callBuffers()
+    cmdParam = buffers.jogCmd
     cmdParam.isJoint = isJoint
     cmdParam.cmd = cmd
-    queuedCmdIndex = c_uint64(0)
+    queuedCmdIndex = buffers.queuedCmdIndex
 
     if cmd == 0:
-        while(True):
-            result = api.SetJOGCmd(c_int(masterId), c_int(-1), byref(cmdParam), isQueued, byref(queuedCmdIndex))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
-        while(True):
-            result = api.SetJOGCmd(c_int(masterId), c_int(slaveId), byref(cmdParam), isQueued, byref(queuedCmdIndex))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
+        result = callWithRetry(api.SetJOGCmd, api.masterId, -1, buffers.jogCmdRef, isQueued, buffers.queuedCmdIndexRef)
+        result = callWithRetry(api.SetJOGCmd, api.masterId, api.slaveId, buffers.jogCmdRef, isQueued, buffers.queuedCmdIndexRef)
     else:
-        while(True):
-            result = api.SetJOGCmd(c_int(masterId), c_int(tempSlaveId), byref(cmdParam), isQueued, byref(queuedCmdIndex))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
+        result = callWithRetry(api.SetJOGCmd, api.masterId, tempSlaveId, buffers.jogCmdRef, isQueued, buffers.queuedCmdIndexRef)
     return [queuedCmdIndex.value]
 
 
@@ -1677,23 +1431,13 @@ def SetPTPJointParams(api, j1Velocity, j1Acceleration, j2Velocity, j2Acceleratio
     pbParam.joint4Velocity = j4Velocity
     pbParam.joint4Acceleration = j4Acceleration
     queuedCmdIndex = c_uint64(0)
-    while(True):
-        result = api.SetPTPJointParams(c_int(masterId), c_int(slaveId), byref(pbParam), isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetPTPJointParams, c_int(api.masterId), c_int(api.slaveId), byref(pbParam), isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
 
 
 def GetPTPJointParams(api):
     pbParam = PTPJointParams()
-    while(True):
-        result = api.GetPTPJointParams(c_int(masterId), c_int(slaveId), byref(pbParam))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetPTPJointParams, c_int(api.masterId), c_int(api.slaveId), byref(pbParam))
     return [pbParam.joint1Velocity,pbParam.joint1Acceleration,pbParam.joint2Velocity,pbParam.joint2Acceleration,pbParam.joint3Velocity,pbParam.joint3Acceleration,pbParam.joint4Velocity,pbParam.joint4Acceleration]
 
 
@@ -1704,63 +1448,43 @@ def SetPTPCoordinateParams(api, xyzVelocity, xyzAcceleration, rVelocity,  rAccel
     pbParam.xyzAcceleration = xyzAcceleration
     pbParam.rAcceleration = rAcceleration
     queuedCmdIndex = c_uint64(0)
-    while(True):
-        result = api.SetPTPCoordinateParams(c_int(masterId), c_int(slaveId), byref(pbParam), isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetPTPCoordinateParams, c_int(api.masterId), c_int(api.slaveId), byref(pbParam), isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
 
 
 def GetPTPCoordinateParams(api):
     pbParam = PTPCoordinateParams()
-    while(True):
-        result = api.GetPTPCoordinateParams(c_int(masterId), c_int(slaveId), byref(pbParam))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetPTPCoordinateParams, c_int(api.masterId), c_int(api.slaveId), byref(pbParam))
     return [pbParam.xyzVelocity, pbParam.rVelocity, pbParam.xyzAcceleration, pbParam.rAcceleration]
     
 
 def SetPTPLParams(api, velocity, acceleration, isQueued=0):
     # 滑轨的特殊处理
-    if slaveDevType == DevType.Magician:
-        tempSlaveId = slaveId
-    elif masterDevType == DevType.Conntroller and (slaveDevType == DevType.MagicianLite or slaveDevType == DevType.Idle):
+    if api.slaveDevType == DevType.Magician:
+        tempSlaveId = api.slaveId
+    elif api.masterDevType == DevType.Conntroller and (api.slaveDevType == DevType.MagicianLite or api.slaveDevType == DevType.Idle):
         tempSlaveId = -1
     else:
-        tempSlaveId = slaveId
+        tempSlaveId = api.slaveId
 
     param = PTPLParams()
     param.velocity = velocity
     param.acceleration = acceleration
     queuedCmdIndex = c_uint64(0)
-    while(True):
-        result = api.SetPTPLParams(c_int(masterId), c_int(tempSlaveId), byref(param), isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetPTPLParams, c_int(api.masterId), c_int(tempSlaveId), byref(param), isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
     
 
 def GetPTPLParams(api):
     # 滑轨的特殊处理
-    if slaveDevType == DevType.Magician:
-        tempSlaveId = slaveId
-    elif masterDevType == DevType.Conntroller and (slaveDevType == DevType.MagicianLite or slaveDevType == DevType.Idle):
+    if api.slaveDevType == DevType.Magician:
+        tempSlaveId = api.slaveId
+    elif api.masterDevType == DevType.Conntroller and (api.slaveDevType == DevType.MagicianLite or api.slaveDevType == DevType.Idle):
         tempSlaveId = -1
     else:
-        tempSlaveId = slaveId
+        tempSlaveId = api.slaveId
     param = PTPLParams()
-    while(True):
-        result = api.GetPTPLParams(c_int(masterId), c_int(tempSlaveId), byref(param))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetPTPLParams, c_int(api.masterId), c_int(tempSlaveId), byref(param))
     return [param.velocity,  param.acceleration]
     
 
@@ -1770,23 +1494,13 @@ def SetPTPJumpParams(api, jumpHeight, zLimit, isQueued=0):
     pbParam.zLimit = zLimit
     queuedCmdIndex = c_uint64(0)
         
-    while(True):
-        result = api.SetPTPJumpParams(c_int(masterId), c_int(slaveId), byref(pbParam), isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetPTPJumpParams, c_int(api.masterId), c_int(api.slaveId), byref(pbParam), isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
 
 
 def GetPTPJumpParams(api):
     pbParam = PTPJumpParams()
-    while(True):
-        result = api.GetPTPJumpParams(c_int(masterId), c_int(slaveId), byref(pbParam))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetPTPJumpParams, c_int(api.masterId), c_int(api.slaveId), byref(pbParam))
     return [pbParam.jumpHeight, pbParam.zLimit]
 
 
@@ -1797,130 +1511,72 @@ def SetPTPCommonParams(api, velocityRatio, accelerationRatio, isQueued=0):
     queuedCmdIndex = c_uint64(0)
     
     # 滑轨的特殊处理
-    if slaveDevType == DevType.Magician:
-        while(True):
-            result = api.SetPTPCommonParams(c_int(masterId), c_int(slaveId), byref(pbParam), isQueued, byref(queuedCmdIndex))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
-    elif masterDevType == DevType.Conntroller and slaveDevType == DevType.MagicianLite:
-        while(True):
-            result = api.SetPTPCommonParams(c_int(masterId), c_int(-1), byref(pbParam), isQueued, byref(queuedCmdIndex))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
-        while(True):
-            result = api.SetPTPCommonParams(c_int(masterId), c_int(slaveId), byref(pbParam), isQueued, byref(queuedCmdIndex))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
+    if api.slaveDevType == DevType.Magician:
+        result = callWithRetry(api.SetPTPCommonParams, c_int(api.masterId), c_int(api.slaveId), byref(pbParam), isQueued, byref(queuedCmdIndex))
+    elif api.masterDevType == DevType.Conntroller and api.slaveDevType == DevType.MagicianLite:
+        result = callWithRetry(api.SetPTPCommonParams, c_int(api.masterId), c_int(-1), byref(pbParam), isQueued, byref(queuedCmdIndex))
+        result = callWithRetry(api.SetPTPCommonParams, c_int(api.masterId), c_int(api.slaveId), byref(pbParam), isQueued, byref(queuedCmdIndex))
     else:
-        while(True):
-            result = api.SetPTPCommonParams(c_int(masterId), c_int(slaveId), byref(pbParam), isQueued, byref(queuedCmdIndex))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
+        result = callWithRetry(api.SetPTPCommonParams, c_int(api.masterId), c_int(api.slaveId), byref(pbParam), isQueued, byref(queuedCmdIndex))
 
     return [queuedCmdIndex.value]
 
 
 def GetPTPCommonParams(api):
     pbParam = PTPCommonParams()
-    while(True):
-        result = api.GetPTPCommonParams(c_int(masterId), c_int(slaveId), byref(pbParam ))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetPTPCommonParams, c_int(api.masterId), c_int(api.slaveId), byref(pbParam ))
     return [pbParam.velocityRatio, pbParam.accelerationRatio]
     
 
 def SetPTPCmd(api, ptpMode, x, y, z, rHead, isQueued=0):
-    cmd = PTPCmd()
+    buffers = callBuffers()
+    cmd = buffers.ptpCmd
     cmd.ptpMode=ptpMode
     cmd.x=x
     cmd.y=y
     cmd.z=z
     cmd.rHead=rHead
-    queuedCmdIndex = c_uint64(0)
-    while(True):
-        result = api.SetPTPCmd(c_int(masterId), c_int(slaveId), byref(cmd), isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(2)
-            continue
-        break
+    queuedCmdIndex = buffers.queuedCmdIndex
+    result = callWithRetry(api.SetPTPCmd, api.masterId, api.slaveId, buffers.ptpCmdRef, isQueued, buffers.queuedCmdIndexRef)
     return [queuedCmdIndex.value]
     
 
 def SetPTPWithLCmd(api, ptpMode, x, y, z, rHead, l, isQueued=0):
-    cmd = PTPWithLCmd()
+    buffers = callBuffers()
+    cmd = buffers.ptpWithLCmd
     cmd.ptpMode=ptpMode
     cmd.x=x
     cmd.y=y
     cmd.z=z
     cmd.rHead=rHead
     cmd.l = l
-    queuedCmdIndex = c_uint64(0)
+    queuedCmdIndex = buffers.queuedCmdIndex
 
     # 滑轨的特殊处理
-    if slaveDevType == DevType.Magician:
-        while(True):
-            result = api.SetPTPWithLCmd(c_int(masterId), c_int(slaveId), byref(cmd), isQueued, byref(queuedCmdIndex))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(2)
-                continue
-            break
-    elif masterDevType == DevType.Conntroller and slaveDevType == DevType.MagicianLite:
-        cmd1 = PTPCmd()
+    if api.slaveDevType == DevType.Magician:
+        result = callWithRetry(api.SetPTPWithLCmd, api.masterId, api.slaveId, buffers.ptpWithLCmdRef, isQueued, buffers.queuedCmdIndexRef)
+    elif api.masterDevType == DevType.Conntroller and api.slaveDevType == DevType.MagicianLite:
+        cmd1 = buffers.ptpCmd
         cmd1.ptpMode = ptpMode
         cmd1.x = x
         cmd1.y = y
         cmd1.z = z
         cmd1.rHead = rHead
-        queuedCmdIndex1 = c_uint64(0)
-        while(True):
-            result = api.SetPTPWithLCmd(c_int(masterId), c_int(-1), byref(cmd), isQueued, byref(queuedCmdIndex))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(2)
-                continue
-            break
-        while(True):
-            result = api.SetPTPCmd(c_int(masterId), c_int(slaveId), byref(cmd1), isQueued, byref(queuedCmdIndex1))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(2)
-                continue
-            break
+        queuedCmdIndex1 = buffers.queuedCmdIndex1
+        result = callWithRetry(api.SetPTPWithLCmd, api.masterId, -1, buffers.ptpWithLCmdRef, isQueued, buffers.queuedCmdIndexRef)
+        result = callWithRetry(api.SetPTPCmd, api.masterId, api.slaveId, buffers.ptpCmdRef, isQueued, buffers.queuedCmdIndex1Ref)
     else:
-        while(True):
-            result = api.SetPTPWithLCmd(c_int(masterId), c_int(slaveId), byref(cmd), isQueued, byref(queuedCmdIndex))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(2)
-                continue
-            break
+        result = callWithRetry(api.SetPTPWithLCmd, api.masterId, api.slaveId, buffers.ptpWithLCmdRef, isQueued, buffers.queuedCmdIndexRef)
     return [queuedCmdIndex.value]
     
 
 def SetCPRHoldEnable(api, isEnable):
-    while(True):
-        result = api.SetCPRHoldEnable(c_int(masterId), c_int(slaveId), c_bool(isEnable))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetCPRHoldEnable, c_int(api.masterId), c_int(api.slaveId), c_bool(isEnable))
 
 
 def GetCPRHoldEnable(api):
     isEnable = c_bool(False)
-    while(True):
-        result = api.GetCPRHoldEnable(c_int(masterId), c_int(slaveId), byref(isEnable))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetCPRHoldEnable, c_int(api.masterId), c_int(api.slaveId), byref(isEnable))
     return [isEnable.value]
     
 
@@ -1931,41 +1587,27 @@ def SetCPParams(api, planAcc, juncitionVel, acc, realTimeTrack = 0,  isQueued=0)
     parm.acc = acc
     parm.realTimeTrack = realTimeTrack
     queuedCmdIndex = c_uint64(0)
-    while(True):
-        result = api.SetCPParams(c_int(masterId), c_int(slaveId), byref(parm), isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetCPParams, c_int(api.masterId), c_int(api.slaveId), byref(parm), isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
 
 
 def GetCPParams(api):
     parm = CPParams()
-    while(True):
-        result = api.GetCPParams(c_int(masterId), c_int(slaveId), byref(parm))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetCPParams, c_int(api.masterId), c_int(api.slaveId), byref(parm))
     return [parm.planAcc, parm.juncitionVel, parm.acc, parm.realTimeTrack]
 
 
 def SetCPCmd(api, cpMode, x, y, z, velocity, isQueued=0):
-    cmd = CPCmd()
+    buffers = callBuffers()
+    cmd = buffers.cpCmd
     cmd.cpMode = cpMode
     cmd.x = x
     cmd.y = y
     cmd.z = z
     cmd.velocity = velocity
-    queuedCmdIndex = c_uint64(0)
+    queuedCmdIndex = buffers.queuedCmdIndex
 
-    while(True):
-        result = api.SetCPCmd(c_int(masterId), c_int(slaveId), byref(cmd), isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(2)
-            continue
-        break
+    result = callWithRetry(api.SetCPCmd, api.masterId, api.slaveId, buffers.cpCmdRef, isQueued, buffers.queuedCmdIndexRef)
     return [queuedCmdIndex.value]
 
 
@@ -1978,12 +1620,7 @@ def SetCP2Cmd(api, cpMode, x, y, z, isQueued=0):
     cmd.velocity = c_float(100)
     queuedCmdIndex = c_uint64(0)
 
-    while(True):
-        result = api.SetCP2Cmd(c_int(masterId), c_int(slaveId), byref(cmd), isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(2)
-            continue
-        break
+    result = callWithRetry(api.SetCP2Cmd, c_int(api.masterId), c_int(api.slaveId), byref(cmd), isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
     
 
@@ -1992,23 +1629,13 @@ def SetCPCommonParams(api, velocityRatio, accelerationRatio, isQueued=0):
     pbParam.velocityRatio = velocityRatio
     pbParam.accelerationRatio = accelerationRatio
     queuedCmdIndex = c_uint64(0)
-    while(True):
-        result = api.SetCPCommonParams(c_int(masterId), c_int(slaveId), byref(pbParam), isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetCPCommonParams, c_int(api.masterId), c_int(api.slaveId), byref(pbParam), isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
 
 
 def GetCPCommonParams(api):
     pbParam = CPCommonParams()
-    while(True):
-        result = api.GetCPCommonParams(c_int(masterId), c_int(slaveId), byref(pbParam ))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetCPCommonParams, c_int(api.masterId), c_int(api.slaveId), byref(pbParam ))
     return [pbParam.velocityRatio, pbParam.accelerationRatio]
     
 
@@ -2020,12 +1647,7 @@ def SetCPLECmd(api, cpMode, x, y, z, power, isQueued=0):
     cmd.z = z
     cmd.velocity = power
     queuedCmdIndex = c_uint64(0)
-    while(True):
-        result = api.SetCPLECmd(c_int(masterId), c_int(slaveId), byref(cmd), isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(2)
-            continue
-        break
+    result = callWithRetry(api.SetCPLECmd, c_int(api.masterId), c_int(api.slaveId), byref(cmd), isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
     
 
@@ -2036,22 +1658,12 @@ def SetARCParams(api,  xyzVelocity, rVelocity, xyzAcceleration, rAcceleration,
     param.xyzAcceleration = xyzAcceleration
     param.rAcceleration = rAcceleration
     queuedCmdIndex = c_uint64(0)
-    while(True):
-        result = api.SetARCParams(c_int(masterId), c_int(slaveId), byref(param), isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetARCParams, c_int(api.masterId), c_int(api.slaveId), byref(param), isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
 
 def GetARCParams(api):
     parm = ARCParams()
-    while(True):
-        result = api.GetARCParams(c_int(masterId), c_int(slaveId), byref(parm))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetARCParams, c_int(api.masterId), c_int(api.slaveId), byref(parm))
     return [parm.xyzVelocity, parm.rVelocity, parm.xyzAcceleration, parm.rAcceleration]
     
 
@@ -2060,12 +1672,7 @@ def SetARCCmd(api, cirPoint, toPoint,  isQueued=0):
     cmd.cirPoint.x = cirPoint[0];cmd.cirPoint.y = cirPoint[1];cmd.cirPoint.z = cirPoint[2];cmd.cirPoint.rHead = cirPoint[3]
     cmd.toPoint.x = toPoint[0];cmd.toPoint.y = toPoint[1];cmd.toPoint.z = toPoint[2];cmd.toPoint.rHead = toPoint[3]
     queuedCmdIndex = c_uint64(0)
-    while(True):
-        result = api.SetARCCmd(c_int(masterId), c_int(slaveId), byref(cmd), isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetARCCmd, c_int(api.masterId), c_int(api.slaveId), byref(cmd), isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
     
 
@@ -2074,12 +1681,7 @@ def SetCircleCmd(api, cirPoint, toPoint,  isQueued=0):
     cmd.cirPoint.x = cirPoint[0];cmd.cirPoint.y = cirPoint[1];cmd.cirPoint.z = cirPoint[2];cmd.cirPoint.rHead = cirPoint[3]
     cmd.toPoint.x = toPoint[0];cmd.toPoint.y = toPoint[1];cmd.toPoint.z = toPoint[2];cmd.toPoint.rHead = toPoint[3]
     queuedCmdIndex = c_uint64(0)
-    while(True):
-        result = api.SetCircleCmd(c_int(masterId), c_int(slaveId), byref(cmd), isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetCircleCmd, c_int(api.masterId), c_int(api.slaveId), byref(cmd), isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
     
 
@@ -2088,23 +1690,13 @@ def SetARCCommonParams(api, velocityRatio, accelerationRatio, isQueued=0):
     pbParam.velocityRatio = velocityRatio
     pbParam.accelerationRatio = accelerationRatio
     queuedCmdIndex = c_uint64(0)
-    while(True):
-        result = api.SetARCCommonParams(c_int(masterId), c_int(slaveId), byref(pbParam), isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetARCCommonParams, c_int(api.masterId), c_int(api.slaveId), byref(pbParam), isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
 
 
 def GetARCCommonParams(api):
     pbParam = ARCCommonParams()
-    while(True):
-        result = api.GetARCCommonParams(c_int(masterId), c_int(slaveId), byref(pbParam ))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetARCCommonParams, c_int(api.masterId), c_int(api.slaveId), byref(pbParam ))
     return [pbParam.velocityRatio, pbParam.accelerationRatio]
 
 
@@ -2112,12 +1704,7 @@ def SetWAITCmd(api, waitTime, isQueued=0):
     param = WAITCmd()
     param.waitTime = int(waitTime)
     queuedCmdIndex = c_uint64(0)
-    while(True):
-        result = api.SetWAITCmd(c_int(masterId), c_int(slaveId), byref(param), isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetWAITCmd, c_int(api.masterId), c_int(api.slaveId), byref(param), isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
 
 
@@ -2128,12 +1715,7 @@ def SetTRIGCmd(api, address, mode,  condition,  threshold,  isQueued=0):
     param.condition = condition
     param.threshold = threshold
     queuedCmdIndex = c_uint64(0)
-    while(True):
-        result = api.SetTRIGCmd(c_int(masterId), c_int(slaveId), byref(param), isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetTRIGCmd, c_int(api.masterId), c_int(api.slaveId), byref(param), isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
 
 
@@ -2142,36 +1724,26 @@ def SetIOMultiplexing(api, address, multiplex, isQueued=0):
     param.address = address
     param.multiplex = multiplex
     queuedCmdIndex = c_uint64(0)
-    if slaveDevType == DevType.Magician:
-        tempSlaveId = slaveId
-    elif masterDevType == DevType.Conntroller and (slaveDevType == DevType.MagicianLite or slaveDevType == DevType.Idle):
+    if api.slaveDevType == DevType.Magician:
+        tempSlaveId = api.slaveId
+    elif api.masterDevType == DevType.Conntroller and (api.slaveDevType == DevType.MagicianLite or api.slaveDevType == DevType.Idle):
         tempSlaveId = -1
     else:
-        tempSlaveId = slaveId
-    while(True):
-        result = api.SetIOMultiplexing(c_int(masterId), c_int(tempSlaveId), byref(param), isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+        tempSlaveId = api.slaveId
+    result = callWithRetry(api.SetIOMultiplexing, c_int(api.masterId), c_int(tempSlaveId), byref(param), isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
 
 
 def GetIOMultiplexing(api,  addr):
     param = IOMultiplexing()
     param.address = addr
-    if slaveDevType == DevType.Magician:
-        tempSlaveId = slaveId
-    elif masterDevType == DevType.Conntroller and (slaveDevType == DevType.MagicianLite or slaveDevType == DevType.Idle):
+    if api.slaveDevType == DevType.Magician:
+        tempSlaveId = api.slaveId
+    elif api.masterDevType == DevType.Conntroller and (api.slaveDevType == DevType.MagicianLite or api.slaveDevType == DevType.Idle):
         tempSlaveId = -1
     else:
-        tempSlaveId = slaveId
-    while(True):
-        result = api.GetIOMultiplexing(c_int(masterId), c_int(tempSlaveId), byref(param))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+        tempSlaveId = api.slaveId
+    result = callWithRetry(api.GetIOMultiplexing, c_int(api.masterId), c_int(tempSlaveId), byref(param))
     return [param.multiplex]
 
 
@@ -2180,36 +1752,26 @@ def SetIODO(api, address, level, isQueued=0):
     param.address = address
     param.level = level
     queuedCmdIndex = c_uint64(0)
-    if slaveDevType == DevType.Magician:
-        tempSlaveId = slaveId
-    elif masterDevType == DevType.Conntroller and (slaveDevType == DevType.MagicianLite or slaveDevType == DevType.Idle):
+    if api.slaveDevType == DevType.Magician:
+        tempSlaveId = api.slaveId
+    elif api.masterDevType == DevType.Conntroller and (api.slaveDevType == DevType.MagicianLite or api.slaveDevType == DevType.Idle):
         tempSlaveId = -1
     else:
-        tempSlaveId = slaveId
-    while(True):
-        result = api.SetIODO(c_int(masterId), c_int(tempSlaveId), byref(param), isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+        tempSlaveId = api.slaveId
+    result = callWithRetry(api.SetIODO, c_int(api.masterId), c_int(tempSlaveId), byref(param), isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
 
 
 def GetIODO(api,  addr):
     param = IODO()
     param.address = addr
-    if slaveDevType == DevType.Magician:
-        tempSlaveId = slaveId
-    elif masterDevType == DevType.Conntroller and (slaveDevType == DevType.MagicianLite or slaveDevType == DevType.Idle):
+    if api.slaveDevType == DevType.Magician:
+        tempSlaveId = api.slaveId
+    elif api.masterDevType == DevType.Conntroller and (api.slaveDevType == DevType.MagicianLite or api.slaveDevType == DevType.Idle):
         tempSlaveId = -1
     else:
-        tempSlaveId = slaveId
-    while(True):
-        result = api.GetIODO(c_int(masterId), c_int(tempSlaveId), byref(param))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+        tempSlaveId = api.slaveId
+    result = callWithRetry(api.GetIODO, c_int(api.masterId), c_int(tempSlaveId), byref(param))
     return [param.level]
 
 
@@ -2219,54 +1781,39 @@ def SetIOPWM(api, address, frequency, dutyCycle,  isQueued=0):
     param.frequency = frequency
     param.dutyCycle = dutyCycle
     queuedCmdIndex = c_uint64(0)
-    if slaveDevType == DevType.Magician:
-        tempSlaveId = slaveId
-    elif masterDevType == DevType.Conntroller and (slaveDevType == DevType.MagicianLite or slaveDevType == DevType.Idle):
+    if api.slaveDevType == DevType.Magician:
+        tempSlaveId = api.slaveId
+    elif api.masterDevType == DevType.Conntroller and (api.slaveDevType == DevType.MagicianLite or api.slaveDevType == DevType.Idle):
         tempSlaveId = -1
     else:
-        tempSlaveId = slaveId
-    while(True):
-        result = api.SetIOPWM(c_int(masterId), c_int(tempSlaveId), byref(param), isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+        tempSlaveId = api.slaveId
+    result = callWithRetry(api.SetIOPWM, c_int(api.masterId), c_int(tempSlaveId), byref(param), isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
 
 
 def GetIOPWM(api,  addr):
     param = IOPWM()
     param.address = addr
-    if slaveDevType == DevType.Magician:
-        tempSlaveId = slaveId
-    elif masterDevType == DevType.Conntroller and (slaveDevType == DevType.MagicianLite or slaveDevType == DevType.Idle):
+    if api.slaveDevType == DevType.Magician:
+        tempSlaveId = api.slaveId
+    elif api.masterDevType == DevType.Conntroller and (api.slaveDevType == DevType.MagicianLite or api.slaveDevType == DevType.Idle):
         tempSlaveId = -1
     else:
-        tempSlaveId = slaveId
-    while(True):
-        result = api.GetIOPWM(c_int(masterId), c_int(tempSlaveId), byref(param))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+        tempSlaveId = api.slaveId
+    result = callWithRetry(api.GetIOPWM, c_int(api.masterId), c_int(tempSlaveId), byref(param))
     return [param.frequency,  param.dutyCycle]
 
 
 def GetIODI(api, addr):
     param = IODI()
     param.address = addr
-    if slaveDevType == DevType.Magician:
-        tempSlaveId = slaveId
-    elif masterDevType == DevType.Conntroller and (slaveDevType == DevType.MagicianLite or slaveDevType == DevType.Idle):
+    if api.slaveDevType == DevType.Magician:
+        tempSlaveId = api.slaveId
+    elif api.masterDevType == DevType.Conntroller and (api.slaveDevType == DevType.MagicianLite or api.slaveDevType == DevType.Idle):
         tempSlaveId = -1
     else:
-        tempSlaveId = slaveId
-    while(True):
-        result = api.GetIODI(c_int(masterId), c_int(tempSlaveId), byref(param))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+        tempSlaveId = api.slaveId
+    result = callWithRetry(api.GetIODI, c_int(api.masterId), c_int(tempSlaveId), byref(param))
     return [param.level]
     
 
@@ -2276,18 +1823,13 @@ def SetEMotor(api, index, isEnabled, speed,  isQueued=0):
     emotor.isEnabled = isEnabled
     emotor.speed = speed
     queuedCmdIndex = c_uint64(0)
-    if slaveDevType == DevType.Magician:
-        tempSlaveId = slaveId
-    elif masterDevType == DevType.Conntroller and (slaveDevType == DevType.MagicianLite or slaveDevType == DevType.Idle):
+    if api.slaveDevType == DevType.Magician:
+        tempSlaveId = api.slaveId
+    elif api.masterDevType == DevType.Conntroller and (api.slaveDevType == DevType.MagicianLite or api.slaveDevType == DevType.Idle):
         tempSlaveId = -1
     else:
-        tempSlaveId = slaveId
-    while(True):
-        result = api.SetEMotor(c_int(masterId), c_int(tempSlaveId), byref(emotor), isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+        tempSlaveId = api.slaveId
+    result = callWithRetry(api.SetEMotor, c_int(api.masterId), c_int(tempSlaveId), byref(emotor), isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
     
 
@@ -2298,166 +1840,96 @@ def SetEMotorS(api, index, isEnabled, speed, distance,  isQueued=0):
     emotorS.speed = speed
     emotorS.distance = distance
     queuedCmdIndex = c_uint64(0)
-    if slaveDevType == DevType.Magician:
-        tempSlaveId = slaveId
-    elif masterDevType == DevType.Conntroller and (slaveDevType == DevType.MagicianLite or slaveDevType == DevType.Idle):
+    if api.slaveDevType == DevType.Magician:
+        tempSlaveId = api.slaveId
+    elif api.masterDevType == DevType.Conntroller and (api.slaveDevType == DevType.MagicianLite or api.slaveDevType == DevType.Idle):
         tempSlaveId = -1
     else:
-        tempSlaveId = slaveId
-    while(True):
-        result = api.SetEMotorS(c_int(masterId), c_int(tempSlaveId), byref(emotorS), isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+        tempSlaveId = api.slaveId
+    result = callWithRetry(api.SetEMotorS, c_int(api.masterId), c_int(tempSlaveId), byref(emotorS), isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
 
 
 def GetIOADC(api, addr):
     param = IOADC()
     param.address = addr
-    if slaveDevType == DevType.Magician:
-        tempSlaveId = slaveId
-    elif masterDevType == DevType.Conntroller and (slaveDevType == DevType.MagicianLite or slaveDevType == DevType.Idle):
+    if api.slaveDevType == DevType.Magician:
+        tempSlaveId = api.slaveId
+    elif api.masterDevType == DevType.Conntroller and (api.slaveDevType == DevType.MagicianLite or api.slaveDevType == DevType.Idle):
         tempSlaveId = -1
     else:
-        tempSlaveId = slaveId
-    while(True):
-        result = api.GetIOADC(c_int(masterId), c_int(tempSlaveId), byref(param))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+        tempSlaveId = api.slaveId
+    result = callWithRetry(api.GetIOADC, c_int(api.masterId), c_int(tempSlaveId), byref(param))
     return [param.value]
 
 
 def SetAngleSensorStaticError(api,  rearArmAngleError, frontArmAngleError):
     c_rearArmAngleError = c_float(rearArmAngleError)
     c_frontArmAngleError = c_float(frontArmAngleError)
-    while(True):
-        result = api.SetAngleSensorStaticError(c_int(masterId), c_int(slaveId), c_rearArmAngleError, c_frontArmAngleError)
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetAngleSensorStaticError, c_int(api.masterId), c_int(api.slaveId), c_rearArmAngleError, c_frontArmAngleError)
         
 
 def GetAngleSensorStaticError(api):
     rearArmAngleError = c_float(0)
     frontArmAngleError = c_float(0)
-    while(True):
-        result = api.GetAngleSensorStaticError(c_int(masterId), c_int(slaveId), byref(rearArmAngleError),  byref(frontArmAngleError))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetAngleSensorStaticError, c_int(api.masterId), c_int(api.slaveId), byref(rearArmAngleError),  byref(frontArmAngleError))
     return [rearArmAngleError.value, frontArmAngleError.value]
     
 
 def SetAngleSensorCoef(api,  rearArmAngleCoef, frontArmAngleCoef):
     c_rearArmAngleCoef = c_float(rearArmAngleCoef)
     c_frontArmAngleCoef = c_float(frontArmAngleCoef)
-    while(True):
-        result = api.SetAngleSensorCoef(c_int(masterId), c_int(slaveId), c_rearArmAngleCoef, c_frontArmAngleCoef)
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetAngleSensorCoef, c_int(api.masterId), c_int(api.slaveId), c_rearArmAngleCoef, c_frontArmAngleCoef)
         
 
 def GetAngleSensorCoef(api):
     rearArmAngleCoef = c_float(0)
     frontArmAngleCoef = c_float(0)
-    while(True):
-        result = api.GetAngleSensorCoef(c_int(masterId), c_int(slaveId), byref(rearArmAngleCoef),  byref(frontArmAngleCoef))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetAngleSensorCoef, c_int(api.masterId), c_int(api.slaveId), byref(rearArmAngleCoef),  byref(frontArmAngleCoef))
     return [rearArmAngleCoef.value, frontArmAngleCoef.value]
 
 
 def SetBaseDecoderStaticError(api,  baseDecoderError):
     c_baseDecoderError = c_float(baseDecoderError)
-    while(True):
-        result = api.SetBaseDecoderStaticError(c_int(masterId), c_int(slaveId), c_baseDecoderError)
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetBaseDecoderStaticError, c_int(api.masterId), c_int(api.slaveId), c_baseDecoderError)
     
 
 def GetBaseDecoderStaticError(api):
     baseDecoderError = c_float(0)
-    while(True):
-        result = api.GetBaseDecoderStaticError(c_int(masterId), c_int(slaveId), byref(baseDecoderError))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetBaseDecoderStaticError, c_int(api.masterId), c_int(api.slaveId), byref(baseDecoderError))
     return [baseDecoderError.value]
 
 
 
 def GetWIFIConnectStatus(api):
     isConnected = c_bool(0)
-    while(True):
-        if not QuitDobotApiFlag:
-            break
-        result = api.GetWIFIConnectStatus(c_int(masterId), c_int(slaveId), byref(isConnected))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    if QuitDobotApiFlag:
+        result = callWithRetry(api.GetWIFIConnectStatus, c_int(api.masterId), c_int(api.slaveId), byref(isConnected))
     return [isConnected.value]
 
 def SetWIFIConfigMode(api,  enable):
-    while(True):
-        if not QuitDobotApiFlag:
-            break
-        result = api.SetWIFIConfigMode(c_int(masterId), c_int(slaveId), enable)
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    if QuitDobotApiFlag:
+        result = callWithRetry(api.SetWIFIConfigMode, c_int(api.masterId), c_int(api.slaveId), enable)
     
 
 def GetWIFIConfigMode(api):
     isEnabled = c_bool(0)
-    while(True):
-        if not QuitDobotApiFlag:
-            break
-        result = api.GetWIFIConfigMode(c_int(masterId), c_int(slaveId), byref(isEnabled))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    if QuitDobotApiFlag:
+        result = callWithRetry(api.GetWIFIConfigMode, c_int(api.masterId), c_int(api.slaveId), byref(isEnabled))
     return [isEnabled.value]
     
 
 def SetWIFISSID(api,  ssid):
     szPara = create_string_buffer(len(ssid))
     szPara.raw = ssid.encode("utf-8")
-    while(True):
-        if not QuitDobotApiFlag:
-            break
-        result = api.SetWIFISSID(c_int(masterId), c_int(slaveId), szPara)
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    if QuitDobotApiFlag:
+        result = callWithRetry(api.SetWIFISSID, c_int(api.masterId), c_int(api.slaveId), szPara)
     
 
 def GetWIFISSID(api):
     szPara = create_string_buffer(100)
-    while(True):
-        if not QuitDobotApiFlag:
-            break
-        result = api.GetWIFISSID(c_int(masterId), c_int(slaveId), szPara,  25)
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    if QuitDobotApiFlag:
+        result = callWithRetry(api.GetWIFISSID, c_int(api.masterId), c_int(api.slaveId), szPara,  25)
     ssid = szPara.value.decode("utf-8") 
     return [ssid]
     
@@ -2465,26 +1937,14 @@ def GetWIFISSID(api):
 def SetWIFIPassword(api,  password):
     szPara = create_string_buffer(25)
     szPara.raw = password.encode("utf-8")
-    while(True):
-        if not QuitDobotApiFlag:
-            break
-        result = api.SetWIFIPassword(c_int(masterId), c_int(slaveId), szPara)
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    if QuitDobotApiFlag:
+        result = callWithRetry(api.SetWIFIPassword, c_int(api.masterId), c_int(api.slaveId), szPara)
         
 
 def GetWIFIPassword(api):
     szPara = create_string_buffer(25)  
-    while(True):
-        if not QuitDobotApiFlag:
-            break
-        result = api.GetWIFIPassword(c_int(masterId), c_int(slaveId), szPara,  25)
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    if QuitDobotApiFlag:
+        result = callWithRetry(api.GetWIFIPassword, c_int(api.masterId), c_int(api.slaveId), szPara,  25)
     password = szPara.value.decode("utf-8") 
     return [password]
     
@@ -2497,26 +1957,14 @@ def SetWIFIIPAddress(api,  dhcp,  addr1,  addr2,  addr3,  addr4):
     wifiIPAddress.addr3 = addr3
     wifiIPAddress.addr4 = addr4
 
-    while(True):
-        if not QuitDobotApiFlag:
-            break
-        result = api.SetWIFIIPAddress(c_int(masterId), c_int(slaveId), byref(wifiIPAddress))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
-        
-
-def GetWIFIIPAddress(api):
-    wifiIPAddress = WIFIIPAddress()
-    while(True):
-        if not QuitDobotApiFlag:
-            break
-        result = api.GetWIFIIPAddress(c_int(masterId), c_int(slaveId), byref(wifiIPAddress))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    if QuitDobotApiFlag:
+        result = callWithRetry(api.SetWIFIIPAddress, c_int(api.masterId), c_int(api.slaveId), byref(wifiIPAddress))
+        
+
+def GetWIFIIPAddress(api):
+    wifiIPAddress = WIFIIPAddress()
+    if QuitDobotApiFlag:
+        result = callWithRetry(api.GetWIFIIPAddress, c_int(api.masterId), c_int(api.slaveId), byref(wifiIPAddress))
     return [c_uint8(wifiIPAddress.dhcp).value,  c_uint8(wifiIPAddress.addr1).value,  c_uint8(wifiIPAddress.addr2).value,   c_uint8(wifiIPAddress.addr3).value,  c_uint8(wifiIPAddress.addr4).value]
     
 
@@ -2526,26 +1974,14 @@ def SetWIFINetmask(api, addr1,  addr2,  addr3,  addr4):
     wifiNetmask.addr2 = addr2
     wifiNetmask.addr3 = addr3
     wifiNetmask.addr4 = addr4
-    while(True):
-        if not QuitDobotApiFlag:
-            break
-        result = api.SetWIFINetmask(c_int(masterId), c_int(slaveId), byref(wifiNetmask))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    if QuitDobotApiFlag:
+        result = callWithRetry(api.SetWIFINetmask, c_int(api.masterId), c_int(api.slaveId), byref(wifiNetmask))
         
 
 def GetWIFINetmask(api):
     wifiNetmask = WIFINetmask()
-    while(True):
-        if not QuitDobotApiFlag:
-            break
-        result = api.GetWIFINetmask(c_int(masterId), c_int(slaveId), byref(wifiNetmask))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    if QuitDobotApiFlag:
+        result = callWithRetry(api.GetWIFINetmask, c_int(api.masterId), c_int(api.slaveId), byref(wifiNetmask))
     return [c_uint8(wifiNetmask.addr1).value,  c_uint8(wifiNetmask.addr2).value,  c_uint8(wifiNetmask.addr3).value,  c_uint8(wifiNetmask.addr4).value]
     
 
@@ -2555,26 +1991,14 @@ def SetWIFIGateway(api, addr1,  addr2,  addr3,  addr4):
     wifiGateway.addr2 = addr2
     wifiGateway.addr3 = addr3
     wifiGateway.addr4 = addr4
-    while(True):
-        if not QuitDobotApiFlag:
-            break
-        result = api.SetWIFIGateway(c_int(masterId), c_int(slaveId), byref(wifiGateway))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    if QuitDobotApiFlag:
+        result = callWithRetry(api.SetWIFIGateway, c_int(api.masterId), c_int(api.slaveId), byref(wifiGateway))
 
 
 def GetWIFIGateway(api):
     wifiGateway = WIFIGateway()
-    while(True):
-        if not QuitDobotApiFlag:
-            break
-        result = api.GetWIFIGateway(c_int(masterId), c_int(slaveId), byref(wifiGateway))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    if QuitDobotApiFlag:
+        result = callWithRetry(api.GetWIFIGateway, c_int(api.masterId), c_int(api.slaveId), byref(wifiGateway))
     return [c_uint8(wifiGateway.addr1).value,  c_uint8(wifiGateway.addr2).value,  c_uint8(wifiGateway.addr3).value,  c_uint8(wifiGateway.addr4).value]
     
 
@@ -2584,26 +2008,14 @@ def SetWIFIDNS(api, addr1,  addr2,  addr3,  addr4):
     wifiDNS.addr2 = addr2
     wifiDNS.addr3 = addr3
     wifiDNS.addr4 = addr4
-    while(True):
-        if not QuitDobotApiFlag:
-            break
-        result = api.SetWIFIDNS(c_int(masterId), c_int(slaveId), byref(wifiDNS))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    if QuitDobotApiFlag:
+        result = callWithRetry(api.SetWIFIDNS, c_int(api.masterId), c_int(api.slaveId), byref(wifiDNS))
 
 
 def GetWIFIDNS(api):
     wifiDNS = WIFIDNS()
-    while(True):
-        if not QuitDobotApiFlag:
-            break
-        result = api.GetWIFIDNS(c_int(masterId), c_int(slaveId), byref(wifiDNS))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    if QuitDobotApiFlag:
+        result = callWithRetry(api.GetWIFIDNS, c_int(api.masterId), c_int(api.slaveId), byref(wifiDNS))
     return [c_uint8(wifiDNS.addr1).value,  c_uint8(wifiDNS.addr2).value,  c_uint8(wifiDNS.addr3).value,  c_uint8(wifiDNS.addr4).value]
 
 
@@ -2612,36 +2024,26 @@ def SetColorSensor(api, isEnable, colorPort, version=0):
     port = c_uint8(colorPort)
     version = c_uint8(version)
     queuedCmdIndex = c_uint64(0)
-    if slaveDevType == DevType.Magician:
-        tempSlaveId = slaveId
-    elif masterDevType == DevType.Conntroller and (slaveDevType == DevType.MagicianLite or slaveDevType == DevType.Idle):
+    if api.slaveDevType == DevType.Magician:
+        tempSlaveId = api.slaveId
+    elif api.masterDevType == DevType.Conntroller and (api.slaveDevType == DevType.MagicianLite or api.slaveDevType == DevType.Idle):
         tempSlaveId = -1
     else:
-        tempSlaveId = slaveId
-    while(True):
-        result = api.SetColorSensor(c_int(masterId), c_int(tempSlaveId), enable, port, version, 1, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+        tempSlaveId = api.slaveId
+    result = callWithRetry(api.SetColorSensor, c_int(api.masterId), c_int(tempSlaveId), enable, port, version, 1, byref(queuedCmdIndex))
     
 
 def GetColorSensor(api):
     r = c_ubyte(0)
     g = c_ubyte(0)
     b = c_ubyte(0)
-    if slaveDevType == DevType.Magician:
-        tempSlaveId = slaveId
-    elif masterDevType == DevType.Conntroller and (slaveDevType == DevType.MagicianLite or slaveDevType == DevType.Idle):
+    if api.slaveDevType == DevType.Magician:
+        tempSlaveId = api.slaveId
+    elif api.masterDevType == DevType.Conntroller and (api.slaveDevType == DevType.MagicianLite or api.slaveDevType == DevType.Idle):
         tempSlaveId = -1
     else:
-        tempSlaveId = slaveId
-    while(True):
-        result = api.GetColorSensor(c_int(masterId), c_int(tempSlaveId), byref(r),  byref(g),  byref(b))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+        tempSlaveId = api.slaveId
+    result = callWithRetry(api.GetColorSensor, c_int(api.masterId), c_int(tempSlaveId), byref(r),  byref(g),  byref(b))
     return [r.value, g.value, b.value]
     
 
@@ -2650,35 +2052,25 @@ def SetInfraredSensor(api,  isEnable, infraredPort, version=0):
     port = c_uint8(infraredPort)
     queuedCmdIndex = c_uint64(0)
     version = c_uint8(version)
-    if slaveDevType == DevType.Magician:
-        tempSlaveId = slaveId
-    elif masterDevType == DevType.Conntroller and (slaveDevType == DevType.MagicianLite or slaveDevType == DevType.Idle):
+    if api.slaveDevType == DevType.Magician:
+        tempSlaveId = api.slaveId
+    elif api.masterDevType == DevType.Conntroller and (api.slaveDevType == DevType.MagicianLite or api.slaveDevType == DevType.Idle):
         tempSlaveId = -1
     else:
-        tempSlaveId = slaveId
-    while(True):
-        result = api.SetInfraredSensor(c_int(masterId), c_int(tempSlaveId), enable, port, version, 1, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+        tempSlaveId = api.slaveId
+    result = callWithRetry(api.SetInfraredSensor, c_int(api.masterId), c_int(tempSlaveId), enable, port, version, 1, byref(queuedCmdIndex))
     
 
 def GetInfraredSensor(api, infraredPort):
     port = c_uint8(infraredPort)
     value = c_ubyte(0)
-    if slaveDevType == DevType.Magician:
-        tempSlaveId = slaveId
-    elif masterDevType == DevType.Conntroller and (slaveDevType == DevType.MagicianLite or slaveDevType == DevType.Idle):
+    if api.slaveDevType == DevType.Magician:
+        tempSlaveId = api.slaveId
+    elif api.masterDevType == DevType.Conntroller and (api.slaveDevType == DevType.MagicianLite or api.slaveDevType == DevType.Idle):
         tempSlaveId = -1
     else:
-        tempSlaveId = slaveId
-    while(True):
-        result = api.GetInfraredSensor(c_int(masterId), c_int(tempSlaveId), port,  byref(value))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+        tempSlaveId = api.slaveId
+    result = callWithRetry(api.GetInfraredSensor, c_int(api.masterId), c_int(tempSlaveId), port,  byref(value))
     return [value.value]
 
 
@@ -2688,42 +2080,22 @@ def GetInfraredSensor(api, infraredPort):
 def SetLostStepParams(api, threshold, isQueued=0):
     queuedCmdIndex = c_uint64(0)
     t = c_float(threshold)
-    while(True):
-        result = api.SetLostStepParams(c_int(masterId), c_int(slaveId), t, isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetLostStepParams, c_int(api.masterId), c_int(api.slaveId), t, isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
 
 
 def SetLostStepCmd(api, isQueued=0):
     queuedCmdIndex = c_uint64(0)
-    while(True):
-        result = api.SetLostStepCmd(c_int(masterId), c_int(slaveId), isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetLostStepCmd, c_int(api.masterId), c_int(api.slaveId), isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
     
 
 def GetUART4PeripheralsType(api):
     type = c_uint8(0)
-    if (masterDevType == DevType.Conntroller and slaveDevType == DevType.MagicianLite) or (masterDevType == DevType.Conntroller and slaveDevType == DevType.Idle):
-        while(True):
-            result = api.GetUART4PeripheralsType(c_int(masterId), c_int(-1), byref(type))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break 
-    elif masterDevType == DevType.Magician:
-        while(True):
-            result = api.GetUART4PeripheralsType(c_int(masterId), c_int(slaveId), byref(type))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
+    if (api.masterDevType == DevType.Conntroller and api.slaveDevType == DevType.MagicianLite) or (api.masterDevType == DevType.Conntroller and api.slaveDevType == DevType.Idle):
+        result = callWithRetry(api.GetUART4PeripheralsType, c_int(api.masterId), c_int(-1), byref(type))
+    elif api.masterDevType == DevType.Magician:
+        result = callWithRetry(api.GetUART4PeripheralsType, c_int(api.masterId), c_int(api.slaveId), byref(type))
     return [type.value]
     
 
@@ -2734,22 +2106,12 @@ def GetDeviceVersionEx(api):       #2019.6.25 song 控制盒+Magician Lite时，
     # hwVersion    = c_byte(0)
     deviceVersion1 = DeviceVersion()
     deviceVersion2 = DeviceVersion()
-    if masterDevType == DevType.Conntroller and slaveDevType == DevType.MagicianLite:
+    if api.masterDevType == DevType.Conntroller and api.slaveDevType == DevType.MagicianLite:
         # 2019.09.03 by song 控制盒+magicianLite 返回两个设备的版本信息
-        while(True):
-            result = api.GetDeviceVersion(c_int(masterId), c_int(-1), byref(deviceVersion1))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
+        result = callWithRetry(api.GetDeviceVersion, c_int(api.masterId), c_int(-1), byref(deviceVersion1))
         list_MagicBoxVersion = [deviceVersion1.fw_majorVersion, deviceVersion1.fw_minorVersion, deviceVersion1.fw_revision, deviceVersion1.fw_alphaVersion,
                                 deviceVersion1.hw_majorVersion, deviceVersion1.hw_minorVersion, deviceVersion1.hw_revision, deviceVersion1.hw_alphaVersion]
-        while(True):
-            result = api.GetDeviceVersion(c_int(masterId), c_int(slaveId), byref(deviceVersion2))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(5)
-                continue
-            break
+        result = callWithRetry(api.GetDeviceVersion, c_int(api.masterId), c_int(api.slaveId), byref(deviceVersion2))
         list_MagicianLiteVersion = [deviceVersion2.fw_majorVersion, deviceVersion2.fw_minorVersion, deviceVersion2.fw_revision, deviceVersion2.fw_alphaVersion,
                                     deviceVersion2.hw_majorVersion, deviceVersion2.hw_minorVersion, deviceVersion2.hw_revision, deviceVersion2.hw_alphaVersion]
         return [list_MagicBoxVersion, list_MagicianLiteVersion]
@@ -2773,34 +2135,34 @@ def SetHOMECmdEx(api,  temp,  isQueued=0):
     ret = SetHOMECmd(api, temp,  isQueued)
     queuedCmdIndex = c_uint64(0)
     queuedCmdIndex1 = c_uint64(0)
-    if masterDevType == DevType.Conntroller and slaveDevType == DevType.MagicianLite:
+    if api.masterDevType == DevType.Conntroller and api.slaveDevType == DevType.MagicianLite:
         if isUsingLinearRail:        
             while(True):
-                result = api.GetQueuedCmdCurrentIndex(c_int(masterId), c_int(-1), byref(queuedCmdIndex1))
-                if result == DobotCommunicate.DobotCommunicate_NoError and ret[1] <= queuedCmdIndex1.value:
+                result = callWithRetry(api.GetQueuedCmdCurrentIndex, c_int(api.masterId), c_int(-1), byref(queuedCmdIndex1))
+                if ret[1] <= queuedCmdIndex1.value:
                     break
                 dSleep(100)
             while(True):
-                result = api.GetQueuedCmdCurrentIndex(c_int(masterId), c_int(slaveId), byref(queuedCmdIndex))
-                if result == DobotCommunicate.DobotCommunicate_NoError and ret[0] <= queuedCmdIndex.value:
+                result = callWithRetry(api.GetQueuedCmdCurrentIndex, c_int(api.masterId), c_int(api.slaveId), byref(queuedCmdIndex))
+                if ret[0] <= queuedCmdIndex.value:
                     break
                 dSleep(100)
         else:
             while(True):
-                result = api.GetQueuedCmdCurrentIndex(c_int(masterId), c_int(slaveId), byref(queuedCmdIndex))
-                if result == DobotCommunicate.DobotCommunicate_NoError and ret[0] <= queuedCmdIndex.value:
+                result = callWithRetry(api.GetQueuedCmdCurrentIndex, c_int(api.masterId), c_int(api.slaveId), byref(queuedCmdIndex))
+                if ret[0] <= queuedCmdIndex.value:
                     break
                 dSleep(100)
-    elif masterDevType == DevType.Conntroller and slaveDevType == DevType.Idle: 
+    elif api.masterDevType == DevType.Conntroller and api.slaveDevType == DevType.Idle: 
         while(True):
-            result = api.GetQueuedCmdCurrentIndex(c_int(masterId), c_int(-1), byref(queuedCmdIndex1))
-            if result == DobotCommunicate.DobotCommunicate_NoError and ret[1] <= queuedCmdIndex1.value:
+            result = callWithRetry(api.GetQueuedCmdCurrentIndex, c_int(api.masterId), c_int(-1), byref(queuedCmdIndex1))
+            if ret[1] <= queuedCmdIndex1.value:
                 break
             dSleep(100)
     else:
         while(True):
-            result = api.GetQueuedCmdCurrentIndex(c_int(masterId), c_int(slaveId), byref(queuedCmdIndex))
-            if result == DobotCommunicate.DobotCommunicate_NoError and ret[0] <= queuedCmdIndex.value:
+            result = callWithRetry(api.GetQueuedCmdCurrentIndex, c_int(api.masterId), c_int(api.slaveId), byref(queuedCmdIndex))
+            if ret[0] <= queuedCmdIndex.value:
                 break
             dSleep(100)
         
@@ -2869,7 +2231,7 @@ def SetPTPCmdEx(api, ptpMode, x, y, z, rHead, isQueued=0):
     
 def SetIOMultiplexingEx(api, address, multiplex, isQueued=0):
     ret = SetIOMultiplexing(api, address, multiplex, isQueued)
-    if masterDevType == DevType.Magician:
+    if api.masterDevType == DevType.Magician:
         while(True):
             if ret[0] <= GetQueuedCmdCurrentIndex(api)[0]:
                 break
@@ -2882,7 +2244,7 @@ def SetIOMultiplexingEx(api, address, multiplex, isQueued=0):
         
 def SetEndEffectorSuctionCupEx(api, enableCtrl,  on, isQueued=0):
     ret = SetEndEffectorSuctionCup(api, enableCtrl,  on, isQueued)
-    if masterDevType == DevType.Magician:
+    if api.masterDevType == DevType.Magician:
         while(True):
             if ret[0] <= GetQueuedCmdCurrentIndex(api)[0]:
                 break
@@ -2895,7 +2257,7 @@ def SetEndEffectorSuctionCupEx(api, enableCtrl,  on, isQueued=0):
 
 def SetEndEffectorGripperEx(api, enableCtrl,  on, isQueued=0):
     ret = SetEndEffectorGripper(api, enableCtrl,  on, isQueued)
-    if masterDevType == DevType.Magician:
+    if api.masterDevType == DevType.Magician:
         while(True):
             if ret[0] <= GetQueuedCmdCurrentIndex(api)[0]:
                 break
@@ -2914,7 +2276,7 @@ def SetEndEffectorLaserEx(api, enableCtrl, power, isQueued=0):
 
 def SetIODOEx(api, address, level, isQueued=0):
     ret = SetIODO(api, address, level, isQueued)
-    if masterDevType == DevType.Magician:
+    if api.masterDevType == DevType.Magician:
         while(True):
             if ret[0] <= GetQueuedCmdCurrentIndex(api)[0]:
                 break
@@ -2927,7 +2289,7 @@ def SetIODOEx(api, address, level, isQueued=0):
         
 def SetEMotorEx(api, index, isEnabled, speed,  isQueued=0):
     ret = SetEMotor(api, index, isEnabled, speed,  isQueued)
-    if masterDevType == DevType.Magician:
+    if api.masterDevType == DevType.Magician:
         while(True):
             if ret[0] <= GetQueuedCmdCurrentIndex(api)[0]:
                 break
@@ -2940,7 +2302,7 @@ def SetEMotorEx(api, index, isEnabled, speed,  isQueued=0):
     
 def SetEMotorSEx(api, index, isEnabled, speed, distance,  isQueued=0):
     ret = SetEMotorS(api, index, isEnabled, speed, distance,   isQueued)
-    if masterDevType == DevType.Magician:
+    if api.masterDevType == DevType.Magician:
         while(True):
             if ret[0] <= GetQueuedCmdCurrentIndex(api)[0]:
                 break
@@ -2953,7 +2315,7 @@ def SetEMotorSEx(api, index, isEnabled, speed, distance,  isQueued=0):
     
 def SetIOPWMEx(api, address, frequency, dutyCycle,  isQueued=0):
     ret = SetIOPWM(api, address, frequency, dutyCycle,  isQueued)
-    if masterDevType == DevType.Magician:
+    if api.masterDevType == DevType.Magician:
         while(True):
             if ret[0] <= GetQueuedCmdCurrentIndex(api)[0]:
                 break
@@ -2982,60 +2344,36 @@ def SetPTPWithLCmdEx(api, ptpMode, x, y, z, rHead,  l, isQueued=0):
     queuedCmdIndex1 = c_uint64(0)
     queuedCmdIndex2 = c_uint64(0)
     # 滑轨的特殊处理
-    if slaveDevType == DevType.Magician:
-        while(True):
-            result = api.SetPTPWithLCmd(c_int(masterId), c_int(slaveId), byref(cmd), isQueued, byref(queuedCmdIndex))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(2)
-                continue
-            break
-        while(True):
-            result = api.GetQueuedCmdCurrentIndex(c_int(masterId), c_int(slaveId), byref(queuedCmdIndex1))
-            if result != DobotCommunicate.DobotCommunicate_NoError or queuedCmdIndex1.value < queuedCmdIndex.value:
-                dSleep(2)
-                continue
-            break
-    elif masterDevType == DevType.Conntroller and slaveDevType == DevType.MagicianLite:
+    if api.slaveDevType == DevType.Magician:
+        result = callWithRetry(api.SetPTPWithLCmd, c_int(api.masterId), c_int(api.slaveId), byref(cmd), isQueued, byref(queuedCmdIndex))
         while(True):
-            result = api.SetPTPWithLCmd(c_int(masterId), c_int(-1), byref(cmd), isQueued, byref(queuedCmdIndex))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(2)
-                continue
-            queuedCmdIndex2 = queuedCmdIndex
-            break
+            result = callWithRetry(api.GetQueuedCmdCurrentIndex, c_int(api.masterId), c_int(api.slaveId), byref(queuedCmdIndex1))
+            if queuedCmdIndex1.value >= queuedCmdIndex.value:
+                break
+            dSleep(2)
+    elif api.masterDevType == DevType.Conntroller and api.slaveDevType == DevType.MagicianLite:
+        result = callWithRetry(api.SetPTPWithLCmd, c_int(api.masterId), c_int(-1), byref(cmd), isQueued, byref(queuedCmdIndex))
+        queuedCmdIndex2 = queuedCmdIndex
         while(True):
-            result = api.GetQueuedCmdCurrentIndex(c_int(masterId), c_int(-1), byref(queuedCmdIndex1))
-            if result != DobotCommunicate.DobotCommunicate_NoError or queuedCmdIndex1.value < queuedCmdIndex2.value:
-                dSleep(2)
-                continue
-            break
+            result = callWithRetry(api.GetQueuedCmdCurrentIndex, c_int(api.masterId), c_int(-1), byref(queuedCmdIndex1))
+            if queuedCmdIndex1.value >= queuedCmdIndex2.value:
+                break
+            dSleep(2)
 
+        result = callWithRetry(api.SetPTPCmd, c_int(api.masterId), c_int(api.slaveId), byref(cmd), isQueued, byref(queuedCmdIndex))
         while(True):
-            result = api.SetPTPCmd(c_int(masterId), c_int(slaveId), byref(cmd), isQueued, byref(queuedCmdIndex))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(2)
-                continue
-            break
-        while(True):
-            result = api.GetQueuedCmdCurrentIndex(c_int(masterId), c_int(slaveId), byref(queuedCmdIndex1))
-            if result != DobotCommunicate.DobotCommunicate_NoError or queuedCmdIndex1.value < queuedCmdIndex.value:
-                dSleep(2)
-                continue
-            break
+            result = callWithRetry(api.GetQueuedCmdCurrentIndex, c_int(api.masterId), c_int(api.slaveId), byref(queuedCmdIndex1))
+            if queuedCmdIndex1.value >= queuedCmdIndex.value:
+                break
+            dSleep(2)
     else:
+        result = callWithRetry(api.SetPTPWithLCmd, c_int(api.masterId), c_int(-1), byref(cmd), isQueued, byref(queuedCmdIndex))
+        queuedCmdIndex2 = queuedCmdIndex
         while(True):
-            result = api.SetPTPWithLCmd(c_int(masterId), c_int(-1), byref(cmd), isQueued, byref(queuedCmdIndex))
-            if result != DobotCommunicate.DobotCommunicate_NoError:
-                dSleep(2)
-                continue
-            queuedCmdIndex2 = queuedCmdIndex
-            break
-        while(True):
-            result = api.GetQueuedCmdCurrentIndex(c_int(masterId), c_int(-1), byref(queuedCmdIndex1))
-            if result != DobotCommunicate.DobotCommunicate_NoError or queuedCmdIndex1.value < queuedCmdIndex.value:
-                dSleep(2)
-                continue
-            break
+            result = callWithRetry(api.GetQueuedCmdCurrentIndex, c_int(api.masterId), c_int(-1), byref(queuedCmdIndex1))
+            if queuedCmdIndex1.value >= queuedCmdIndex.value:
+                break
+            dSleep(2)
     return [queuedCmdIndex2.value]
 
 
@@ -3072,20 +2410,15 @@ def SetUpgradeFWReadyCmd(api,fwSize, md5):
         print(e)
 
     # # 只发送给主设备
-    # result = api.SetUpgradeFWReadyCmd(c_int(masterId), c_int(-1), byref(upgradeFWReadyCmd))
+    # result = api.SetUpgradeFWReadyCmd(c_int(api.masterId), c_int(-1), byref(upgradeFWReadyCmd))
     # return result
 
     # 不能去掉等待！！！！！！，jomar 2019年5月7日 09:28:30
-    if masterDevType == DevType.Conntroller and (slaveDevType == DevType.MagicianLite or slaveDevType == DevType.Idle):
+    if api.masterDevType == DevType.Conntroller and (api.slaveDevType == DevType.MagicianLite or api.slaveDevType == DevType.Idle):
         tempSlaveId = -1
     else:
-        tempSlaveId = slaveId
-    while(True):
-        result = api.SetUpgradeFWReadyCmd(c_int(masterId), c_int(tempSlaveId), byref(upgradeFWReadyCmd))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+        tempSlaveId = api.slaveId
+    result = callWithRetry(api.SetUpgradeFWReadyCmd, c_int(api.masterId), c_int(tempSlaveId), byref(upgradeFWReadyCmd))
 
 
 def GetUpgradeFWReadyCmd(api,fwSize, md5):
@@ -3101,20 +2434,15 @@ def GetUpgradeFWReadyCmd(api,fwSize, md5):
         print(e)
 
     # # 只发送给主设备
-    # result = api.SetUpgradeFWReadyCmd(c_int(masterId), c_int(-1), byref(upgradeFWReadyCmd))
+    # result = api.SetUpgradeFWReadyCmd(c_int(api.masterId), c_int(-1), byref(upgradeFWReadyCmd))
     # return result
 
     # 不能去掉等待！！！！！！，jomar 2019年5月7日 09:28:30
-    if masterDevType == DevType.Conntroller and (slaveDevType == DevType.MagicianLite or slaveDevType == DevType.Idle):
+    if api.masterDevType == DevType.Conntroller and (api.slaveDevType == DevType.MagicianLite or api.slaveDevType == DevType.Idle):
         tempSlaveId = -1
     else:
-        tempSlaveId = slaveId
-    while(True):
-        result = api.GetUpgradeFWReadyCmd(c_int(masterId), c_int(tempSlaveId), byref(upgradeFWReadyCmd), byref(isUpgrade))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+        tempSlaveId = api.slaveId
+    result = callWithRetry(api.GetUpgradeFWReadyCmd, c_int(api.masterId), c_int(tempSlaveId), byref(upgradeFWReadyCmd), byref(isUpgrade))
     return [isUpgrade.value]
 
 
@@ -3142,22 +2470,12 @@ def SetARCCmdEx(api, cirPoint, toPoint, isQueued=1):
 
 
 def SetMotorMode(api, mode):
-    while(True):
-        result = api.SetMotorMode(c_int(masterId), c_int(slaveId), c_int(mode))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break 
+    result = callWithRetry(api.SetMotorMode, c_int(api.masterId), c_int(api.slaveId), c_int(mode))
 
 
 def GetMotorMode(api):
     mode = c_int(0)
-    while(True):
-        result = api.GetMotorMode(c_int(masterId), c_int(slaveId), byref(mode))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break 
+    result = callWithRetry(api.GetMotorMode, c_int(api.masterId), c_int(api.slaveId), byref(mode))
     return [mode.value]
 
 
@@ -3169,36 +2487,21 @@ def SetIOMultiplexingExt(api, address, multiplex, isQueued=0):
     param.address = address
     param.multiplex = multiplex
     queuedCmdIndex = c_uint64(0)
-    while(True):
-        result = api.SetIOMultiplexing(c_int(masterId), c_int(-1), byref(param), isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetIOMultiplexing, c_int(api.masterId), c_int(-1), byref(param), isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
 
 
 def GetIOMultiplexingExt(api, addr):
     param = IOMultiplexing()
     param.address = addr
-    while(True):
-        result = api.GetIOMultiplexing(c_int(masterId), c_int(-1), byref(param))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetIOMultiplexing, c_int(api.masterId), c_int(-1), byref(param))
     return [param.multiplex]
 
 
 def GetIOADCExt(api, addr):
     param = IOADC()
     param.address = addr
-    while(True):
-        result = api.GetIOADC(c_int(masterId), c_int(-1), byref(param))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetIOADC, c_int(api.masterId), c_int(-1), byref(param))
     return [param.value]
 
 
@@ -3208,36 +2511,21 @@ def SetIOPWMExt(api, address, frequency, dutyCycle,  isQueued=0):
     param.frequency = frequency
     param.dutyCycle = dutyCycle
     queuedCmdIndex = c_uint64(0)
-    while(True):
-        result = api.SetIOPWM(c_int(masterId), c_int(-1), byref(param), isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetIOPWM, c_int(api.masterId), c_int(-1), byref(param), isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
 
 
 def GetIOPWMExt(api, addr):
     param = IOPWM()
     param.address = addr
-    while(True):
-        result = api.GetIOPWM(c_int(masterId), c_int(-1), byref(param))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetIOPWM, c_int(api.masterId), c_int(-1), byref(param))
     return [param.frequency,  param.dutyCycle]
 
 
 def GetIODIExt(api, addr):
     param = IODI()
     param.address = addr
-    while(True):
-        result = api.GetIODI(c_int(masterId), c_int(-1), byref(param))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetIODI, c_int(api.masterId), c_int(-1), byref(param))
     return [param.level]
 
 
@@ -3246,24 +2534,14 @@ def SetIODOExt(api, address, level, isQueued=0):
     param.address = address
     param.level = level
     queuedCmdIndex = c_uint64(0)
-    while(True):
-        result = api.SetIODO(c_int(masterId), c_int(-1), byref(param), isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetIODO, c_int(api.masterId), c_int(-1), byref(param), isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
 
 
 def GetIODOExt(api, addr):
     param = IODO()
     param.address = addr
-    while(True):
-        result = api.GetIODO(c_int(masterId), c_int(-1), byref(param))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetIODO, c_int(api.masterId), c_int(-1), byref(param))
     return [param.level]
 
 
@@ -3273,12 +2551,7 @@ def SetEMotorExt(api, index, isEnabled, speed, isQueued=0):
     emotor.isEnabled = isEnabled
     emotor.speed = speed
     queuedCmdIndex = c_uint64(0)
-    while (True):
-        result = api.SetEMotor(c_int(masterId), c_int(-1), byref(emotor), isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetEMotor, c_int(api.masterId), c_int(-1), byref(emotor), isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
 
 
@@ -3289,12 +2562,7 @@ def SetEMotorSExt(api, index, isEnabled, speed, distance, isQueued=0):
     emotorS.speed = speed
     emotorS.distance = distance
     queuedCmdIndex = c_uint64(0)
-    while (True):
-        result = api.SetEMotorS(c_int(masterId), c_int(-1), byref(emotorS), isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetEMotorS, c_int(api.masterId), c_int(-1), byref(emotorS), isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
 
 
@@ -3303,12 +2571,7 @@ def SetColorSensorExt(api, isEnable, colorPort, version=0, isQueued=0):
     port = c_uint8(colorPort)
     version = c_uint8(version)
     queuedCmdIndex = c_uint64(0)
-    while(True):
-        result = api.SetColorSensor(c_int(masterId), c_int(-1), enable, port, version, isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetColorSensor, c_int(api.masterId), c_int(-1), enable, port, version, isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
 
 
@@ -3317,12 +2580,7 @@ def SetInfraredSensorExt(api,  isEnable, infraredPort, version=0, isQueued=0):
     port = c_uint8(infraredPort)
     version = c_uint8(version)
     queuedCmdIndex = c_uint64(0)
-    while(True):
-        result = api.SetInfraredSensor(c_int(masterId), c_int(-1), enable, port, version, isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetInfraredSensor, c_int(api.masterId), c_int(-1), enable, port, version, isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
 
 
@@ -3330,12 +2588,7 @@ def GetInfraredSensorExt(api, infraredPort):
     port = c_uint8(infraredPort)
     value = c_ubyte(0)
     
-    while(True):
-        result = api.GetInfraredSensor(c_int(masterId), c_int(-1), port,  byref(value))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetInfraredSensor, c_int(api.masterId), c_int(-1), port,  byref(value))
     return [value.value]
 
 
@@ -3343,19 +2596,14 @@ def GetColorSensorExt(api, index):
     r = c_ubyte(0)
     g = c_ubyte(0)
     b = c_ubyte(0)
-    while(True):
-        result = api.GetColorSensor(c_int(masterId), c_int(-1), byref(r),  byref(g),  byref(b))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetColorSensor, c_int(api.masterId), c_int(-1), byref(r),  byref(g),  byref(b))
     return [r.value, g.value, b.value][index]
 
 # 控制盒IO同步
 
 def SetIOMultiplexingExtEx(api, address, multiplex, isQueued=0):
     ret = SetIOMultiplexingExt(api, address, multiplex, isQueued)
-    if masterDevType == DevType.Magician:
+    if api.masterDevType == DevType.Magician:
         while(True):
             if ret[0] <= GetQueuedCmdCurrentIndex(api)[0]:
                 break
@@ -3368,7 +2616,7 @@ def SetIOMultiplexingExtEx(api, address, multiplex, isQueued=0):
 
 def SetIOPWMExtEx(api, address, frequency, dutyCycle,  isQueued=0):
     ret = SetIOPWMExt(api, address, frequency, dutyCycle,  isQueued)
-    if masterDevType == DevType.Magician:
+    if api.masterDevType == DevType.Magician:
         while(True):
             if ret[0] <= GetQueuedCmdCurrentIndex(api)[0]:
                 break
@@ -3382,7 +2630,7 @@ def SetIOPWMExtEx(api, address, frequency, dutyCycle,  isQueued=0):
 
 def SetIODOExtEx(api, address, level, isQueued=0):
     ret = SetIODOExt(api, address, level, isQueued)
-    if masterDevType == DevType.Magician:
+    if api.masterDevType == DevType.Magician:
         while(True):
             if ret[0] <= GetQueuedCmdCurrentIndex(api)[0]:
                 break
@@ -3396,7 +2644,7 @@ def SetIODOExtEx(api, address, level, isQueued=0):
 
 def SetEMotorExtEx(api, index, isEnabled, speed, isQueued=0):
     ret = SetEMotorExt(api, index, isEnabled, speed, isQueued)
-    if masterDevType == DevType.Magician:
+    if api.masterDevType == DevType.Magician:
         while(True):
             if ret[0] <= GetQueuedCmdCurrentIndex(api)[0]:
                 break
@@ -3410,7 +2658,7 @@ def SetEMotorExtEx(api, index, isEnabled, speed, isQueued=0):
 
 def SetEMotorSExtEx(api, index, isEnabled, speed, distance, isQueued=0):
     ret = SetEMotorSExt(api, index, isEnabled, speed, distance, isQueued)
-    if masterDevType == DevType.Magician:
+    if api.masterDevType == DevType.Magician:
         while(True):
             if ret[0] <= GetQueuedCmdCurrentIndex(api)[0]:
                 break
@@ -3424,7 +2672,7 @@ def SetEMotorSExtEx(api, index, isEnabled, speed, distance, isQueued=0):
 
 def SetColorSensorExtEx(api, isEnable, colorPort, version=0, isQueued=0):
     ret = SetColorSensorExt(api, isEnable, colorPort, version, isQueued)
-    if masterDevType == DevType.Magician:
+    if api.masterDevType == DevType.Magician:
         while(True):
             if ret[0] <= GetQueuedCmdCurrentIndex(api)[0]:
                 break
@@ -3438,7 +2686,7 @@ def SetColorSensorExtEx(api, isEnable, colorPort, version=0, isQueued=0):
 
 def SetInfraredSensorExtEx(api,  isEnable, infraredPort, version=0, isQueued=0):
     ret = SetInfraredSensorExt(api,  isEnable, infraredPort, version, isQueued)
-    if masterDevType == DevType.Magician:
+    if api.masterDevType == DevType.Magician:
         while(True):
             if ret[0] <= GetQueuedCmdCurrentIndex(api)[0]:
                 break
@@ -3457,125 +2705,90 @@ def GetSeeedColorSensorExt(api):
     g = c_ushort(0)
     b = c_ushort(0)
     Cct = c_ushort(0)
-    if slaveDevType == DevType.Magician:
-        tempSlaveId = slaveId
-    elif masterDevType == DevType.Conntroller and (slaveDevType == DevType.MagicianLite or slaveDevType == DevType.Idle):
+    if api.slaveDevType == DevType.Magician:
+        tempSlaveId = api.slaveId
+    elif api.masterDevType == DevType.Conntroller and (api.slaveDevType == DevType.MagicianLite or api.slaveDevType == DevType.Idle):
         tempSlaveId = -1
     else:
-        tempSlaveId = slaveId
-    while(True):
-        result = api.GetSeeedColorSensor(c_int(masterId), c_int(tempSlaveId), byref(r),  byref(g),  byref(b), byref(Cct))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+        tempSlaveId = api.slaveId
+    result = callWithRetry(api.GetSeeedColorSensor, c_int(api.masterId), c_int(tempSlaveId), byref(r),  byref(g),  byref(b), byref(Cct))
     return [r.value, g.value, b.value, Cct.value]
 
 
 def SetSeeedColorSensorExt(api, SeeedPort,isQueued=0):
     queuedCmdIndex = c_uint64(0)
     port = c_uint8(SeeedPort)
-    if slaveDevType == DevType.Magician:
-        tempSlaveId = slaveId
-    elif masterDevType == DevType.Conntroller and (slaveDevType == DevType.MagicianLite or slaveDevType == DevType.Idle):
+    if api.slaveDevType == DevType.Magician:
+        tempSlaveId = api.slaveId
+    elif api.masterDevType == DevType.Conntroller and (api.slaveDevType == DevType.MagicianLite or api.slaveDevType == DevType.Idle):
         tempSlaveId = -1
     else:
-        tempSlaveId = slaveId
-    while(True):
-        result = api.SetSeeedColorSensor(c_int(masterId), c_int(tempSlaveId), port, isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+        tempSlaveId = api.slaveId
+    result = callWithRetry(api.SetSeeedColorSensor, c_int(api.masterId), c_int(tempSlaveId), port, isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
 
 
 def GetSeeedDistanceSensorExt(api, SeeedPort):
     port = c_uint8(SeeedPort)
     distance = c_ubyte(0)
-    if slaveDevType == DevType.Magician:
-        tempSlaveId = slaveId
-    elif masterDevType == DevType.Conntroller and (slaveDevType == DevType.MagicianLite or slaveDevType == DevType.Idle):
+    if api.slaveDevType == DevType.Magician:
+        tempSlaveId = api.slaveId
+    elif api.masterDevType == DevType.Conntroller and (api.slaveDevType == DevType.MagicianLite or api.slaveDevType == DevType.Idle):
         tempSlaveId = -1
     else:
-        tempSlaveId = slaveId
-    while(True):
-        result = api.GetSeeedDistanceSensor(c_int(masterId), c_int(tempSlaveId), port, byref(distance))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+        tempSlaveId = api.slaveId
+    result = callWithRetry(api.GetSeeedDistanceSensor, c_int(api.masterId), c_int(tempSlaveId), port, byref(distance))
     return [distance.value]
 
 
 def SetSeeedTempSensorExt(api, SeeedPort, isQueued=0):
     port = c_uint8(SeeedPort)
     queuedCmdIndex = c_uint64(0)
-    if slaveDevType == DevType.Magician:
-        tempSlaveId = slaveId
-    elif masterDevType == DevType.Conntroller and (slaveDevType == DevType.MagicianLite or slaveDevType == DevType.Idle):
+    if api.slaveDevType == DevType.Magician:
+        tempSlaveId = api.slaveId
+    elif api.masterDevType == DevType.Conntroller and (api.slaveDevType == DevType.MagicianLite or api.slaveDevType == DevType.Idle):
         tempSlaveId = -1
     else:
-        tempSlaveId = slaveId
-    while(True):
-        result = api.SetSeeedTempSensor(c_int(masterId), c_int(tempSlaveId), port, isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+        tempSlaveId = api.slaveId
+    result = callWithRetry(api.SetSeeedTempSensor, c_int(api.masterId), c_int(tempSlaveId), port, isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
 
 
 def GetSeeedTempSensorExt(api):
     tem = c_ushort(0)
     hum = c_ushort(0)
-    if slaveDevType == DevType.Magician:
-        tempSlaveId = slaveId
-    elif masterDevType == DevType.Conntroller and (slaveDevType == DevType.MagicianLite or slaveDevType == DevType.Idle):
+    if api.slaveDevType == DevType.Magician:
+        tempSlaveId = api.slaveId
+    elif api.masterDevType == DevType.Conntroller and (api.slaveDevType == DevType.MagicianLite or api.slaveDevType == DevType.Idle):
         tempSlaveId = -1
     else:
-        tempSlaveId = slaveId
-    while(True):
-        result = api.GetSeeedTempSensor(c_int(masterId), c_int(tempSlaveId), byref(tem),  byref(hum))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+        tempSlaveId = api.slaveId
+    result = callWithRetry(api.GetSeeedTempSensor, c_int(api.masterId), c_int(tempSlaveId), byref(tem),  byref(hum))
     return [tem.value, hum.value]
 
 
 def SetSeeedLightSensorExt(api, SeeedPort, isQueued=0):
     port = c_uint8(SeeedPort)
     queuedCmdIndex = c_uint64(0)
-    if slaveDevType == DevType.Magician:
-        tempSlaveId = slaveId
-    elif masterDevType == DevType.Conntroller and (slaveDevType == DevType.MagicianLite or slaveDevType == DevType.Idle):
+    if api.slaveDevType == DevType.Magician:
+        tempSlaveId = api.slaveId
+    elif api.masterDevType == DevType.Conntroller and (api.slaveDevType == DevType.MagicianLite or api.slaveDevType == DevType.Idle):
         tempSlaveId = -1
     else:
-        tempSlaveId = slaveId
-    while(True):
-        result = api.SetSeeedLightSensor(c_int(masterId), c_int(tempSlaveId), port, isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+        tempSlaveId = api.slaveId
+    result = callWithRetry(api.SetSeeedLightSensor, c_int(api.masterId), c_int(tempSlaveId), port, isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
 
 
 def GetSeeedLightSensorExt(api):
     lux = c_ushort(0)
-    if slaveDevType == DevType.Magician:
-        tempSlaveId = slaveId
-    elif masterDevType == DevType.Conntroller and (slaveDevType == DevType.MagicianLite or slaveDevType == DevType.Idle):
+    if api.slaveDevType == DevType.Magician:
+        tempSlaveId = api.slaveId
+    elif api.masterDevType == DevType.Conntroller and (api.slaveDevType == DevType.MagicianLite or api.slaveDevType == DevType.Idle):
         tempSlaveId = -1
     else:
-        tempSlaveId = slaveId
-    while(True):
-        result = api.GetSeeedLightSensor(c_int(masterId), c_int(tempSlaveId), byref(lux))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+        tempSlaveId = api.slaveId
+    result = callWithRetry(api.GetSeeedLightSensor, c_int(api.masterId), c_int(tempSlaveId), byref(lux))
     return [lux.value]
 
 
@@ -3583,25 +2796,20 @@ def SetSeeedRgbExt(api, SeeedPort, Rgb, isQueued=0):
     port = c_ubyte(SeeedPort)
     rgb = c_float(Rgb)
     queuedCmdIndex = c_uint64(0)
-    if slaveDevType == DevType.Magician:
-        tempSlaveId = slaveId
-    elif masterDevType == DevType.Conntroller and (slaveDevType == DevType.MagicianLite or slaveDevType == DevType.Idle):
+    if api.slaveDevType == DevType.Magician:
+        tempSlaveId = api.slaveId
+    elif api.masterDevType == DevType.Conntroller and (api.slaveDevType == DevType.MagicianLite or api.slaveDevType == DevType.Idle):
         tempSlaveId = -1
     else:
-        tempSlaveId = slaveId
-    while(True):
-        result = api.SetSeeedRgb(c_int(masterId), c_int(tempSlaveId), port, rgb, isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+        tempSlaveId = api.slaveId
+    result = callWithRetry(api.SetSeeedRgb, c_int(api.masterId), c_int(tempSlaveId), port, rgb, isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
 
 # seeed传感器同步指令
 
 def SetSeeedColorSensorExtEx(api, SeeedPort,isQueued=0):
     ret = SetSeeedColorSensorExt(api, SeeedPort, isQueued)
-    if masterDevType == DevType.Magician:
+    if api.masterDevType == DevType.Magician:
         while(True):
             if ret[0] <= GetQueuedCmdCurrentIndex(api)[0]:
                 break
@@ -3615,7 +2823,7 @@ def SetSeeedColorSensorExtEx(api, SeeedPort,isQueued=0):
 
 def SetSeeedTempSensorExtEx(api, SeeedPort, isQueued=0):
     ret = SetSeeedTempSensorExt(api, SeeedPort, isQueued)
-    if masterDevType == DevType.Magician:
+    if api.masterDevType == DevType.Magician:
         while(True):
             if ret[0] <= GetQueuedCmdCurrentIndex(api)[0]:
                 break
@@ -3629,7 +2837,7 @@ def SetSeeedTempSensorExtEx(api, SeeedPort, isQueued=0):
 
 def SetSeeedLightSensorExtEx(api, SeeedPort, isQueued=0):
     ret = SetSeeedLightSensorExt(api, SeeedPort, isQueued)
-    if masterDevType == DevType.Magician:
+    if api.masterDevType == DevType.Magician:
         while(True):
             if ret[0] <= GetQueuedCmdCurrentIndex(api)[0]:
                 break
@@ -3643,7 +2851,7 @@ def SetSeeedLightSensorExtEx(api, SeeedPort, isQueued=0):
 
 def SetSeeedRgbExtEx(api, SeeedPort, Rgb, isQueued=0):
     ret = SetSeeedRgbExt(api, SeeedPort, Rgb, isQueued)
-    if masterDevType == DevType.Magician:
+    if api.masterDevType == DevType.Magician:
         while(True):
             if ret[0] <= GetQueuedCmdCurrentIndex(api)[0]:
                 break
@@ -3656,12 +2864,7 @@ def SetSeeedRgbExtEx(api, SeeedPort, Rgb, isQueued=0):
     
 
 def RestartMagicBox(api):
-    while(True):
-        result = api.RestartMagicBox(c_int(masterId), c_int(-1))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.RestartMagicBox, c_int(api.masterId), c_int(-1))
 
 
 #Magician Lite 2019-11-05 Magician Lite单独的API
@@ -3669,135 +2872,75 @@ def RestartMagicBox(api):
 
 def SetLostStepEnableAndParamsCmd(api, enable, threshlod, isQueued=0):
     queuedCmdIndex = c_uint64(0)
-    while(True):
-        result = api.SetLostStepEnableAndParamsCmd(c_int(masterId), c_int(slaveId), c_uint8(enable), c_float(threshlod), isQueued, byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetLostStepEnableAndParamsCmd, c_int(api.masterId), c_int(api.slaveId), c_uint8(enable), c_float(threshlod), isQueued, byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
 
 
 def GetLostStepEnableAndParamsCmd(api):
     enable = c_uint8(0)
     threshlod = c_float(0)
-    while(True):
-        result = api.GetLostStepEnableAndParamsCmd(c_int(masterId), c_int(slaveId), byref(enable), byref(threshlod))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetLostStepEnableAndParamsCmd, c_int(api.masterId), c_int(api.slaveId), byref(enable), byref(threshlod))
     return [enable.value, threshlod.value]
 
 
 
 def SetEndEffectorType(api, endType=0, isQueued=0):
     queuedCmdIndex = c_uint64(0)
-    while(True):
-        result = api.SetEndEffectorType(c_int(masterId), c_int(slaveId), isQueued, c_uint8(endType), byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break  
+    result = callWithRetry(api.SetEndEffectorType, c_int(api.masterId), c_int(api.slaveId), isQueued, c_uint8(endType), byref(queuedCmdIndex))
     return[queuedCmdIndex.value]
 
 
 def GetEndEffectorType(api):
     endType = c_uint8(0)
-    while(True):
-        result = api.GetEndEffectorType(c_int(masterId), c_int(slaveId), byref(endType))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetEndEffectorType, c_int(api.masterId), c_int(api.slaveId), byref(endType))
     return [endType.value]
 
 
 def SetServoAngle(api, servoId, angle, isQueued=0):
     queuedCmdIndex = c_uint64(0)
-    while(True):
-        result = api.SetServoAngle(c_int(masterId), c_int(-1), isQueued, c_uint8(servoId), c_float(angle), byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break 
+    result = callWithRetry(api.SetServoAngle, c_int(api.masterId), c_int(-1), isQueued, c_uint8(servoId), c_float(angle), byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
 
 
 def GetServoAngle(api, servoId):
     angle = c_float(0)
-    while(True):
-        result = api.GetServoAngle(c_int(masterId), c_int(-1),  c_uint8(servoId) ,byref(angle))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetServoAngle, c_int(api.masterId), c_int(-1),  c_uint8(servoId) ,byref(angle))
     return [angle.value]
 
 
 def SetArmSpeedRatio(api, paramsMode, speedRatio, isQueued=0):
     queuedCmdIndex = c_uint64(0)
-    while(True):
-        result = api.SetArmSpeedRatio(c_int(masterId), c_int(slaveId), isQueued, c_uint8(paramsMode), c_uint8(speedRatio),  byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break 
+    result = callWithRetry(api.SetArmSpeedRatio, c_int(api.masterId), c_int(api.slaveId), isQueued, c_uint8(paramsMode), c_uint8(speedRatio),  byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
 
 
 def GetArmSpeedRatio(api, paramsMode=0):
     speedRatio = c_uint8(0)
     # paramsMode = c_uint8(0)
-    while(True):
-        result = api.GetArmSpeedRatio(c_int(masterId), c_int(slaveId),  c_uint8(paramsMode), byref(speedRatio))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetArmSpeedRatio, c_int(api.masterId), c_int(api.slaveId),  c_uint8(paramsMode), byref(speedRatio))
     return[speedRatio.value]
 
 
 def SetLSpeedRatio(api, paramsMode, speedRatio, isQueued=0):
     queuedCmdIndex = c_uint64(0)
-    while(True):
-        result = api.SetLSpeedRatio(c_int(masterId), c_int(-1), isQueued, c_uint8(paramsMode), c_uint8(speedRatio), byref(queuedCmdIndex))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetLSpeedRatio, c_int(api.masterId), c_int(-1), isQueued, c_uint8(paramsMode), c_uint8(speedRatio), byref(queuedCmdIndex))
     return [queuedCmdIndex.value]
 
 
 def GetLSpeedRatio(api, paramsMode):
     speedRatio = c_uint8(0)
-    while(True):
-        result = api.GetLSpeedRatio(c_int(masterId), c_int(-1), c_uint8(paramsMode), byref(speedRatio))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.GetLSpeedRatio, c_int(api.masterId), c_int(-1), c_uint8(paramsMode), byref(speedRatio))
     return[speedRatio.value]
 
 
 def PrintInfo(api, info):
     szPara = create_string_buffer(len(info))
     szPara.raw = info.encode("utf-8")
-    while(True):
-        result = api.PrintInfo(c_int(masterId), c_int(-1), szPara)
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.PrintInfo, c_int(api.masterId), c_int(-1), szPara)
 
 
 def SetProgbar(api, progbar):
-    while(True):
-        result = api.SetProgbar(c_int(masterId), c_int(-1), c_uint8(progbar))
-        if result != DobotCommunicate.DobotCommunicate_NoError:
-            dSleep(5)
-            continue
-        break
+    result = callWithRetry(api.SetProgbar, c_int(api.masterId), c_int(-1), c_uint8(progbar))
 
 #MagicianLite/Magic Box同步等待
 
@@ -0,0 +1,238 @@
+import argparse
+import os
+import queue
+import random
+import socket
+import threading
+import time
+from collections import Counter
+from DoBotArm import DobotProtocol as protocol
+from DoBotArm.SimulatedDobot import SimulatedController, SimulatedDobotError
+
+# Default emulator settings, overridden from the command line
+DEFAULT_EMULATOR_SETTINGS = {
+    "latency_ms": 5.0,      # Time from a request arriving until its response starts going out
+    "jitter_ms": 2.0,       # Uniform +/- jitter on that latency
+    "baudrate": 115200,     # Responses are paced at the wire speed of a real serial link (10 bits per byte)
+    "drop_rate": 0.0,       # Share of responses that are never sent (the client sees a timeout)
+    "corrupt_rate": 0.0,    # Share of responses sent with a broken checksum
+    "seed": None
+}
+
+ALARM_BITS = {"JointLimitError": protocol.ALARM_INVERSE_KINEMATICS_LIMIT, "SimulatedDobotError": protocol.ALARM_PLAN_INVALID}
+POSE_RESPONSE = protocol.COMMANDS["GetPose"].response
+
+
+# Speaks the Magician serial protocol over a loopback TCP socket or a pty, backed by the SimulatedController.
+# Lets the real transport (framing, round trips, retries) be measured and load tested without a robot:
+#   python -m DoBotArm.DobotEmulator --tcp 127.0.0.1:5555 --latency-ms 5 --drop-rate 0.01
+#   python -m DoBotArm.DobotEmulator --pty
+class DobotEmulator:
+    def __init__(self, settings=None, simulation=None):
+        merged = dict(DEFAULT_EMULATOR_SETTINGS)
+        merged.update(settings or {})
+        self.latency = merged["latency_ms"] / 1000
+        self.jitter = merged["jitter_ms"] / 1000
+        self.byte_time = 10 / merged["baudrate"]
+        self.drop_rate = merged["drop_rate"]
+        self.corrupt_rate = merged["corrupt_rate"]
+        self.random = random.Random(merged["seed"])
+
+        self.controller = SimulatedController(simulation)
+        self.stats = Counter()  # requests, responses, dropped, corrupted, faults, unknown, bad_checksums
+        self.running = False
+        self.listener = None
+
+    # Run one request against the controller, returns the response params (None for unknown commands)
+    def handle(self, command_id, ctrl, params):
+        command = protocol.COMMANDS_BY_ID.get(command_id)
+        if command is None:
+            self.stats["unknown"] += 1
+            return None
+        write = ctrl & protocol.CTRL_WRITE
+        queued = 1 if ctrl & protocol.CTRL_QUEUED else 0
+        controller = self.controller
+
+        if not write:
+            if command.name == "GetPose":
+                return POSE_RESPONSE.pack(*controller.GetPose())
+            if command.name == "GetPoseL":
+                return command.response.pack(*controller.GetPoseL())
+            if command.name == "GetQueuedCmdCurrentIndex":
+                return command.response.pack(*controller.GetQueuedCmdCurrentIndex())
+            if command.name == "GetAlarmsState":
+                alarms = bytearray(16)
+                for name in controller.GetAlarmsState():
+                    bit = ALARM_BITS.get(name, protocol.ALARM_PLAN_INVALID)
+                    alarms[bit // 8] |= 1 << (bit % 8)
+                return bytes(alarms)
+            if command.name == "GetDeviceVersion":
+                return command.response.pack(*controller.GetDeviceVersion())
+            return b""
+
+        values = command.request.unpack(params)
+        try:
+            if command.name == "SetCPCmd":
+                index = controller.SetCPCmd(*values, isQueued=queued)[0]
+            elif command.name == "SetPTPCmd":
+                index = controller.SetPTPCmd(*values, isQueued=queued)[0]
+            elif command.name == "SetPTPWithLCmd":
+                index = controller.SetPTPWithLCmd(*values, isQueued=queued)[0]
+            elif command.name == "SetEndEffectorGripper":
+                index = controller.SetEndEffectorGripper(*values, isQueued=queued)[0]
+            elif command.name == "SetDeviceWithL":
+                index = controller.SetDeviceWithL(*values)[0]
+            elif command.name == "SetPTPCommonParams":
+                index = controller.SetPTPCommonParams(*values)[0]
+            elif command.name == "SetJOGCoordinateParams":
+                velocities, accelerations = values[:4], values[4:]
+                index = controller.SetJOGCoordinateParams(*[value for pair in zip(velocities, accelerations) for value in pair])[0]
+            elif command.name in ("SetJOGCommonParams", "SetJOGLParams", "SetJOGCmd"):
+                index = getattr(controller, command.name)(*values)[0]
+            elif command.name == "SetQueuedCmdClear":
+                controller.SetQueuedCmdClear()
+                index = 0
+            elif command.name == "ClearAllAlarmsState":
+                controller.ClearAllAlarmsState()
+                index = 0
+            else:
+                # Accepted without changing the simulation (home and CP parameters, queue start/stop)
+                with controller.lock:
+                    index = controller.submit("noop", None, queued)
+        except SimulatedDobotError:
+            # The real arm acknowledges the packet and raises an alarm instead of answering with an error
+            self.stats["faults"] += 1
+            index = controller.last_index if queued else 0
+        return protocol.QUEUE_INDEX.pack(index) if queued else b""
+
+    # Serve one byte stream until it closes. Requests are executed as they arrive, each response is ready
+    # latency after its request and then takes its wire time, responses go out one after another like on a
+    # serial link, so pipelined clients overlap their round trips but still share the bandwidth.
+    def serve(self, recv, send):
+        parser = protocol.PacketParser()
+        outbox = queue.Queue()
+
+        def writer():
+            while True:
+                item = outbox.get()
+                if item is None:
+                    return
+                due, packet = item
+                delay = due - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                try:
+                    send(packet)
+                except OSError:
+                    return
+
+        writer_thread = threading.Thread(target=writer, name="DobotEmulatorWriter", daemon=True)
+        writer_thread.start()
+        last_due = 0.0
+        try:
+            while self.running:
+                try:
+                    data = recv(4096)
+                except OSError:
+                    break
+                if not data:
+                    break
+                now = time.monotonic()
+                for command_id, ctrl, params in parser.feed(data):
+                    self.stats["requests"] += 1
+                    response = self.handle(command_id, ctrl, params)
+                    if response is None:
+                        continue
+                    if self.random.random() < self.drop_rate:
+                        self.stats["dropped"] += 1
+                        continue
+                    packet = protocol.encodeRaw(command_id, ctrl, response)
+                    if self.random.random() < self.corrupt_rate:
+                        packet[-1] ^= 0xFF
+                        self.stats["corrupted"] += 1
+                    ready = now + max(self.latency + self.random.uniform(-self.jitter, self.jitter), 0.0)
+                    due = max(ready, last_due) + len(packet) * self.byte_time
+                    last_due = due
+                    outbox.put((due, packet))
+                    self.stats["responses"] += 1
+                self.stats["bad_checksums"] = parser.bad_checksums
+        finally:
+            outbox.put(None)
+            writer_thread.join(timeout=1.0)
+
+    # Listen on a loopback TCP port in the background, returns the bound (host, port) (port 0 picks a free one)
+    def startTcp(self, host="127.0.0.1", port=0):
+        self.listener = socket.create_server((host, port))
+        self.running = True
+
+        def accept():
+            while self.running:
+                try:
+                    connection, _ = self.listener.accept()
+                except OSError:
+                    return
+                connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                threading.Thread(target=self.serveConnection, args=(connection,), name="DobotEmulatorClient", daemon=True).start()
+
+        threading.Thread(target=accept, name="DobotEmulatorListener", daemon=True).start()
+        return self.listener.getsockname()[:2]
+
+    def serveConnection(self, connection):
+        with connection:
+            self.serve(connection.recv, connection.sendall)
+
+    # Serve on a new pseudo terminal in the background (Linux/macOS), returns the device path to open like a serial port
+    def startPty(self):
+        import tty
+        master, slave = os.openpty()
+        tty.setraw(slave)
+        self.running = True
+        self.pty = (master, slave)  # The slave stays open here so the master never reads EOF between clients
+
+        def write(data):
+            view = memoryview(data)
+            while view:
+                view = view[os.write(master, view):]
+
+        threading.Thread(target=self.serve, args=(lambda size: os.read(master, size), write),
+                         name="DobotEmulatorPty", daemon=True).start()
+        return os.ttyname(slave)
+
+    def stop(self):
+        self.running = False
+        if self.listener is not None:
+            self.listener.close()
+            self.listener = None
+
+
+def parseAddress(address):
+    host, _, port = address.rpartition(":")
+    return (host or "127.0.0.1", int(port))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dobot Magician protocol emulator for transport testing")
+    parser.add_argument("--tcp", default="127.0.0.1:5555", help="Listen address (host:port)")
+    parser.add_argument("--pty", action="store_true", help="Serve on a pseudo terminal instead of TCP")
+    parser.add_argument("--latency-ms", type=float, default=DEFAULT_EMULATOR_SETTINGS["latency_ms"])
+    parser.add_argument("--jitter-ms", type=float, default=DEFAULT_EMULATOR_SETTINGS["jitter_ms"])
+    parser.add_argument("--baudrate", type=int, default=DEFAULT_EMULATOR_SETTINGS["baudrate"])
+    parser.add_argument("--drop-rate", type=float, default=DEFAULT_EMULATOR_SETTINGS["drop_rate"])
+    parser.add_argument("--corrupt-rate", type=float, default=DEFAULT_EMULATOR_SETTINGS["corrupt_rate"])
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    emulator = DobotEmulator({"latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms, "baudrate": args.baudrate,
+                              "drop_rate": args.drop_rate, "corrupt_rate": args.corrupt_rate, "seed": args.seed})
+    if args.pty:
+        print(f"Dobot emulator on {emulator.startPty()}")
+    else:
+        host, port = emulator.startTcp(*parseAddress(args.tcp))
+        print(f"Dobot emulator on tcp://{host}:{port}")
+
+    try:
+        while True:
+            time.sleep(10)
+            print(", ".join(f"{key}={value}" for key, value in sorted(emulator.stats.items())))
+    except KeyboardInterrupt:
+        emulator.stop()
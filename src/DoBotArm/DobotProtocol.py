@@ -0,0 +1,142 @@
+import struct
+
+# Dobot Magician serial protocol (communication protocol v1.1.x), the subset this program uses.
+#
+# Packet: 0xAA 0xAA | len | id | ctrl | params | checksum
+#   len      - bytes in id + ctrl + params
+#   ctrl     - bit 0 rw (1 = set), bit 1 isQueued
+#   checksum - two's complement of the 8 bit sum of id, ctrl and params
+# The arm answers every packet in order with the same id and ctrl. Queued set commands answer with
+# their uint64 queue index, get commands with their values, everything else with no params.
+HEADER = b"\xaa\xaa"
+PACKET_HEAD = struct.Struct("<2sBBB")  # header, len, id, ctrl
+MAX_PARAMS = 255 - 2
+CTRL_WRITE = 0x01
+CTRL_QUEUED = 0x02
+
+QUEUE_INDEX = struct.Struct("<Q")
+
+
+# One protocol command: its id and the precompiled formats of its request and response params
+class Command:
+    __slots__ = ("name", "id", "request", "response")
+
+    def __init__(self, name, command_id, request="<", response="<"):
+        self.name = name
+        self.id = command_id
+        self.request = struct.Struct(request)
+        self.response = struct.Struct(response)
+
+
+COMMANDS = {command.name: command for command in [
+    Command("GetDeviceVersion", 2, response="<BBB"),
+    Command("SetDeviceWithL", 3, "<BB"),                        # isWithL, version
+    Command("GetPose", 10, response="<8f"),                     # x, y, z, r, joint angles 1-4
+    Command("GetPoseL", 13, response="<f"),                     # l
+    Command("GetAlarmsState", 20, response="<16s"),             # Alarm bit field
+    Command("ClearAllAlarmsState", 21),
+    Command("SetHOMEParams", 30, "<4f"),                        # x, y, z, r
+    Command("SetEndEffectorGripper", 63, "<BB"),                # enableCtrl, on
+    Command("SetJOGCoordinateParams", 71, "<8f"),               # velocity x4, acceleration x4
+    Command("SetJOGCommonParams", 72, "<2f"),                   # velocityRatio, accelerationRatio
+    Command("SetJOGCmd", 73, "<BB"),                            # isJoint, cmd
+    Command("SetJOGLParams", 74, "<2f"),                        # velocity, acceleration
+    Command("SetPTPCommonParams", 83, "<2f"),                   # velocityRatio, accelerationRatio
+    Command("SetPTPCmd", 84, "<B4f"),                           # ptpMode, x, y, z, r
+    Command("SetPTPWithLCmd", 86, "<B5f"),                      # ptpMode, x, y, z, r, l
+    Command("SetCPParams", 90, "<3fB"),                         # planAcc, junctionVel, acc, realTimeTrack
+    Command("SetCPCmd", 91, "<B4f"),                            # cpMode, x, y, z, velocity
+    Command("SetCPRHoldEnable", 93, "<B"),                      # isEnable
+    Command("SetQueuedCmdStartExec", 240),
+    Command("SetQueuedCmdStopExec", 241),
+    Command("SetQueuedCmdClear", 245),
+    Command("GetQueuedCmdCurrentIndex", 246, response="<Q"),
+]}
+COMMANDS_BY_ID = {command.id: command for command in COMMANDS.values()}
+
+# Alarm codes the emulator raises (bit number in the GetAlarmsState bit field)
+ALARM_INVERSE_KINEMATICS_LIMIT = 0x12
+ALARM_PLAN_INVALID = 0x11
+
+
+class ProtocolError(Exception):
+    pass
+
+
+def checksum(payload):
+    return (-sum(payload)) & 0xFF
+
+
+# Builds a complete packet, params are packed straight into the packet buffer (no intermediate bytes objects)
+def encodePacket(command, ctrl, *values):
+    size = command.request.size if ctrl & CTRL_WRITE else 0
+    packet = bytearray(PACKET_HEAD.size + size + 1)
+    return packInto(packet, command, ctrl, *values)
+
+
+# Rewrites a packet buffer from encodePacket in place, so a buffer can be reused for every send of a command
+def packInto(packet, command, ctrl, *values):
+    size = len(packet) - PACKET_HEAD.size - 1
+    PACKET_HEAD.pack_into(packet, 0, HEADER, size + 2, command.id, ctrl)
+    if size:
+        command.request.pack_into(packet, PACKET_HEAD.size, *values)
+    with memoryview(packet) as view:
+        packet[-1] = checksum(view[3:-1])
+    return packet
+
+
+# Packet with raw params, used for responses whose params are not the command's request format
+def encodeRaw(command_id, ctrl, params=b""):
+    if len(params) > MAX_PARAMS:
+        raise ProtocolError(f"{len(params)} bytes of params do not fit in a packet")
+    packet = bytearray(PACKET_HEAD.size + len(params) + 1)
+    PACKET_HEAD.pack_into(packet, 0, HEADER, len(params) + 2, command_id, ctrl)
+    packet[PACKET_HEAD.size:-1] = params
+    packet[-1] = checksum(memoryview(packet)[3:-1])
+    return packet
+
+
+# Incremental decoder for a byte stream, yields (id, ctrl, params) for every complete packet.
+# Packets with a bad checksum are counted and skipped, the parser resynchronises on the next header.
+class PacketParser:
+    def __init__(self):
+        self.buffer = bytearray()
+        self.bad_checksums = 0
+        self.skipped_bytes = 0
+
+    def feed(self, data):
+        buffer = self.buffer
+        buffer += data
+        packets = []
+        start = 0
+        while True:
+            header = buffer.find(HEADER, start)
+            if header < 0:
+                # Keep a trailing 0xAA, it may be the first half of the next header
+                keep = 1 if len(buffer) > start and buffer[-1] == 0xAA else 0
+                self.skipped_bytes += len(buffer) - start - keep
+                start = len(buffer) - keep
+                break
+            self.skipped_bytes += header - start
+            start = header
+            if len(buffer) - start < PACKET_HEAD.size:
+                break
+            length = buffer[start + 2]
+            end = start + 3 + length + 1
+            if length < 2:
+                start += 2
+                self.bad_checksums += 1
+                continue
+            if len(buffer) < end:
+                break
+            payload = memoryview(buffer)[start + 3:end - 1]
+            if checksum(payload) != buffer[end - 1]:
+                payload.release()
+                self.bad_checksums += 1
+                start += 2
+                continue
+            packets.append((buffer[start + 3], buffer[start + 4], bytes(buffer[start + 5:end - 1])))
+            payload.release()
+            start = end
+        del buffer[:start]
+        return packets
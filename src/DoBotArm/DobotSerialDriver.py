@@ -0,0 +1,317 @@
+import socket
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from DoBotArm import DobotProtocol as protocol
+
+RESPONSE_TIMEOUT = 0.5   # Seconds to wait for an answer before a request counts as lost
+RETRIES = 2              # Lost requests that are safe to repeat (reads, immediate commands) are resent this often
+MAX_IN_FLIGHT = 4        # Requests sent before their answers arrive (the Magician only buffers a few packets)
+READ_TIMEOUT = 0.05      # Reader thread poll interval
+# CP planning at 100% ratios (planAcc, junctionVel, acc). The protocol has no CP ratio command,
+# SetCPCommonParams scales these and sends them as CP params (id 90)
+CP_PARAMS = (200.0, 100.0, 200.0)
+
+
+class DobotTimeoutError(Exception):
+    pass
+
+
+# Transport for "tcp://host:port" (the DobotEmulator), everything else is opened with pyserial
+class SocketTransport:
+    def __init__(self, address):
+        host, _, port = address.rpartition(":")
+        self.socket = socket.create_connection((host, int(port)))
+        self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.socket.settimeout(READ_TIMEOUT)
+
+    def read(self):
+        try:
+            data = self.socket.recv(4096)
+        except socket.timeout:
+            return b""
+        if not data:
+            raise ConnectionError("Connection closed by the Dobot emulator")
+        return data
+
+    def write(self, data):
+        self.socket.sendall(data)
+
+    def close(self):
+        self.socket.close()
+
+
+class SerialTransport:
+    def __init__(self, port, baudrate):
+        import serial  # pyserial, only needed for real serial ports
+
+        self.serial = serial.serial_for_url(port, baudrate=baudrate, timeout=READ_TIMEOUT)
+
+    def read(self):
+        return self.serial.read(self.serial.in_waiting or 1)
+
+    def write(self, data):
+        self.serial.write(data)
+
+    def close(self):
+        self.serial.close()
+
+
+def openTransport(port, baudrate):
+    if port.startswith("tcp://"):
+        return SocketTransport(port[len("tcp://"):])
+    return SerialTransport(port, baudrate)
+
+
+# A request waiting for its answer. Answers come back in the order requests were sent, so every request
+# gets a sequence number and answers are matched to the oldest outstanding request with the same command id.
+class PendingRequest:
+    __slots__ = ("sequence", "command", "future", "sent", "abandoned")
+
+    def __init__(self, sequence, command):
+        self.sequence = sequence
+        self.command = command
+        self.future = Future()
+        self.sent = time.perf_counter()
+        self.abandoned = False
+
+
+# Pure Python Dobot Magician driver: talks the binary protocol straight over a serial port (or the emulator),
+# no DLL needed. Requests are pipelined: up to max_in_flight are sent before their answers arrive, a reader
+# thread matches the answers to them. Packets are packed with the precompiled struct formats in DobotProtocol
+# into one reusable buffer per command.
+#
+# The methods are named and return the same values as their DobotDllType counterparts (without the api argument),
+# so DobotArm can use either backend.
+class DobotSerialDriver:
+    def __init__(self, timeout=RESPONSE_TIMEOUT, retries=RETRIES, max_in_flight=MAX_IN_FLIGHT):
+        self.timeout = timeout
+        self.retries = retries
+        self.transport = None
+        self.parser = protocol.PacketParser()
+
+        self.pending = deque()
+        self.lock = threading.Lock()              # Guards pending, sequence and the packet buffers while writing
+        self.window = threading.BoundedSemaphore(max_in_flight)
+        self.sequence = 0
+        self.packets = {}                         # (command id, ctrl) -> reusable packet buffer
+
+        self.lost = 0                             # Requests that never got an answer
+        self.resent = 0
+        self.running = False
+        self.reader = None
+
+    def connect(self, port, baudrate):
+        try:
+            self.transport = openTransport(port, baudrate)
+        except (OSError, ImportError) as e:
+            print(f"Could not open {port}: {e}")
+            return False
+        self.running = True
+        self.reader = threading.Thread(target=self.read, name="DobotSerialReader", daemon=True)
+        self.reader.start()
+        try:
+            self.SetQueuedCmdStartExec()
+        except DobotTimeoutError:
+            print(f"No answer from a Dobot on {port}.")
+            self.disconnect()
+            return False
+        return True
+
+    def disconnect(self):
+        self.running = False
+        if self.reader is not None:
+            self.reader.join(timeout=1.0)
+            self.reader = None
+        if self.transport is not None:
+            self.transport.close()
+            self.transport = None
+        with self.lock:
+            while self.pending:
+                self.resolve(self.pending.popleft(), error=ConnectionError("Dobot disconnected"))
+
+    # ---- Request pipeline ----
+
+    # Queue one request on the wire and return a Future for its response params
+    def send(self, name, *values, write=False, queued=False):
+        if self.transport is None:
+            raise ConnectionError("Dobot is not connected")
+        command = protocol.COMMANDS[name]
+        ctrl = (protocol.CTRL_WRITE if write else 0) | (protocol.CTRL_QUEUED if queued else 0)
+        if not self.window.acquire(timeout=2 * self.timeout):
+            raise DobotTimeoutError(f"{name} could not be sent, {len(self.pending)} requests are still unanswered")
+        with self.lock:
+            packet = self.packets.get((command.id, ctrl))
+            if packet is None:
+                packet = self.packets[(command.id, ctrl)] = protocol.encodePacket(command, ctrl, *values)
+            else:
+                protocol.packInto(packet, command, ctrl, *values)
+            self.sequence += 1
+            request = PendingRequest(self.sequence, command)
+            self.pending.append(request)
+            try:
+                self.transport.write(packet)
+            except Exception as e:
+                self.pending.remove(request)
+                self.resolve(request, error=e)
+        return request.future
+
+    # Send and wait. Requests that can be repeated safely are resent when their answer is lost, queued
+    # commands are not (a lost answer does not mean the arm did not queue the first copy).
+    def call(self, name, *values, write=False, queued=False):
+        attempts = 1 if queued else 1 + self.retries
+        for attempt in range(attempts):
+            future = self.send(name, *values, write=write, queued=queued)
+            try:
+                return future.result(self.timeout)
+            except (FutureTimeoutError, DobotTimeoutError):
+                self.abandon(future)
+                if attempt + 1 < attempts:
+                    self.resent += 1
+        raise DobotTimeoutError(f"{name} got no answer after {attempts} attempt(s)")
+
+    def abandon(self, future):
+        with self.lock:
+            for request in self.pending:
+                if request.future is future and not request.abandoned:
+                    request.abandoned = True
+                    self.lost += 1
+                    self.window.release()
+                    return
+
+    def resolve(self, request, params=None, error=None):
+        if not request.abandoned:
+            self.window.release()
+        request.abandoned = True
+        if request.future.done():
+            return
+        if error is not None:
+            request.future.set_exception(error)
+        else:
+            request.future.set_result(params)
+
+    # Reader thread: decode answers and hand them to the oldest outstanding request with the same id that is still
+    # waiting (or, for a late answer, the oldest one that gave up). Anything older never got its answer.
+    def read(self):
+        while self.running:
+            try:
+                data = self.transport.read()
+            except Exception as e:
+                print(f"Dobot link lost: {e}")
+                self.running = False
+                break
+            if not data:
+                self.expire()
+                continue
+            for command_id, _, params in self.parser.feed(data):
+                with self.lock:
+                    same_id = [request for request in self.pending if request.command.id == command_id]
+                    if not same_id:
+                        continue
+                    match = next((request for request in same_id if not request.abandoned), same_id[0])
+                    while self.pending:
+                        request = self.pending.popleft()
+                        if request is match:
+                            self.resolve(request, params)
+                            break
+                        if not request.abandoned:
+                            self.lost += 1
+                        self.resolve(request, error=DobotTimeoutError(f"{request.command.name} answer lost"))
+            self.expire()
+
+    # Fail requests whose answer is overdue so their pipeline slot frees up even when nobody waits on them.
+    # They stay queued (abandoned) for a while so a late answer is still matched to them and not to a newer request.
+    def expire(self):
+        now = time.perf_counter()
+        with self.lock:
+            for request in self.pending:
+                if now - request.sent < self.timeout:
+                    break
+                if not request.abandoned:
+                    self.lost += 1
+                    self.resolve(request, error=DobotTimeoutError(f"{request.command.name} got no answer"))
+            while self.pending and now - self.pending[0].sent > 10 * self.timeout:
+                self.pending.popleft()
+
+    # ---- DobotDllType compatible commands ----
+
+    def queuedIndex(self, params):
+        return [protocol.QUEUE_INDEX.unpack(params)[0] if params else 0]
+
+    def GetDeviceVersion(self):
+        return list(protocol.COMMANDS["GetDeviceVersion"].response.unpack(self.call("GetDeviceVersion")))
+
+    def SetDeviceWithL(self, isWithL, version=0, isQueued=0):
+        return self.queuedIndex(self.call("SetDeviceWithL", int(bool(isWithL)), version, write=True, queued=isQueued))
+
+    def GetPose(self):
+        return list(protocol.COMMANDS["GetPose"].response.unpack(self.call("GetPose")))
+
+    def GetPoseL(self):
+        return list(protocol.COMMANDS["GetPoseL"].response.unpack(self.call("GetPoseL")))
+
+    def GetAlarmsState(self, maxLen=1000):
+        alarms = protocol.COMMANDS["GetAlarmsState"].response.unpack(self.call("GetAlarmsState"))[0]
+        return [alarms, len(alarms)]
+
+    def ClearAllAlarmsState(self):
+        self.call("ClearAllAlarmsState", write=True)
+
+    def SetHOMEParams(self, x, y, z, r, isQueued=0):
+        return self.queuedIndex(self.call("SetHOMEParams", x, y, z, r, write=True, queued=isQueued))
+
+    def SetEndEffectorGripper(self, enableCtrl, on, isQueued=0):
+        return self.queuedIndex(self.call("SetEndEffectorGripper", enableCtrl, on, write=True, queued=isQueued))
+
+    def SetJOGCoordinateParams(self, xVelocity, xAcceleration, yVelocity, yAcceleration, zVelocity, zAcceleration, rVelocity, rAcceleration, isQueued=0):
+        return self.queuedIndex(self.call("SetJOGCoordinateParams", xVelocity, yVelocity, zVelocity, rVelocity,
+                                          xAcceleration, yAcceleration, zAcceleration, rAcceleration, write=True, queued=isQueued))
+
+    def SetJOGCommonParams(self, value_velocityratio, value_accelerationratio, isQueued=0):
+        return self.queuedIndex(self.call("SetJOGCommonParams", value_velocityratio, value_accelerationratio, write=True, queued=isQueued))
+
+    def SetJOGCmd(self, isJoint, cmd, isQueued=0):
+        return self.queuedIndex(self.call("SetJOGCmd", isJoint, cmd, write=True, queued=isQueued))
+
+    def SetJOGLParams(self, velocity, acceleration, isQueued=0):
+        return self.queuedIndex(self.call("SetJOGLParams", velocity, acceleration, write=True, queued=isQueued))
+
+    def SetPTPCommonParams(self, velocityRatio, accelerationRatio, isQueued=0):
+        return self.queuedIndex(self.call("SetPTPCommonParams", velocityRatio, accelerationRatio, write=True, queued=isQueued))
+
+    def SetPTPCmd(self, ptpMode, x, y, z, rHead, isQueued=0):
+        return self.queuedIndex(self.call("SetPTPCmd", ptpMode, x, y, z, rHead, write=True, queued=isQueued))
+
+    def SetPTPWithLCmd(self, ptpMode, x, y, z, rHead, l, isQueued=0):
+        return self.queuedIndex(self.call("SetPTPWithLCmd", ptpMode, x, y, z, rHead, l, write=True, queued=isQueued))
+
+    def SetCPParams(self, planAcc, juncitionVel, acc, realTimeTrack=0, isQueued=0):
+        return self.queuedIndex(self.call("SetCPParams", planAcc, juncitionVel, acc, realTimeTrack, write=True, queued=isQueued))
+
+    def SetCPCommonParams(self, velocityRatio, accelerationRatio, isQueued=0):
+        plan_acc, junction_vel, acc = CP_PARAMS
+        return self.SetCPParams(plan_acc * accelerationRatio / 100, junction_vel * velocityRatio / 100,
+                                acc * accelerationRatio / 100, isQueued=isQueued)
+
+    def SetCPRHoldEnable(self, isEnable):
+        self.call("SetCPRHoldEnable", int(bool(isEnable)), write=True)
+
+    def SetCPCmd(self, cpMode, x, y, z, velocity, isQueued=0):
+        return self.queuedIndex(self.call("SetCPCmd", cpMode, x, y, z, velocity, write=True, queued=isQueued))
+
+    def SetQueuedCmdStartExec(self):
+        self.call("SetQueuedCmdStartExec", write=True)
+
+    def SetQueuedCmdStopExec(self):
+        self.call("SetQueuedCmdStopExec", write=True)
+
+    # Name DobotArm.disconnect stops the queue with
+    def SetQueuedCmdStop(self):
+        self.SetQueuedCmdStopExec()
+
+    def SetQueuedCmdClear(self):
+        self.call("SetQueuedCmdClear", write=True)
+
+    def GetQueuedCmdCurrentIndex(self):
+        return list(protocol.COMMANDS["GetQueuedCmdCurrentIndex"].response.unpack(self.call("GetQueuedCmdCurrentIndex")))
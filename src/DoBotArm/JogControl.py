@@ -0,0 +1,129 @@
+from DoBotArm import DobotDllType as dType
+
+# Default velocity mode settings, overridden by "jog_settings" in config.json
+DEFAULT_JOG_SETTINGS = {
+    "enabled": False,         # Drive the arm with JOG velocity commands instead of streaming positions
+    "dead_zone_mm": 25.0,     # Displacement from the neutral point that still means "stand still"
+    "full_speed_mm": 100.0,   # Displacement at which the arm jogs at full velocity
+    "speed_levels": 3,        # Velocity buckets between the dead zone and full speed
+    "hysteresis_mm": 5.0,     # How far past a bucket edge the hand has to go before the bucket changes
+    "velocity": 100,          # mm/s of every cartesian axis at full speed
+    "acceleration": 200,      # mm/s^2
+    "rail_velocity": 100,     # mm/s of the linear rail at full speed
+    "rail_acceleration": 200  # mm/s^2
+}
+
+# JOG commands per axis as (positive, negative)
+ARM_COMMANDS = ((dType.JC.JogAPPressed, dType.JC.JogANPressed),   # X
+                (dType.JC.JogBPPressed, dType.JC.JogBNPressed),   # Y
+                (dType.JC.JogCPPressed, dType.JC.JogCNPressed))   # Z
+RAIL_COMMANDS = ((dType.JC.JogEPPressed, dType.JC.JogENPressed),)  # L
+
+IDLE = (None, 0)  # Bucket of a hand inside the dead zone
+
+
+# Velocity control: the hand's displacement from a neutral point (where it was when tracking started) becomes a JOG
+# command along the axis it is displaced furthest on, at a speed bucket picked from how far it is displaced. The
+# controller only jogs one axis at a time, so diagonal displacements move along the dominant axis.
+#
+# A frame costs a serial command only when its bucket differs from the one last sent, so holding the hand still
+# (anywhere, not only at the neutral point) sends nothing. Hysteresis keeps a hand resting on a bucket edge from
+# flapping between two buckets. Buckets are (axis, level) with a signed level, 0 is standing still.
+#
+# arm_commands needs jog(cmd, speed_ratio) and setJogParams(...), like the command dispatcher
+class JogController:
+    def __init__(self, arm_commands, settings=None):
+        merged = dict(DEFAULT_JOG_SETTINGS)
+        merged.update(settings or {})
+        self.arm_commands = arm_commands
+        self.settings = merged
+        self.enabled = merged["enabled"]
+        self.dead_zone = merged["dead_zone_mm"]
+        self.levels = max(int(merged["speed_levels"]), 1)
+        self.step = max(merged["full_speed_mm"] - self.dead_zone, 1e-6) / self.levels
+        self.hysteresis = merged["hysteresis_mm"]
+
+        self.commands = None   # ARM_COMMANDS or RAIL_COMMANDS, whichever the neutral point belongs to
+        self.neutral = None
+        self.bucket = IDLE     # Last bucket sent, None when unknown (a JOG command failed)
+
+        self.sent = 0          # JOG commands sent
+        self.unchanged = 0     # Frames whose bucket matched the last one sent
+
+    # Send the JOG velocities and accelerations, speed buckets are ratios of these
+    def configure(self):
+        settings = self.settings
+        return self.arm_commands.setJogParams(settings["velocity"], settings["acceleration"],
+                                              settings["rail_velocity"], settings["rail_acceleration"])
+
+    def levelFor(self, magnitude):
+        if magnitude < self.dead_zone:
+            return 0
+        return min(int((magnitude - self.dead_zone) / self.step) + 1, self.levels)
+
+    def classify(self, displacement):
+        magnitudes = [abs(value) for value in displacement]
+        axis = max(range(len(magnitudes)), key=magnitudes.__getitem__)
+        last_axis, last_level = self.bucket or IDLE
+        # Stay on the current axis until another one leads it by more than the hysteresis
+        if last_axis is not None and magnitudes[axis] - magnitudes[last_axis] < self.hysteresis:
+            axis = last_axis
+        magnitude = magnitudes[axis]
+        positive = displacement[axis] >= 0
+
+        if (self.bucket is not None and last_axis in (None, axis) and (last_level == 0 or (last_level > 0) == positive)
+                and self.levelFor(magnitude - self.hysteresis) <= abs(last_level) <= self.levelFor(magnitude + self.hysteresis)):
+            return self.bucket
+        level = self.levelFor(magnitude)
+        if level == 0:
+            return IDLE
+        return (axis, level if positive else -level)
+
+    def update(self, position, commands):
+        if commands is not self.commands:
+            self.reset()
+            self.commands = commands
+        if self.neutral is None:
+            self.neutral = tuple(position)
+            return None
+        bucket = self.classify([value - neutral for value, neutral in zip(position, self.neutral)])
+        if bucket == self.bucket:
+            self.unchanged += 1
+            return None
+        return self.send(bucket)
+
+    # Jog the arm by the hand position (x, y, z), the first position after a reset becomes the neutral point
+    def move(self, x, y, z):
+        return self.update((x, y, z), ARM_COMMANDS)
+
+    # Jog the rail by the hand's rail position l
+    def moveRail(self, l):
+        return self.update((l,), RAIL_COMMANDS)
+
+    def send(self, bucket):
+        axis, level = bucket
+        self.bucket = bucket
+        if level == 0:
+            cmd, speed_ratio = dType.JC.JogIdle, 0
+        else:
+            cmd, speed_ratio = self.commands[axis][level < 0], round(100 * abs(level) / self.levels)
+        self.sent += 1
+        future = self.arm_commands.jog(cmd, speed_ratio)
+
+        def done(finished):
+            if not finished.cancelled() and finished.exception() is not None and self.bucket == bucket:
+                self.bucket = None  # Whatever the arm is doing now, the next frame resends its bucket
+        future.add_done_callback(done)
+        return future
+
+    # Stop jogging, a no-op when the arm is known to be standing still
+    def stop(self):
+        if self.bucket == IDLE:
+            return None
+        return self.send(IDLE)
+
+    # Stop and forget the neutral point, the next position sets a new one (tracking toggled, control mode changed)
+    def reset(self):
+        future = self.stop()
+        self.neutral = None
+        return future
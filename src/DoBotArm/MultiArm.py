@@ -0,0 +1,137 @@
+import threading
+from collections import Counter
+from concurrent.futures import Future
+from DoBotArm.CommandDispatcher import CommandDispatcher
+from DoBotArm.coordProcessing import CoordinateProcessing
+from DoBotArm.ShadowState import ShadowArm
+
+# Default settings, overridden by "multi_arm_settings" in config.json. Every entry of "arms" is merged over the
+# "robotic_arms" entry of the same arm_type, so arms of one type only need their own port, e.g.
+#   {"name": "left", "arm_type": "Dobot", "port": "COM3", "offset": [0, 150, 0]}
+DEFAULT_MULTI_ARM_SETTINGS = {
+    "enabled": False,
+    "arms": []
+}
+
+
+# Future for a command sent to several arms: cancelled when every arm's command was dropped, failed when any
+# arm's command failed, otherwise the list of results (None for arms that dropped it)
+def gatherFutures(futures):
+    combined = Future()
+    remaining = [len(futures)]
+    lock = threading.Lock()
+
+    def done(_):
+        with lock:
+            remaining[0] -= 1
+            if remaining[0]:
+                return
+        if all(future.cancelled() for future in futures):
+            combined.cancel()
+            return
+        errors = [future.exception() for future in futures if not future.cancelled() and future.exception() is not None]
+        if errors:
+            combined.set_exception(errors[0])
+        else:
+            combined.set_result([None if future.cancelled() else future.result() for future in futures])
+
+    if not futures:
+        combined.set_result([])
+    for future in futures:
+        future.add_done_callback(done)
+    return combined
+
+
+# One arm of the group: the connected arm, its dispatcher thread and shadow state, its offset from the
+# shared target (x, y, z in mm, for arms standing side by side that should not all reach for the same point)
+# and its own ArmTelemetry (None when the arm's "telemetry" entry is not enabled).
+# The tracker only checks the shared target is reachable, so move_to and rail_move_to check the offset target
+# of this arm again and drop the command (a cancelled future) when it is outside the workspace.
+class ArmSlot:
+    def __init__(self, name, robotic_arm, offset=None, shadow_settings=None):
+        self.name = name
+        self.robotic_arm = robotic_arm
+        self.dispatcher = CommandDispatcher(robotic_arm, name=f"ArmCommandDispatcher-{name}")
+        self.commands = ShadowArm(self.dispatcher, shadow_settings)
+        self.offset = tuple(offset or (0, 0, 0))
+        self.telemetry = getattr(robotic_arm, "telemetry", None)
+        self.unreachable = Counter()  # Commands dropped because the offset target was out of reach, by name
+
+    def offsetTarget(self, x, y, z):
+        return (x + self.offset[0], y + self.offset[1], z + self.offset[2])
+
+    def rejected(self, name):
+        self.unreachable[name] += 1
+        future = Future()
+        future.cancel()
+        return future
+
+    def move_to(self, x, y, z):
+        x, y, z = self.offsetTarget(x, y, z)
+        if not CoordinateProcessing.isPositionValid(2, x, y, z, 0):
+            return self.rejected("move_to")
+        return self.commands.move_to(x, y, z)
+
+    def rail_move_to(self, x, y, z, l, r=0):
+        x, y, z = self.offsetTarget(x, y, z)
+        if not (CoordinateProcessing.isPositionValid(1, x, y, z, l) and CoordinateProcessing.isPositionValid(2, x, y, z, l)):
+            return self.rejected("rail_move_to")
+        return self.commands.rail_move_to(x, y, z, l, r)
+
+
+# Drives several arms at once. Every arm gets its own dispatcher thread (and so its own serial link or DLL
+# connection), so a slow or busy arm never holds up the others. The manager has the same command methods as a
+# (shadowed) dispatcher and sends each command to every arm, so the tracker can use it in place of one; arm(name)
+# gives the slot of a single arm, with its commands (for callers that drive the arms from different hands or
+# cameras) and its telemetry.
+class MultiArmManager:
+    def __init__(self, shadow_settings=None):
+        self.shadow_settings = shadow_settings
+        self.slots = []
+
+    def add(self, name, robotic_arm, offset=None):
+        slot = ArmSlot(name, robotic_arm, offset, self.shadow_settings)
+        self.slots.append(slot)
+        return slot.commands
+
+    def arm(self, name):
+        return next(slot for slot in self.slots if slot.name == name)
+
+    def broadcast(self, name, *args):
+        return gatherFutures([getattr(slot.commands, name)(*args) for slot in self.slots])
+
+    def move_to(self, x, y, z):
+        return gatherFutures([slot.move_to(x, y, z) for slot in self.slots])
+
+    def rail_move_to(self, x, y, z, l, r=0):
+        return gatherFutures([slot.rail_move_to(x, y, z, l, r) for slot in self.slots])
+
+    def enableRail(self, enable):
+        return self.broadcast("enableRail", enable)
+
+    def set_gripper_state(self, state):
+        return self.broadcast("set_gripper_state", state)
+
+    def jog(self, cmd, speed_ratio=100):
+        return self.broadcast("jog", cmd, speed_ratio)
+
+    def setJogParams(self, velocity, acceleration, rail_velocity, rail_acceleration):
+        return self.broadcast("setJogParams", velocity, acceleration, rail_velocity, rail_acceleration)
+
+    # Counters summed over every arm, like a single dispatcher and shadow state report them
+    # (suppressed includes the commands an arm dropped because its offset target was out of reach)
+    def pendingCount(self):
+        return sum(slot.dispatcher.pendingCount() for slot in self.slots)
+
+    @property
+    def coalesced(self):
+        return sum(slot.dispatcher.coalesced for slot in self.slots)
+
+    @property
+    def suppressed(self):
+        return sum((slot.commands.suppressed + slot.unreachable for slot in self.slots), Counter())
+
+    # Stop every dispatcher (the ones not stopped yet keep working through their queues meanwhile)
+    def stop(self, timeout=2.0):
+        for slot in self.slots:
+            slot.dispatcher.stop(timeout)
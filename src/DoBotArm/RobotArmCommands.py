@@ -18,6 +18,10 @@ class RobotArmInterface:
         """Move the arm to a specified position."""
         raise NotImplementedError
 
+    def jog(self, cmd, speed_ratio=100):
+        """Jog the arm with a JOG command at a share of the JOG velocities."""
+        raise NotImplementedError
+
     def set_gripper_state(self, state):
         """Set the gripper state (open/close)."""
         raise NotImplementedError
@@ -38,7 +42,11 @@ def load_robotic_arm(config_path="config.json"):
 
     arm_type = config["arm_type"]
     if arm_type == "Dobot":
-        return DobotArm()
+        return DobotArm(backend=config.get("backend"), retry_policy=config.get("retry_policy"),
+                        streaming=config.get("cp_streaming"), telemetry=config.get("telemetry"))
+    elif arm_type == "SimulatedDobot":
+        return DobotArm(backend="sim", streaming=config.get("cp_streaming"), telemetry=config.get("telemetry"),
+                        simulation=config.get("simulation"))
     # Add other arm types here as needed
     else:
         raise ValueError(f"Unsupported arm type: {arm_type}")
\ No newline at end of file
@@ -0,0 +1,111 @@
+import math
+import threading
+from collections import Counter
+from concurrent.futures import Future
+
+# Default settings, overridden by "shadow_settings" in config.json
+DEFAULT_SHADOW_SETTINGS = {
+    "enabled": True,
+    "deadband_mm": 2.0,       # Arm targets closer than this to the last one sent are dropped
+    "rail_deadband_mm": 2.0   # Same for the rail position of rail_move_to
+}
+
+
+# Sits in front of the command dispatcher and remembers what was last sent to the arm: the rail mode, the gripper
+# state, the arm target and the rail target. Commands that would not change anything (same mode or gripper state,
+# a target within the deadband of the last one) are dropped before they reach the serial link.
+#
+# Dropped commands return an already cancelled Future, like commands the dispatcher coalesces. A command that fails
+# forgets the state it was setting, and so does one whose result is False (the arm did not act on it, e.g. a target
+# the CP streamer did not queue). Commands that clear the controller queue (rail mode, gripper) forget the motion
+# targets, so the next command of that kind is always sent.
+class ShadowArm:
+    def __init__(self, arm_commands, settings=None):
+        merged = dict(DEFAULT_SHADOW_SETTINGS)
+        merged.update(settings or {})
+        self.arm_commands = arm_commands
+        self.enabled = merged["enabled"]
+        self.deadband = merged["deadband_mm"]
+        self.rail_deadband = merged["rail_deadband_mm"]
+
+        self.lock = threading.Lock()  # Failed commands clear their state from the dispatcher thread
+        self.state = {"rail": None, "gripper": None, "arm_target": None, "rail_target": None}
+        self.suppressed = Counter()   # Dropped commands by name
+        self.forwarded = Counter()
+
+    def __getattr__(self, name):
+        return getattr(self.arm_commands, name)
+
+    def dropped(self, name):
+        self.suppressed[name] += 1
+        future = Future()
+        future.cancel()
+        return future
+
+    # Send the command and remember value under key, forgetting it again if the command fails or reports False
+    def forward(self, name, key, value, *args):
+        with self.lock:
+            self.state[key] = value
+        self.forwarded[name] += 1
+        future = getattr(self.arm_commands, name)(*args)
+
+        def done(finished):
+            if finished.cancelled():
+                return
+            failed = finished.exception() is not None
+            if not failed and finished.result() is not False:
+                return
+            with self.lock:
+                if self.state[key] == value:
+                    self.state[key] = None
+                    if failed and key in ("arm_target", "rail_target"):
+                        # Where a failed move left the arm is unknown
+                        self.state["arm_target"] = None
+                        self.state["rail_target"] = None
+        future.add_done_callback(done)
+        return future
+
+    def forgetTargets(self):
+        with self.lock:
+            self.state["arm_target"] = None
+            self.state["rail_target"] = None
+
+    def move_to(self, x, y, z):
+        target = (x, y, z)
+        if self.enabled:
+            last = self.state["arm_target"]
+            if last is not None and math.dist(last, target) < self.deadband:
+                return self.dropped("move_to")
+        with self.lock:
+            self.state["rail_target"] = None  # The arm moved away from where rail_move_to put it
+        return self.forward("move_to", "arm_target", target, x, y, z)
+
+    def rail_move_to(self, x, y, z, l, r=0):
+        target = (x, y, z, l, r)
+        if self.enabled:
+            last = self.state["rail_target"]
+            if (last is not None and last[4] == r and math.dist(last[:3], target[:3]) < self.deadband
+                    and abs(last[3] - l) < self.rail_deadband):
+                return self.dropped("rail_move_to")
+        with self.lock:
+            self.state["arm_target"] = (x, y, z)
+        return self.forward("rail_move_to", "rail_target", target, x, y, z, l, r)
+
+    def enableRail(self, enable):
+        if self.enabled and self.state["rail"] == bool(enable):
+            return self.dropped("enableRail")
+        self.forgetTargets()
+        return self.forward("enableRail", "rail", bool(enable), enable)
+
+    def set_gripper_state(self, state):
+        if self.enabled and self.state["gripper"] == bool(state):
+            return self.dropped("set_gripper_state")
+        self.forgetTargets()
+        return self.forward("set_gripper_state", "gripper", bool(state), state)
+
+    # Jog commands are only sent when their speed bucket changes already (see JogControl), they are not filtered
+    # again here, but they move the arm away from any remembered target
+    def jog(self, cmd, speed_ratio=100):
+        self.forgetTargets()
+        self.forwarded["jog"] += 1
+        return self.arm_commands.jog(cmd, speed_ratio)
@@ -0,0 +1,400 @@
+import math
+import random
+import threading
+import time
+from collections import Counter, deque
+from DoBotArm import DobotDllType as dType
+from DoBotArm.DobotArm import HOME_POSE
+
+# Default simulation settings, overridden by the arm's "simulation" entry in config.json
+DEFAULT_SIMULATION_SETTINGS = {
+    "latency_ms": 10.0,         # Round trip of one command over the serial link (115200 baud USB serial)
+    "jitter_ms": 4.0,           # Uniform +/- jitter added to every round trip
+    "ptp_velocity": 200.0,      # mm/s at 100% PTP velocity ratio
+    "ptp_acceleration": 400.0,  # mm/s^2 at 100% PTP acceleration ratio
+    "cp_acceleration": 200.0,   # mm/s^2, CP moves that do not blend into a queued CP move start from rest
+    "rail_velocity": 100.0,     # mm/s
+    "seed": None                # Fix the jitter sequence for reproducible benchmarks
+}
+
+# Magician geometry and joint limits (degrees), same arm lengths as CoordinateProcessing.isPositionValid
+L1 = 135  # Rear arm
+L2 = 147  # Forearm
+JOINT_LIMITS = {
+    "J1": (-90, 90),   # Base rotation
+    "J2": (0, 85),     # Rear arm, from vertical
+    "J3": (-10, 90),   # Forearm, below horizontal
+}
+RAIL_LIMITS = (0, 1000)
+DEVICE_VERSION = (3, 1, 0)
+JOG_RANGE = 500  # mm, furthest a single JOG command is followed before the simulation stops it
+
+
+class SimulatedDobotError(Exception):
+    pass
+
+
+# Raised (and latched in the alarm state) when a target is outside the arm's joint limits, like the controller's limit alarm
+class JointLimitError(SimulatedDobotError):
+    pass
+
+
+# Joint angles (J1, J2, J3) in degrees for a cartesian target, None when no arm configuration reaches it
+def inverseKinematics(x, y, z):
+    j1 = math.degrees(math.atan2(y, x))
+    distance = math.hypot(math.hypot(x, y), z)
+    if not abs(L1 - L2) < distance < L1 + L2:
+        return None
+
+    elevation = math.atan2(z, math.hypot(x, y))
+    shoulder = math.acos((L1 ** 2 + distance ** 2 - L2 ** 2) / (2 * L1 * distance))
+    elbow = math.acos((L1 ** 2 + L2 ** 2 - distance ** 2) / (2 * L1 * L2))
+    rear_arm = elevation + shoulder  # Rear arm angle above horizontal
+    j2 = 90 - math.degrees(rear_arm)
+    j3 = math.degrees(math.pi - elbow - rear_arm)
+    return (j1, j2, j3)
+
+
+def checkJointLimits(x, y, z):
+    joints = inverseKinematics(x, y, z)
+    if joints is None:
+        raise JointLimitError(f"Target ({x:.1f}, {y:.1f}, {z:.1f}) is out of reach")
+    for name, angle in zip(("J1", "J2", "J3"), joints):
+        low, high = JOINT_LIMITS[name]
+        if not low <= angle <= high:
+            raise JointLimitError(f"Target ({x:.1f}, {y:.1f}, {z:.1f}) needs {name}={angle:.1f} outside [{low}, {high}]")
+    return joints
+
+
+# One motion from start to target over [begin, begin + duration), pose is interpolated linearly along it
+class Motion:
+    __slots__ = ("index", "kind", "start", "target", "begin", "duration")
+
+    def __init__(self, index, kind, start, target, begin, duration):
+        self.index = index        # Queued command index, 0 for immediate commands
+        self.kind = kind          # "cp", "ptp" or "jog"
+        self.start = start        # (x, y, z, r, l)
+        self.target = target
+        self.begin = begin
+        self.duration = duration
+
+    def poseAt(self, now):
+        if self.duration <= 0:
+            return list(self.target)
+        share = min(max((now - self.begin) / self.duration, 0.0), 1.0)
+        return [a + (b - a) * share for a, b in zip(self.start, self.target)]
+
+
+# Controller side of the simulation: the command queue, motion timing, gripper, rail and alarms.
+# Follows the Magician's semantics closely enough for the tracking code:
+#   - isQueued=1 commands are appended to the queue and executed in order, they return their queue index
+#   - isQueued=0 motions abort whatever motion is running and start from the current pose straight away
+#   - SetQueuedCmdClear drops every command still waiting in the queue (the running motion finishes)
+#   - CP moves queued back to back blend at their commanded velocity, any other CP move (immediate, or after
+#     the queue ran dry) first has to accelerate; PTP moves accelerate and stop at the target
+#   - targets outside the joint limits are rejected with JointLimitError and latch an alarm
+#   - JOG commands move one axis at constant velocity until JogIdle, another motion or the axis limit stops them
+# Time is evaluated lazily from time.monotonic(), nothing runs in the background.
+class SimulatedController:
+    def __init__(self, settings=None):
+        merged = dict(DEFAULT_SIMULATION_SETTINGS)
+        merged.update(settings or {})
+        self.ptp_velocity = merged["ptp_velocity"]
+        self.ptp_acceleration = merged["ptp_acceleration"]
+        self.cp_acceleration = merged["cp_acceleration"]
+        self.rail_velocity = merged["rail_velocity"]
+
+        self.lock = threading.RLock()
+        self.pose = [HOME_POSE[0], HOME_POSE[1], HOME_POSE[2], -90.0, 0.0]  # x, y, z, r, l
+        self.motion = None
+        self.queue = deque()        # (index, kind, args, enqueued)
+        self.last_index = 0         # Index handed to the most recent queued command
+        self.current_index = 0      # Index of the most recently finished queued command
+        self.idle_since = time.monotonic()
+        self.cp_end = None          # When the last CP motion finished, a queued CP motion starting then blends into it
+
+        self.ptp_ratios = (100, 100)
+        self.jog_velocities = (15.0, 15.0, 15.0, 15.0)  # x, y, z, r mm/s at a 100% ratio (controller defaults)
+        self.jog_rail_velocity = 15.0
+        self.jog_ratio = 100
+        self.rail_enabled = False
+        self.gripper = (0, 0)       # (enableCtrl, on)
+        self.alarms = set()
+        self.faults = 0
+        self.cp_restarts = 0        # CP motions that had to start from rest (stop-and-go)
+
+    # Finish every motion whose time is up and start the queued commands behind it
+    def advance(self, now=None):
+        if now is None:
+            now = time.monotonic()
+        while True:
+            if self.motion is not None:
+                end = self.motion.begin + self.motion.duration
+                if now < end:
+                    return
+                self.pose = list(self.motion.target)
+                if self.motion.index:
+                    self.current_index = self.motion.index
+                self.cp_end = end if self.motion.kind == "cp" else None
+                self.motion = None
+                self.idle_since = end
+            if not self.queue:
+                return
+            index, kind, args, enqueued = self.queue.popleft()
+            self.execute(kind, args, max(self.idle_since, enqueued), index)
+
+    def poseAt(self, now):
+        return self.motion.poseAt(now) if self.motion is not None else list(self.pose)
+
+    # Where the arm will be once everything sent so far has run, new targets keep its r and rail position
+    def plannedPose(self):
+        for _, kind, args, _ in reversed(self.queue):
+            if kind in ("cp", "ptp"):
+                return args[0]
+        if self.motion is not None and self.motion.kind == "jog":
+            return self.poseAt(time.monotonic())  # The next command stops the jog wherever it has got to
+        return self.motion.target if self.motion is not None else self.pose
+
+    # Travel time for a move between two poses
+    def duration(self, kind, start, target, velocity, blended=False):
+        distance = math.dist(start[:3], target[:3])
+        if kind == "cp":
+            arm_time = distance / velocity if velocity > 0 else 0.0
+            if not blended and distance > 0 and velocity > 0:
+                arm_time += velocity / (2 * self.cp_acceleration)  # Time lost getting up to speed
+        else:
+            velocity = self.ptp_velocity * self.ptp_ratios[0] / 100
+            acceleration = self.ptp_acceleration * self.ptp_ratios[1] / 100
+            if distance < velocity ** 2 / acceleration:
+                arm_time = 2 * math.sqrt(distance / acceleration)  # Never reaches full speed
+            else:
+                arm_time = distance / velocity + velocity / acceleration
+        rail_time = abs(target[4] - start[4]) / self.rail_velocity
+        return max(arm_time, rail_time)
+
+    # kind is "cp" or "ptp" for motions, anything else completes instantly ("gripper" also sets the gripper)
+    def execute(self, kind, args, begin, index=0):
+        if kind not in ("cp", "ptp"):
+            if kind == "gripper":
+                self.gripper = args
+            if index:
+                self.current_index = index
+            self.idle_since = begin
+            return
+        target, velocity = args
+        blended = kind == "cp" and self.motion is None and self.cp_end == begin
+        if kind == "cp" and not blended:
+            self.cp_restarts += 1
+        start = self.poseAt(begin)
+        self.pose = start
+        self.motion = Motion(index, kind, start, target, begin, self.duration(kind, start, target, velocity, blended))
+
+    def submit(self, kind, args, isQueued):
+        now = time.monotonic()
+        self.advance(now)
+        if isQueued:
+            self.last_index += 1
+            self.queue.append((self.last_index, kind, args, now))
+            self.advance(now)
+            return self.last_index
+        self.execute(kind, args, now)
+        return 0
+
+    def fault(self, error):
+        self.faults += 1
+        self.alarms.add(type(error).__name__)
+        raise error
+
+    def motionTarget(self, x, y, z, r, l):
+        try:
+            checkJointLimits(x, y, z)
+            if not RAIL_LIMITS[0] <= l <= RAIL_LIMITS[1]:
+                raise JointLimitError(f"Rail target {l:.1f} outside [{RAIL_LIMITS[0]}, {RAIL_LIMITS[1]}]")
+        except JointLimitError as e:
+            self.fault(e)
+        return (x, y, z, r, l)
+
+    # ---- Commands, named and shaped like their DobotDllType counterparts ----
+
+    def SetQueuedCmdClear(self):
+        with self.lock:
+            self.advance()
+            self.queue.clear()
+
+    # Accepted without changing the simulation
+    def SetHOMEParams(self, x, y, z, r, isQueued=0):
+        return [0]
+
+    def SetCPCommonParams(self, velocityRatio, accelerationRatio, isQueued=0):
+        return [0]
+
+    def SetCPRHoldEnable(self, isEnable):
+        return [0]
+
+    def SetQueuedCmdStartExec(self):
+        pass
+
+    def SetQueuedCmdStop(self):
+        pass
+
+    def GetDeviceVersion(self):
+        return list(DEVICE_VERSION)
+
+    def SetPTPCommonParams(self, velocityRatio, accelerationRatio, isQueued=0):
+        with self.lock:
+            self.ptp_ratios = (velocityRatio, accelerationRatio)
+            return [0]
+
+    def SetJOGCoordinateParams(self, xVelocity, xAcceleration, yVelocity, yAcceleration, zVelocity, zAcceleration, rVelocity, rAcceleration, isQueued=0):
+        with self.lock:
+            self.jog_velocities = (xVelocity, yVelocity, zVelocity, rVelocity)
+            return [0]
+
+    def SetJOGLParams(self, velocity, acceleration, isQueued=0):
+        with self.lock:
+            self.jog_rail_velocity = velocity
+            return [0]
+
+    def SetJOGCommonParams(self, value_velocityratio, value_accelerationratio, isQueued=0):
+        with self.lock:
+            self.jog_ratio = value_velocityratio
+            return [0]
+
+    # Cartesian JOG (isJoint=0) only, acceleration is ignored: jogs start and stop at once
+    def SetJOGCmd(self, isJoint, cmd, isQueued=0):
+        with self.lock:
+            now = time.monotonic()
+            self.advance(now)
+            start = self.poseAt(now)
+            self.pose = start
+            self.motion = None
+            self.idle_since = now
+            if cmd == dType.JC.JogIdle:
+                return [0]
+
+            axis = (cmd - 1) // 2  # x, y, z, r, l like the pose
+            sign = 1 if cmd % 2 else -1
+            if axis == 4:
+                if not self.rail_enabled:
+                    self.fault(SimulatedDobotError("Rail JOG sent while the linear rail is disabled"))
+                velocity = self.jog_rail_velocity
+            else:
+                velocity = self.jog_velocities[axis]
+            velocity *= self.jog_ratio / 100
+
+            # Follow the axis in 1 mm steps up to the first pose outside the limits, where the arm would stop
+            target = list(start)
+            for step in range(1, JOG_RANGE + 1):
+                candidate = list(start)
+                candidate[axis] += sign * step
+                if axis == 4:
+                    if not RAIL_LIMITS[0] <= candidate[4] <= RAIL_LIMITS[1]:
+                        break
+                elif axis < 3:
+                    try:
+                        checkJointLimits(*candidate[:3])
+                    except JointLimitError:
+                        break
+                target = candidate
+            distance = abs(target[axis] - start[axis])
+            self.motion = Motion(0, "jog", start, tuple(target), now, distance / velocity if velocity > 0 else 0.0)
+            return [0]
+
+    def SetCPCmd(self, cpMode, x, y, z, velocity, isQueued=0):
+        with self.lock:
+            self.advance()
+            planned = self.plannedPose()
+            if cpMode == dType.ContinuousPathMode.CPRelativeMode:
+                # Relative to wherever the previous command leaves the arm
+                x, y, z = planned[0] + x, planned[1] + y, planned[2] + z
+            target = self.motionTarget(x, y, z, planned[3], planned[4])
+            return [self.submit("cp", (target, velocity), isQueued)]
+
+    def SetPTPCmd(self, ptpMode, x, y, z, rHead, isQueued=0):
+        with self.lock:
+            self.advance()
+            target = self.motionTarget(x, y, z, rHead, self.plannedPose()[4])
+            return [self.submit("ptp", (target, 0), isQueued)]
+
+    def SetPTPWithLCmd(self, ptpMode, x, y, z, rHead, l, isQueued=0):
+        with self.lock:
+            if not self.rail_enabled:
+                self.fault(SimulatedDobotError("SetPTPWithLCmd sent while the linear rail is disabled"))
+            target = self.motionTarget(x, y, z, rHead, l)
+            return [self.submit("ptp", (target, 0), isQueued)]
+
+    def SetDeviceWithL(self, isWithL, version=0, isQueued=0):
+        with self.lock:
+            self.rail_enabled = bool(isWithL)
+            return [0]
+
+    def SetEndEffectorGripper(self, enableCtrl, on, isQueued=0):
+        with self.lock:
+            return [self.submit("gripper", (enableCtrl, on), isQueued)]
+
+    def GetPose(self):
+        with self.lock:
+            self.advance()
+            x, y, z, r, _ = self.poseAt(time.monotonic())
+            return [x, y, z, r] + list(inverseKinematics(x, y, z) or (0.0, 0.0, 0.0)) + [0.0]
+
+    def GetPoseL(self):
+        with self.lock:
+            self.advance()
+            return [self.poseAt(time.monotonic())[4]]
+
+    def GetQueuedCmdCurrentIndex(self):
+        with self.lock:
+            self.advance()
+            return [self.current_index]
+
+    def GetAlarmsState(self):
+        with self.lock:
+            return sorted(self.alarms)
+
+    def ClearAllAlarmsState(self):
+        with self.lock:
+            self.alarms.clear()
+
+
+# createLink("sim") backend: gives DobotArm the same call surface as DllLink and the serial driver, backed by a
+# SimulatedController, so the tracking pipeline runs and can be load tested on the real DobotArm code without hardware.
+# Every command costs one simulated serial round trip.
+class SimulatedLink:
+    def __init__(self, settings=None):
+        merged = dict(DEFAULT_SIMULATION_SETTINGS)
+        merged.update(settings or {})
+        self.latency = merged["latency_ms"] / 1000
+        self.jitter = merged["jitter_ms"] / 1000
+        self.random = random.Random(merged["seed"])
+        self.settings = merged
+
+        self.controller = None
+        self.command_counts = Counter()  # Commands sent, by DobotDllType name
+        self.link_time = 0.0             # Total seconds spent waiting on the simulated serial link
+        self.link_lock = threading.Lock() # One serial link, commands from other threads (telemetry) wait their turn
+
+    # One command round trip: wait out the serial latency, then let the controller handle it
+    def transact(self, name, *args, **kwargs):
+        with self.link_lock:
+            delay = max(self.latency + self.random.uniform(-self.jitter, self.jitter), 0.0)
+            time.sleep(delay)
+            self.link_time += delay
+            self.command_counts[name] += 1
+            return getattr(self.controller, name)(*args, **kwargs)
+
+    def connect(self, port, baudrate):
+        self.controller = SimulatedController(self.settings)
+        print(f"Simulated Dobot link ({self.latency * 1000:.0f} ms +/- {self.jitter * 1000:.0f} ms per command).")
+        return True
+
+    # The controller stays in place, commands sent after disconnecting (atexit handlers) still get an answer
+    def disconnect(self):
+        if self.controller is not None:
+            print(f"Simulated Dobot link closed after {sum(self.command_counts.values())} commands "
+                  f"({self.link_time:.2f} s on the link, {self.controller.faults} faults).")
+
+    def __getattr__(self, name):
+        if name.startswith("__") or not hasattr(SimulatedController, name):
+            raise AttributeError(name)
+        return lambda *args, **kwargs: self.transact(name, *args, **kwargs)
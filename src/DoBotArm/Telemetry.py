@@ -0,0 +1,153 @@
+import threading
+import time
+from collections import deque
+
+# Default telemetry settings, overridden by the arm's "telemetry" entry in config.json
+DEFAULT_TELEMETRY_SETTINGS = {
+    "enabled": False,
+    "rate_hz": 10.0,       # Samples per second, every sample costs 2-3 serial round trips shared with the arm commands
+    "history": 100,        # Samples kept in the ring buffer
+    "rail": False,         # Also sample the linear rail position (GetPoseL)
+    "alarm_interval": 5    # Read the alarms every this many samples, they rarely change
+}
+
+
+# One reading of the arm's state. timestamp is time.time() halfway through the reads, the same clock as the
+# camera capture times, so frames can look up the state at their capture time.
+class TelemetrySample:
+    __slots__ = ("timestamp", "pose", "rail", "queue_index", "alarms")
+
+    def __init__(self, timestamp, pose, rail, queue_index, alarms):
+        self.timestamp = timestamp
+        self.pose = pose                # (x, y, z, r)
+        self.rail = rail                # Rail position, None when the rail is not sampled
+        self.queue_index = queue_index  # Last finished queued command
+        self.alarms = alarms            # Active alarm bits (alarm names on the simulated arm), () when clear
+
+    def __repr__(self):
+        return (f"TelemetrySample(t={self.timestamp:.3f}, pose={self.pose}, rail={self.rail}, "
+                f"queue_index={self.queue_index}, alarms={self.alarms})")
+
+
+# Alarm bits set in a GetAlarmsState result, the simulated arm already returns a list of alarm names
+def activeAlarms(state):
+    if not state or not isinstance(state[0], (bytes, bytearray)):
+        return tuple(state or ())
+    data, length = state
+    return tuple(bit for bit in range(length * 8) if data[bit // 8] >> (bit % 8) & 1)
+
+
+def interpolate(a, b, share):
+    return tuple(x + (y - x) * share for x, y in zip(a, b))
+
+
+# Samples GetPose, GetPoseL, GetQueuedCmdCurrentIndex and GetAlarmsState on its own thread into a ring buffer,
+# so the tracking loop, overlay, logging and safety checks can read the arm's state without any serial I/O.
+# Readers get the latest sample or one interpolated to a given time; nothing blocks on the link but this thread.
+#
+# call(name, *args) runs one DobotDllType-style command on the arm's link (the link must allow calls from
+# another thread than the command dispatcher's, the DLL wrappers and the serial driver both do)
+class ArmTelemetry:
+    def __init__(self, call, settings=None):
+        merged = dict(DEFAULT_TELEMETRY_SETTINGS)
+        merged.update(settings or {})
+        self.call = call
+        self.interval = 1 / max(merged["rate_hz"], 1e-3)
+        self.sample_rail = merged["rail"]
+        self.alarm_interval = max(int(merged["alarm_interval"]), 1)
+
+        self.samples = deque(maxlen=max(int(merged["history"]), 2))
+        self.lock = threading.Lock()
+        self.alarms = ()
+        self.reads = 0         # Samples taken
+        self.errors = 0        # Samples lost to a failed read
+        self.last_error = None
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        if self.thread is not None:
+            return self
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name="ArmTelemetry", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self, timeout=1.0):
+        self.running = False
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join(timeout)
+        self.thread = None
+
+    # Take one sample, run by the telemetry thread (or directly when no thread is running)
+    def sample(self):
+        before = time.time()
+        pose = tuple(self.call("GetPose")[:4])
+        rail = self.call("GetPoseL")[0] if self.sample_rail else None
+        queue_index = self.call("GetQueuedCmdCurrentIndex")[0]
+        if self.reads % self.alarm_interval == 0:
+            self.alarms = activeAlarms(self.call("GetAlarmsState"))
+        sample = TelemetrySample((before + time.time()) / 2, pose, rail, queue_index, self.alarms)
+        with self.lock:
+            self.samples.append(sample)
+        self.reads += 1
+        return sample
+
+    def run(self):
+        next_sample = time.perf_counter()
+        while self.running:
+            try:
+                self.sample()
+            except Exception as e:
+                if self.last_error is None:
+                    print(f"Arm telemetry read failed: {e}")
+                self.errors += 1
+                self.last_error = e
+            else:
+                self.last_error = None
+
+            next_sample += self.interval
+            delay = next_sample - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_sample = time.perf_counter()  # Fell behind (slow link), sample as often as it allows
+
+    # Newest sample, None when there is none or it is older than max_age seconds
+    def latest(self, max_age=None):
+        with self.lock:
+            sample = self.samples[-1] if self.samples else None
+        if sample is not None and max_age is not None and time.time() - sample.timestamp > max_age:
+            return None
+        return sample
+
+    # Last finished queued command index as of the newest sample, None before the first one
+    def queueIndex(self):
+        sample = self.latest()
+        return None if sample is None else sample.queue_index
+
+    # State at timestamp (time.time()), pose and rail interpolated between the samples around it. Times outside
+    # the buffer get the oldest or newest sample, nothing is extrapolated.
+    def at(self, timestamp):
+        with self.lock:
+            after = None
+            for sample in reversed(self.samples):  # Usually asked for recent times, so search from the newest
+                if sample.timestamp <= timestamp:
+                    break
+                after = sample
+            else:
+                return after  # Older than everything kept (or the buffer is empty)
+        if after is None:
+            return sample
+        share = (timestamp - sample.timestamp) / (after.timestamp - sample.timestamp)
+        rail = None if sample.rail is None or after.rail is None else sample.rail + (after.rail - sample.rail) * share
+        return TelemetrySample(timestamp, interpolate(sample.pose, after.pose, share), rail,
+                               sample.queue_index, sample.alarms)
+
+    # Copy of the samples kept, oldest first, optionally only those newer than since
+    def history(self, since=None):
+        with self.lock:
+            samples = list(self.samples)
+        if since is None:
+            return samples
+        return [sample for sample in samples if sample.timestamp > since]
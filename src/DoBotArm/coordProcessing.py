@@ -1,7 +1,51 @@
 import math, time
+from collections import namedtuple
+from itertools import chain
+from operator import attrgetter
+import numpy as np
 
 WRIST_IDX = 0
 MID_KNUCKLE_IDX = 9
+RING_KNUCKLE_IDX = 13
+NUM_LANDMARKS = 21
+
+LANDMARK_XYZ = attrgetter("x", "y", "z")
+
+# Stand-in for a MediaPipe landmark, for landmarks read back from a session recording
+Landmark = namedtuple("Landmark", ("x", "y", "z"))
+
+# The per-frame helpers below read the few landmarks they need straight from the MediaPipe landmark list,
+# a (21, 3) array is only built when a session is recorded
+
+# Unpacks a MediaPipe landmark list into a (21, 3) float32 array of normalized x, y, z (the recording format).
+# Pass out to reuse a preallocated array instead of allocating a new one every frame.
+def landmarksToArray(landmarks, out=None):
+    # The 63 attribute reads are most of the cost, attrgetter and fromiter keep them out of the interpreter loop
+    values = np.fromiter(chain.from_iterable(map(LANDMARK_XYZ, landmarks)), dtype=np.float32, count=NUM_LANDMARKS * 3)
+    if out is None:
+        return values.reshape(NUM_LANDMARKS, 3)
+    out.reshape(-1)[:] = values
+    return out
+
+# Landmark list for a recorded (21, 3) array, so replays run the same helpers as the tracker
+def arrayToLandmarks(points):
+    return [Landmark(*row) for row in points.tolist()]
+
+# Palm position in pixel coordinates, the average of the wrist, middle knuckle and ring knuckle
+def palmCentroid(landmarks, pix_w, pix_h):
+    wrist, knuckle, ring = landmarks[WRIST_IDX], landmarks[MID_KNUCKLE_IDX], landmarks[RING_KNUCKLE_IDX]
+    return ((wrist.x + knuckle.x + ring.x) / 3 * pix_w, (wrist.y + knuckle.y + ring.y) / 3 * pix_h)
+
+# Maps the palm's pixel position to Dobot coordinates, returns (dobot_x, dobot_y, lineaRail_x)
+# where lineaRail_x is the 0-1 position along the linear rail
+def palmToDobot(palm_x, palm_y, pix_w, pix_h):
+    invertedY = pix_h - palm_y # Invert Y because 0 Y is top of the camera
+    invertedX = pix_w - palm_x # Invert X because 0 X is left of the camera
+    normalPalm_x = invertedX / pix_w
+    lineaRail_x = palm_x / pix_w # linearRail x value will be different than an invertedX
+    dobot_x = (normalPalm_x * 760) - 380 # Translate into a +/- 380 x-axis
+    dobot_y = ((invertedY / pix_h) * 516) - 16 # Translate into a +500/-16 y-axis
+    return (dobot_x, dobot_y, lineaRail_x)
 
 # Various coordinate processing functions
 class CoordinateProcessing:
@@ -9,10 +53,8 @@ class CoordinateProcessing:
     # Determines z axis position (depth perception relative to the camera)
     def determineZCoord(landmarks):
         # Calculate distance between wrist and middle knuckle
-        distance = math.sqrt(
-            (landmarks[MID_KNUCKLE_IDX].x - landmarks[WRIST_IDX].x) ** 2 +
-            (landmarks[MID_KNUCKLE_IDX].y - landmarks[WRIST_IDX].y) ** 2
-        )
+        distance = math.hypot(landmarks[MID_KNUCKLE_IDX].x - landmarks[WRIST_IDX].x,
+                              landmarks[MID_KNUCKLE_IDX].y - landmarks[WRIST_IDX].y)
 
         # Normalize distance (Assume typical hand distance falls within [0.3, 0.5])
         min_distance = 0.3  # Adjust based on calibration
@@ -78,27 +120,27 @@ class CoordinateProcessing:
 class HandPhysics:
     def __init__(self):
         self.previous_position = None
-        self.previous_velocity = (0, 0, 0)
+        self.previous_velocity = np.zeros(3)
         self.previous_time = None
 
     # Calculate velocity & acceleration of the hand on camera
-    def calculatePhysics(self, current_position):
-        current_time = time.time()
+    # current_time defaults to now, replays pass the recorded timestamp instead
+    def calculatePhysics(self, current_position, current_time=None):
+        if current_time is None:
+            current_time = time.time()
+        current_position = np.asarray(current_position, dtype=np.float64)
 
         if self.previous_position is None:
             self.previous_position = current_position
             self.previous_time = current_time
-            return (0, 0, 0), (0, 0, 0)
+            return np.zeros(3), np.zeros(3)
 
         delta_time = current_time - self.previous_time
+        if delta_time <= 0:  # Two samples with the same timestamp carry no motion information
+            return self.previous_velocity, np.zeros(3)
 
-        velocity = tuple(
-            (c - p) / delta_time for c, p in zip(current_position, self.previous_position)
-        )
-
-        acceleration = tuple(
-            (v - pv) / delta_time for v, pv in zip(velocity, self.previous_velocity)
-        )
+        velocity = (current_position - self.previous_position) / delta_time
+        acceleration = (velocity - self.previous_velocity) / delta_time
 
         self.previous_position = current_position
         self.previous_velocity = velocity
@@ -107,19 +149,15 @@ class HandPhysics:
         return velocity, acceleration
 
     # Predict next hand coordinates based on calculated velocity & acceleration
-    def predictNextPosition(self, current_position, time_interval):
-        velocity, acceleration = self.calculatePhysics(current_position)
+    def predictNextPosition(self, current_position, time_interval, current_time=None):
+        velocity, acceleration = self.calculatePhysics(current_position, current_time)
 
-        speed = math.sqrt(velocity[0]**2 + velocity[1]**2 + velocity[2]**2)
-        print("Speed: ", speed)
+        speed = float(np.linalg.norm(velocity))
 
         # If movement is minimum so don't move dobot - trying to adjust for unsteady hand
         if speed <= 60:
-            return current_position
+            return np.asarray(current_position, dtype=np.float64)  # Same type as a prediction, callers index or .tolist() it
 
         # Predict next position
-        next_position = tuple(
-            c + v * time_interval + 0.5 * a * (time_interval ** 2)
-            for c, v, a in zip(current_position, velocity, acceleration)
-        )
-        return next_position
\ No newline at end of file
+        next_position = np.asarray(current_position) + velocity * time_interval + 0.5 * acceleration * (time_interval ** 2)
+        return next_position
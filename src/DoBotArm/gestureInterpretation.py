@@ -1,4 +1,6 @@
 import math
+import time
+from collections import Counter, deque
 
 THUMB_IDX = 4
 THUMB_KNUCKLE_IDX = 3
@@ -14,10 +16,16 @@ PINKY_KNUCKLE_BIDX = 17
 WRIST_IDX = 0
 MID_KNUCKLE_IDX = 9
 RING_KNUCKLE_IDX = 13
-GESTURE_UPDATE_INTERVAL = 10
 THRESHOLD = 0.1
 
+# Time based gesture debouncing (milliseconds, independent of camera FPS)
+GESTURE_WINDOW_MS = 300     # Sliding window of per-frame classifications that gets majority voted
+GESTURE_HOLD_MS = 150       # How long a new majority must hold before it is accepted
+GESTURE_MIN_SHARE = 0.6     # Fraction of the window the majority gesture must cover
+
+
 # *** Hand Gestures & Interpretations ***
+# landmarks is the hand's MediaPipe landmark list (or coordProcessing.arrayToLandmarks of a recorded frame)
 def interpretHandGest(landmarks):
     (first, middle, ring, pinky, thumb) = determineFingers(landmarks)
 
@@ -42,16 +50,14 @@ def printFingers(first, middle, ring, pinky, thumb):
           "\nThumb: ", thumb)
 
 def determineFingers(landmarks):
-    is_index_finger_open = (abs(landmarks[INDEX_FINGER_IDX].y - landmarks[INDEX_KNUCKLE_BIDX].y)) > THRESHOLD
-    is_middle_finger_open = (abs(landmarks[MID_FINGER_IDX].y - landmarks[MID_KNUCKLE_BIDX].y)) > THRESHOLD
-    is_ring_finger_open = (abs(landmarks[RING_FINGER_IDX].y - landmarks[RING_KNUCKLE_BIDX].y)) > THRESHOLD
-
-    is_pinky_finger_open = (abs(landmarks[PINKY_FINGER_IDX].y - landmarks[PINKY_KNUCKLE_BIDX].y)) > THRESHOLD+0.04
+    # A finger is open when its tip is far enough (vertically) from its base knuckle
+    is_index_finger_open = abs(landmarks[INDEX_FINGER_IDX].y - landmarks[INDEX_KNUCKLE_BIDX].y) > THRESHOLD
+    is_middle_finger_open = abs(landmarks[MID_FINGER_IDX].y - landmarks[MID_KNUCKLE_BIDX].y) > THRESHOLD
+    is_ring_finger_open = abs(landmarks[RING_FINGER_IDX].y - landmarks[RING_KNUCKLE_BIDX].y) > THRESHOLD
+    is_pinky_finger_open = abs(landmarks[PINKY_FINGER_IDX].y - landmarks[PINKY_KNUCKLE_BIDX].y) > THRESHOLD+0.04
 
-    is_thumb_open = (abs(
-            math.hypot(landmarks[THUMB_KNUCKLE_IDX].x - landmarks[INDEX_KNUCKLE_BIDX].x,
-                       landmarks[THUMB_KNUCKLE_IDX].y - landmarks[INDEX_KNUCKLE_BIDX].y))
-            > THRESHOLD-0.02)
+    is_thumb_open = math.hypot(landmarks[THUMB_KNUCKLE_IDX].x - landmarks[INDEX_KNUCKLE_BIDX].x,
+                               landmarks[THUMB_KNUCKLE_IDX].y - landmarks[INDEX_KNUCKLE_BIDX].y) > THRESHOLD-0.02
 
     return (is_index_finger_open, is_middle_finger_open, is_ring_finger_open, is_pinky_finger_open, is_thumb_open)
 
@@ -75,3 +81,57 @@ class HandGestures:
     # Opens mechanical hand
     def open_hand(first, middle, ring, pinky, thumb):
         return (first and middle and ring and pinky and thumb)
+
+
+# Turns noisy per-frame gesture classifications into edge-triggered gesture events.
+# Every frame is classified and voted on over a sliding time window, so response time no longer depends on FPS.
+class GestureStateMachine:
+    def __init__(self, window_ms=GESTURE_WINDOW_MS, hold_ms=GESTURE_HOLD_MS, min_share=GESTURE_MIN_SHARE):
+        self.window = window_ms / 1000
+        # hold_ms can be one value for every gesture or a {gesture: ms} dict (missing gestures use GESTURE_HOLD_MS)
+        if isinstance(hold_ms, dict):
+            hold_ms = {int(gesture): ms for gesture, ms in hold_ms.items()}  # JSON config keys are strings
+        self.hold_ms = hold_ms
+        self.min_share = min_share
+        self.history = deque()   # (timestamp, gesture) for every frame inside the window
+        self.counts = Counter()
+        self.gesture = 0         # Currently accepted gesture
+        self.candidate = None    # Majority gesture waiting out its hold time
+        self.candidate_since = 0.0
+
+    def holdTime(self, gesture):
+        if isinstance(self.hold_ms, dict):
+            return self.hold_ms.get(gesture, GESTURE_HOLD_MS) / 1000
+        return self.hold_ms / 1000
+
+    # Feed one frame's classification, returns the gesture when a new one is accepted, otherwise None
+    def update(self, gesture, now=None):
+        if now is None:
+            now = time.time()
+
+        self.history.append((now, gesture))
+        self.counts[gesture] += 1
+        while self.history[0][0] < now - self.window:
+            _, old = self.history.popleft()
+            self.counts[old] -= 1
+
+        majority, votes = self.counts.most_common(1)[0]
+        if votes < self.min_share * len(self.history) or majority == self.gesture:
+            self.candidate = None
+            return None
+
+        if majority != self.candidate:
+            self.candidate = majority
+            self.candidate_since = now
+        if now - self.candidate_since < self.holdTime(majority):
+            return None
+
+        self.gesture = majority
+        self.candidate = None
+        return majority
+
+    def reset(self):
+        self.history.clear()
+        self.counts.clear()
+        self.gesture = 0
+        self.candidate = None
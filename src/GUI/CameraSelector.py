@@ -2,20 +2,171 @@ import cv2
 import tkinter as tk
 from tkinter import messagebox
 from PIL import Image, ImageTk
+import os
 import threading
 import atexit
+from concurrent.futures import Future, wait
+from fileLoading.fileLoader import load_user_json_file, save_user_json_file
 
 MAX_CAMERAS = 5  # You can change this based on your system
+PROBE_TIMEOUT = 3.0  # Seconds to wait for all cameras to answer, slower devices are skipped
+SELECTION_CACHE_FILE = "camera_selection.json"  # Last working camera choice, stored in the user data folder
 
 cam1 = None
 cam2 = None
+camerasSelected = False
+discovery = None
+
+
+# Finds the cameras once per session and keeps their handles open,
+# so previews and the tracker reuse the same handle instead of closing and reopening the device
+class CameraDiscovery:
+    def __init__(self, max_index=MAX_CAMERAS, timeout=PROBE_TIMEOUT):
+        self.max_index = max_index
+        self.timeout = timeout
+        self.handles = {}  # {index: opened cv2.VideoCapture}
+        self.discovered = False
+        self.lock = threading.Lock()
+
+    # Open a camera and make sure it actually delivers a frame
+    def probe(self, index):
+        cap = cv2.VideoCapture(index)
+        if cap.isOpened() and cap.read()[0]:
+            return cap
+        cap.release()
+        return None
+
+    # Probe one index on a daemon thread. A driver that hangs inside VideoCapture never returns, and a
+    # ThreadPoolExecutor worker stuck there would keep the program from exiting (they are joined at exit).
+    def startProbe(self, index):
+        future = Future()
+
+        def run():
+            try:
+                future.set_result(self.probe(index))
+            except Exception as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, name=f"CameraProbe-{index}", daemon=True).start()
+        return future
+
+    # Probe every index in parallel, cached for the rest of the session
+    def discover(self):
+        with self.lock:
+            if self.discovered:
+                return sorted(self.handles)
+
+            # Cameras that are already open (e.g. from the selection cache) do not need probing again
+            probes = {self.startProbe(index): index for index in range(self.max_index) if index not in self.handles}
+            done, not_done = wait(probes, timeout=self.timeout)
+
+            self.discovered = True
+            for future in done:
+                if future.exception() is None and future.result() is not None:
+                    self.handles[probes[future]] = future.result()
+            for future in not_done:
+                print(f"Camera {probes[future]} did not answer within {self.timeout} seconds, skipping it.")
+                # Release the handle whenever the slow probe finally finishes
+                future.add_done_callback(releaseLateProbe)
+            return sorted(self.handles)
+
+    def get(self, index):
+        return self.handles.get(index)
+
+    # Open a single camera without probing all of them, the handle is cached like a discovered one
+    def open(self, index):
+        with self.lock:
+            if index not in self.handles:
+                cap = cv2.VideoCapture(index)
+                if not cap.isOpened():
+                    cap.release()
+                    return None
+                self.handles[index] = cap
+            return self.handles[index]
+
+    # Hand an opened handle over to the caller (who is now responsible for releasing it)
+    def take(self, index):
+        with self.lock:
+            if index in self.handles:
+                return self.handles.pop(index)
+        return cv2.VideoCapture(index)
+
+    # Close every handle the caller did not take
+    def releaseAll(self):
+        with self.lock:
+            for cap in self.handles.values():
+                cap.release()
+            self.handles = {}
+
+
+# Done callback of a probe that answered after discovery gave up on it, nobody else will ever release its handle
+def releaseLateProbe(future):
+    if future.exception() is None and future.result() is not None:
+        future.result().release()
+
+
+def getDiscovery():
+    global discovery
+    if discovery is None:
+        discovery = CameraDiscovery()
+        atexit.register(discovery.releaseAll)
+    return discovery
+
+
+# Identifies a camera beyond its index: backend, resolution and (on Linux) the device name.
+# OpenCV gives no device name or path on Windows (or macOS), so there the fingerprint is only backend and
+# resolution: two identical cameras that swap indices (replugged into other ports) look the same, and the cached
+# selection silently uses the wrong one. Pick the cameras again in the selector when that happens.
+def cameraFingerprint(index, cap):
+    name = None
+    name_path = f"/sys/class/video4linux/video{index}/name"
+    if os.path.exists(name_path):
+        with open(name_path, "r") as f:
+            name = f.read().strip()
+    return {
+        "backend": cap.getBackendName(),
+        "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        "name": name
+    }
+
+
+# Reuse the last working selection if every saved camera still opens and still has the same fingerprint
+def loadCachedSelection():
+    cache = load_user_json_file(SELECTION_CACHE_FILE)
+    if not cache or "tracking" not in cache:
+        return None
+
+    selection = []
+    for role in ("tracking", "vision"):
+        entry = cache.get(role)
+        if entry is None:  # Vision camera was ignored last time
+            selection.append(None)
+            continue
+        cap = getDiscovery().open(entry["index"])
+        if cap is None or cameraFingerprint(entry["index"], cap) != entry["fingerprint"]:
+            print(f"Saved {role} camera {entry['index']} changed, opening the camera selector.")
+            return None
+        selection.append(entry["index"])
+    return tuple(selection)
+
+
+def saveSelection(tracking, vision):
+    cache = {}
+    for role, index in (("tracking", tracking), ("vision", vision)):
+        if index is None:
+            cache[role] = None
+        else:
+            cache[role] = {"index": index, "fingerprint": cameraFingerprint(index, getDiscovery().open(index))}
+    save_user_json_file(SELECTION_CACHE_FILE, cache)
+
 
 class CameraPreview:
-    def __init__(self, master, cam_index):
+    def __init__(self, master, cam_index, cap):
         self.master = master
         self.cam_index = cam_index
         self.var = tk.IntVar()
-        self.cap = cv2.VideoCapture(cam_index)
+        self.cap = cap  # Shared handle owned by the camera discovery, not released by the preview
 
         self.frame = tk.Frame(master)
 
@@ -49,20 +200,10 @@ class CameraPreview:
 
     def stop(self):
         self.running = False
-        self.cap.release()
 
 
 def find_available_cameras(max_index=MAX_CAMERAS):
-    available = []
-    for i in range(max_index):
-        cap = cv2.VideoCapture(i)
-
-        if cap.isOpened():
-            available.append(i)
-            cap.release()
-        else:
-            break
-    return available
+    return getDiscovery().discover()
 
 
 ## this creates a GUI and returns the index of the selected camera it also takes in a
@@ -108,11 +249,12 @@ def getCamera(label, ignore):
     for idx, cam_idx in enumerate(available):
         if cam_idx == ignore:
             continue
-        preview = CameraPreview(grid_container, cam_idx)
+        preview = CameraPreview(grid_container, cam_idx, getDiscovery().get(cam_idx))
         previews.append(preview)
         preview.frame.grid(row=idx, column=0, padx=40, pady=10)
 
     if not previews:
+        root.destroy()
         return None
 
     def submit_selection():
@@ -168,19 +310,40 @@ def getCamera(label, ignore):
     return selected_camera['index']
 
 
+# The selector only opens the first time a camera is asked for, not when this module is imported
 def getCameraOne():
+    initialize_cameras()
     return cam1
 
 def getCameraTwo():
+    initialize_cameras()
     return cam2
 
+# Returns the already opened handle of a selected camera, so the tracker does not have to reopen the device
+def openCamera(index):
+    return getDiscovery().take(index)
+
 def initialize_cameras():
-    global cam1, cam2  # Use global inside the function to modify these variables
+    global cam1, cam2, camerasSelected  # Use global inside the function to modify these variables
+    if camerasSelected:
+        return
+
+    # Fixed stations skip the selector entirely while their cameras stay the same
+    cached = loadCachedSelection()
+    if cached is not None:
+        cam1, cam2 = cached
+        camerasSelected = True
+        return
+
     cam1 = getCamera("Please Select a Tracking Camera", -1)  # Assign cam1
     if(cam1 is None):
         print("Error: Camera 1 did not connect correctly.")
         exit(1)
     cam2 = getCamera("Please Select a Vision Camera", cam1)  # Assign cam2
+    camerasSelected = True
+    saveSelection(cam1, cam2)
 
-# Initialize cameras
-initialize_cameras()
+    # Close the cameras nobody picked, the selected ones stay open for openCamera
+    for index in find_available_cameras():
+        if index not in (cam1, cam2):
+            getDiscovery().take(index).release()
@@ -0,0 +1,128 @@
+import threading
+import time
+import cv2
+
+# Default capture format requested from tracking cameras, overridden by "capture_settings" in config.json
+DEFAULT_CAPTURE_SETTINGS = {
+    "width": 640,       # Capture close to the inference resolution instead of decoding and resizing a larger frame
+    "height": 480,
+    "fps": 30,
+    "fourcc": "MJPG",   # "MJPG" or "YUYV", leave empty to keep the driver default
+    "buffer_size": 1    # Keep at most one frame in the driver buffer so reads never return stale frames
+}
+STARTUP_TIMEOUT = 10.0  # Seconds a camera gets to deliver its first frame (opening and negotiating can take a while)
+
+
+def decodeFourcc(value):
+    value = int(value)
+    return "".join(chr((value >> (8 * i)) & 0xFF) for i in range(4)).strip("\x00")
+
+
+# Reads one camera on its own thread and only ever keeps the newest frame (latest-frame-wins)
+class CameraStream:
+    def __init__(self, source, name="Camera"):
+        # Source can be a camera index/path or an already opened cv2.VideoCapture
+        if isinstance(source, cv2.VideoCapture):
+            self.cap = source
+        else:
+            self.cap = cv2.VideoCapture(source)
+        self.name = name
+
+        self.condition = threading.Condition()
+        self.frame = None
+        self.success = False
+        self.frameId = 0       # Increments every time a new frame lands in the slot
+        self.timestamp = 0.0   # time.time() when the newest frame was read
+        self.droppedFrames = 0 # Frames that were overwritten before anyone read them
+        self.lastReadId = 0
+
+        self.running = False
+        self.thread = None
+
+    def isOpened(self):
+        return self.cap is not None and self.cap.isOpened()
+
+    # Ask the driver for a capture format (call before start), returns what the driver actually granted
+    def configure(self, settings=None):
+        requested = dict(DEFAULT_CAPTURE_SETTINGS)
+        requested.update(settings or {})
+
+        # FOURCC has to be set before the resolution on most drivers
+        if requested["fourcc"]:
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*requested["fourcc"]))
+        if requested["width"] and requested["height"]:
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, requested["width"])
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, requested["height"])
+        if requested["fps"]:
+            self.cap.set(cv2.CAP_PROP_FPS, requested["fps"])
+        if requested["buffer_size"]:
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, requested["buffer_size"])
+
+        granted = {
+            "width": int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            "height": int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            "fps": self.cap.get(cv2.CAP_PROP_FPS),
+            "fourcc": decodeFourcc(self.cap.get(cv2.CAP_PROP_FOURCC)),
+            "buffer_size": int(self.cap.get(cv2.CAP_PROP_BUFFERSIZE))
+        }
+
+        print(f"{self.name} capture format: {granted['width']}x{granted['height']} @ {granted['fps']:.0f} FPS, "
+              f"{granted['fourcc'] or 'default'} FOURCC, buffer {granted['buffer_size']}")
+        for key in granted:
+            # 0 means the property is not supported by this backend, nothing was negotiated for it
+            if requested[key] and granted[key] and granted[key] != requested[key]:
+                print(f"Warning: {self.name} requested {key} {requested[key]} but the driver granted {granted[key]}.")
+        return granted
+
+    def start(self):
+        if self.running:
+            return self
+        self.running = True
+        self.thread = threading.Thread(target=self.update, name=f"{self.name}Reader", daemon=True)
+        self.thread.start()
+        return self
+
+    # Reader thread: grab frames as fast as the driver delivers them and overwrite the slot
+    def update(self):
+        while self.running:
+            success, frame = self.cap.read()
+            timestamp = time.time()
+
+            with self.condition:
+                if self.frameId != self.lastReadId:
+                    self.droppedFrames += 1
+                self.success = success
+                self.frame = frame
+                self.timestamp = timestamp
+                self.frameId += 1
+                self.condition.notify_all()
+
+            if not success:
+                # Camera stopped delivering, let the consumer decide what to do
+                self.running = False
+
+    # Block until the reader delivered its first frame, returns whether it was a good one (False on timeout)
+    def waitForFirstFrame(self, timeout=STARTUP_TIMEOUT):
+        with self.condition:
+            self.condition.wait_for(lambda: self.frameId > 0 or not self.running, timeout)
+            return self.frameId > 0 and self.success
+
+    # Returns (success, frame, frameId, timestamp)
+    # wait=True blocks until a frame newer than the last one read arrives (or timeout seconds pass)
+    # wait=False returns whatever is in the slot right now, so a slow camera never stalls the caller
+    def read(self, wait=True, timeout=1.0):
+        with self.condition:
+            if wait:
+                self.condition.wait_for(lambda: self.frameId != self.lastReadId or not self.running, timeout)
+                if self.frameId == self.lastReadId:
+                    return (False, None, self.frameId, self.timestamp)
+            self.lastReadId = self.frameId
+            return (self.success, self.frame, self.frameId, self.timestamp)
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+        if self.cap is not None:
+            self.cap.release()
@@ -0,0 +1,62 @@
+import cv2
+import numpy as np
+
+# Default frame sizes, overridden by "frame_settings" in config.json
+DEFAULT_FRAME_SETTINGS = {
+    "display_width": 1080,    # Size of each camera in the side by side display
+    "display_height": 720,
+    "inference_width": 640,   # Size of the image hand tracking runs on, matching the capture size skips the resize
+    "inference_height": 480
+}
+
+
+# Preallocated buffers for the per-frame resize/compose/convert work.
+# Every output is written into a reused buffer (dst=) instead of allocating new arrays each frame:
+#   combined  - both cameras side by side at display resolution, the cameras are resized straight into its halves
+#   inference - RGB copy of the tracking camera at the (smaller) inference resolution
+# With display=False (headless) only the inference buffer is produced.
+class FramePipeline:
+    def __init__(self, settings=None, display=True):
+        merged = dict(DEFAULT_FRAME_SETTINGS)
+        merged.update(settings or {})
+        self.display_size = (merged["display_width"], merged["display_height"])
+        self.inference_size = (merged["inference_width"], merged["inference_height"])
+        self.display_enabled = display
+
+        self.combined = None
+        self.left = None    # View of the tracking camera half of combined
+        self.right = None   # View of the vision camera half of combined (None with one camera)
+        self.inference_bgr = np.empty((self.inference_size[1], self.inference_size[0], 3), dtype=np.uint8)
+        self.inference_rgb = np.empty_like(self.inference_bgr)
+
+    # (Re)allocate the side by side buffer, only happens when a camera is added or removed
+    def allocateCombined(self, cameras):
+        width, height = self.display_size
+        self.combined = np.empty((height, width * cameras, 3), dtype=np.uint8)
+        self.left = self.combined[:, :width]
+        self.right = self.combined[:, width:] if cameras == 2 else None
+
+    # Replaces camSettings: returns (img1_resized, img2_resized, combined_img, imgRGB1) without new allocations
+    def compose(self, img1, img2):
+        if not self.display_enabled:
+            self.toInference(img1)
+            return (None, None, None, self.inference_rgb)
+
+        cameras = 1 if img2 is None else 2
+        if self.combined is None or self.combined.shape[1] != self.display_size[0] * cameras:
+            self.allocateCombined(cameras)
+
+        cv2.resize(img1, self.display_size, dst=self.left)
+        if img2 is not None:
+            cv2.resize(img2, self.display_size, dst=self.right)
+
+        self.toInference(img1)
+        return (self.left, self.right, self.combined, self.inference_rgb)
+
+    # Hand tracking gets its own smaller buffer, straight from the camera image
+    def toInference(self, img1):
+        if img1.shape[1] == self.inference_size[0] and img1.shape[0] == self.inference_size[1]:
+            cv2.cvtColor(img1, cv2.COLOR_BGR2RGB, dst=self.inference_rgb)
+            return
+        cv2.resize(img1, self.inference_size, dst=self.inference_bgr, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self.inference_bgr, cv2.COLOR_BGR2RGB, dst=self.inference_rgb)
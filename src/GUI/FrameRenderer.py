@@ -0,0 +1,116 @@
+import threading
+import time
+import cv2
+import numpy as np
+
+WINDOW_NAME = "Combined Camera Output"
+MAX_RENDER_FPS = 30
+
+
+# Owns the OpenCV window and redraws it on its own thread at a capped rate.
+# The control loop only publishes a snapshot of the newest frame plus the overlay to draw on it,
+# so imshow, getWindowImageRect and all overlay drawing never add to arm control latency.
+#
+# Overlay entries are tuples:
+#   ("circle", (x, y), radius, (b, g, r))
+#   ("text", text, (x, y), scale, (b, g, r), thickness)
+class FrameRenderer:
+    def __init__(self, win_name=WINDOW_NAME, max_fps=MAX_RENDER_FPS, window_size=(1920, 1080)):
+        self.win_name = win_name
+        self.frame_interval = 1 / max_fps
+        self.window_size = window_size
+
+        self.condition = threading.Condition()
+        self.back = None         # Written by publish (control thread)
+        self.work = None         # Drawn on by the render thread, swapped with back under the lock
+        self.overlay = []
+        self.new_frame = False
+        self.last_publish = 0.0
+        self.display = None      # Window sized buffer, reused until the window is resized
+
+        self.closed = False      # Set once the user closes the window
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name="FrameRenderer", daemon=True)
+        self.thread.start()
+        return self
+
+    # True when enough time has passed since the last published frame (lets callers skip building overlays)
+    def isDue(self):
+        return time.time() - self.last_publish >= self.frame_interval
+
+    # Called from the control loop every frame, only copies the frame when the renderer is due for one
+    def publish(self, img, overlay):
+        if not self.isDue():
+            return False
+        self.last_publish = time.time()
+
+        with self.condition:
+            if self.back is None or self.back.shape != img.shape:
+                self.back = np.empty_like(img)
+            np.copyto(self.back, img)
+            self.overlay = overlay
+            self.new_frame = True
+            self.condition.notify()
+        return True
+
+    def draw(self, img, overlay):
+        for item in overlay:
+            if item[0] == "circle":
+                _, center, radius, color = item
+                cv2.circle(img, center, radius, color, cv2.FILLED)
+            elif item[0] == "text":
+                _, text, org, scale, color, thickness = item
+                cv2.putText(img, text, org, cv2.FONT_HERSHEY_SIMPLEX, scale, color, thickness)
+
+    # Scale the frame to the current window size, reusing the display buffer
+    def fitToWindow(self, img):
+        _, _, win_w, win_h = cv2.getWindowImageRect(self.win_name)
+        if win_w <= 0 or win_h <= 0 or (win_w, win_h) == (img.shape[1], img.shape[0]):
+            return img
+        if self.display is None or self.display.shape[:2] != (win_h, win_w):
+            self.display = np.empty((win_h, win_w, 3), dtype=img.dtype)
+        return cv2.resize(img, (win_w, win_h), dst=self.display)
+
+    # Render thread: the window is created, drawn, polled and destroyed only from here (HighGUI windows belong to
+    # the thread that created them, destroying them from another thread can hang or crash on some platforms)
+    def run(self):
+        cv2.namedWindow(self.win_name, cv2.WINDOW_NORMAL)
+        cv2.resizeWindow(self.win_name, self.window_size[0], self.window_size[1])
+
+        while self.running:
+            with self.condition:
+                self.condition.wait_for(lambda: self.new_frame or not self.running, self.frame_interval)
+                if self.new_frame:
+                    self.back, self.work = self.work, self.back
+                    overlay = self.overlay
+                    self.new_frame = False
+                else:
+                    overlay = None
+
+            if overlay is not None:
+                self.draw(self.work, overlay)
+                cv2.imshow(self.win_name, self.fitToWindow(self.work))
+
+            # Keep the window responsive even when no new frame arrived
+            cv2.waitKey(1)
+
+            # Detect if window is closed
+            if cv2.getWindowProperty(self.win_name, cv2.WND_PROP_VISIBLE) < 1:
+                self.closed = True
+                self.running = False
+
+        cv2.destroyWindow(self.win_name)
+        cv2.waitKey(1)  # Lets HighGUI process the destroy event
+
+    # Stop the render thread and wait until it has destroyed the window
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join()
+        self.thread = None
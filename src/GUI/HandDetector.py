@@ -0,0 +1,147 @@
+import cv2
+import numpy as np
+
+# Default hand landmark inference settings, overridden by "inference_settings" in config.json
+DEFAULT_INFERENCE_SETTINGS = {
+    "backend": "mediapipe",
+    "model_complexity": 0,            # 0 = lite model (faster on CPU), 1 = full model
+    "max_num_hands": 1,
+    "min_detection_confidence": 0.5,
+    "min_tracking_confidence": 0.5,
+    "input_scale": 1.0,               # Downscale factor applied to the image before inference (1.0 = no downscale)
+    "roi_tracking": False,            # Only run inference on a crop around the hand (experimental)
+    "roi_expand": 1.8,                # Crop size relative to the hand's bounding box when the crop is placed
+    "roi_min_size": 0.3,              # Smallest crop side as a fraction of the frame's shorter side
+    "roi_margin": 0.1                 # The crop is moved once the hand comes this close to its edge (fraction of its side)
+}
+
+
+class HandDetectorInterface:
+    def process(self, imgRGB):
+        """Run hand landmark inference on an RGB image, returns an object with multi_hand_landmarks."""
+        raise NotImplementedError
+
+    def close(self):
+        """Release the model."""
+        raise NotImplementedError
+
+
+# MediaPipe Hands solution, landmarks are normalized so downscaling the input does not change their meaning
+class MediaPipeHandDetector(HandDetectorInterface):
+    def __init__(self, settings):
+        import mediapipe as mp
+
+        self.input_scale = settings["input_scale"]
+        self.hands = mp.solutions.hands.Hands(
+            model_complexity=settings["model_complexity"],
+            max_num_hands=settings["max_num_hands"],
+            min_detection_confidence=settings["min_detection_confidence"],
+            min_tracking_confidence=settings["min_tracking_confidence"]
+        )
+
+    def process(self, imgRGB):
+        if self.input_scale != 1.0:
+            imgRGB = cv2.resize(imgRGB, None, fx=self.input_scale, fy=self.input_scale, interpolation=cv2.INTER_AREA)
+        return self.hands.process(imgRGB)
+
+    def close(self):
+        self.hands.close()
+
+
+# Wraps another detector and runs it on a square crop around the hand instead of the whole frame.
+# Landmarks are mapped back to full frame coordinates, and a lost hand falls back to a full frame search.
+#
+# MediaPipe (static_image_mode off) tracks the hand from one frame's landmarks to the next in image coordinates,
+# so the crop has to stay put while it tracks: moving it every frame shifts the image under the tracker and it
+# loses the hand or jitters. The crop is only placed when the hand is (re)detected and moved once the hand gets
+# within margin of its edge, every other frame reuses the same crop.
+class RegionOfInterestDetector(HandDetectorInterface):
+    def __init__(self, detector, expand, min_size, margin):
+        self.detector = detector
+        self.expand = expand
+        self.min_size = min_size
+        self.margin = margin
+        self.roi = None  # (x0, y0, x1, y1) in pixels of the crop to use for the next frame
+        self.moves = 0   # Times the crop was placed or moved
+
+    def process(self, imgRGB):
+        if self.roi is not None:
+            x0, y0, x1, y1 = self.roi
+            results = self.detector.process(np.ascontiguousarray(imgRGB[y0:y1, x0:x1]))
+            if results.multi_hand_landmarks:
+                self.toFullFrame(results, imgRGB.shape, self.roi)
+                if not self.insideRoi(results, imgRGB.shape):
+                    self.updateRoi(results, imgRGB.shape)
+                return results
+
+        # No previous hand or the hand left the crop: search the full frame
+        results = self.detector.process(imgRGB)
+        self.updateRoi(results, imgRGB.shape)
+        return results
+
+    # Landmarks come back normalized to the crop, rescale them in place so they are normalized to the full frame
+    def toFullFrame(self, results, shape, roi):
+        pix_h, pix_w = shape[:2]
+        x0, y0, x1, y1 = roi
+        scale_x, scale_y = (x1 - x0) / pix_w, (y1 - y0) / pix_h
+        for hand in results.multi_hand_landmarks:
+            for point in hand.landmark:
+                point.x = x0 / pix_w + point.x * scale_x
+                point.y = y0 / pix_h + point.y * scale_y
+                point.z *= scale_x  # z uses the same scale as x
+
+    # Pixel bounding box (x0, y0, x1, y1) of all detected hands
+    def handBounds(self, results, shape):
+        pix_h, pix_w = shape[:2]
+        xs = [point.x for hand in results.multi_hand_landmarks for point in hand.landmark]
+        ys = [point.y for hand in results.multi_hand_landmarks for point in hand.landmark]
+        return (min(xs) * pix_w, min(ys) * pix_h, max(xs) * pix_w, max(ys) * pix_h)
+
+    # Whether the hands are still clear of the crop's edges (by margin), so the crop can stay where it is
+    def insideRoi(self, results, shape):
+        x0, y0, x1, y1 = self.roi
+        border = (x1 - x0) * self.margin
+        hand_x0, hand_y0, hand_x1, hand_y1 = self.handBounds(results, shape)
+        return (hand_x0 >= x0 + border and hand_y0 >= y0 + border and
+                hand_x1 <= x1 - border and hand_y1 <= y1 - border)
+
+    # Square crop around all detected hands, expanded and clamped to the frame
+    def updateRoi(self, results, shape):
+        if not results.multi_hand_landmarks:
+            self.roi = None
+            return
+
+        pix_h, pix_w = shape[:2]
+        hand_x0, hand_y0, hand_x1, hand_y1 = self.handBounds(results, shape)
+        center_x = (hand_x0 + hand_x1) / 2
+        center_y = (hand_y0 + hand_y1) / 2
+        side = max(hand_x1 - hand_x0, hand_y1 - hand_y0) * self.expand
+        side = min(max(side, self.min_size * min(pix_w, pix_h)), min(pix_w, pix_h))
+
+        x0 = int(min(max(center_x - side / 2, 0), pix_w - side))
+        y0 = int(min(max(center_y - side / 2, 0), pix_h - side))
+        self.roi = (x0, y0, x0 + int(side), y0 + int(side))
+        self.moves += 1
+
+    def close(self):
+        self.detector.close()
+
+
+# Add other inference backends here and make sure to update config file
+HAND_DETECTORS = {
+    "mediapipe": MediaPipeHandDetector
+}
+
+
+# Build the hand detector described by the (possibly partial) settings dictionary
+def createHandDetector(settings=None):
+    merged = dict(DEFAULT_INFERENCE_SETTINGS)
+    merged.update(settings or {})
+
+    detector_class = HAND_DETECTORS.get(merged["backend"])
+    if detector_class is None:
+        raise ValueError(f"Unsupported hand detector backend: {merged['backend']}")
+    detector = detector_class(merged)
+    if merged["roi_tracking"]:
+        detector = RegionOfInterestDetector(detector, merged["roi_expand"], merged["roi_min_size"], merged["roi_margin"])
+    return detector
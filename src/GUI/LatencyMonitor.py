@@ -0,0 +1,108 @@
+import csv
+import os
+import threading
+import time
+import logging
+from collections import deque
+import numpy as np
+
+# Pipeline stages in the order they happen each frame, "total" is camera read -> command submitted
+# and "ack" is camera read -> the arm accepted the command (measured on the dispatcher thread)
+STAGES = ["capture", "preprocess", "inference", "coordinates", "gesture", "physics", "reachability", "submit", "total", "ack"]
+
+# Default settings, overridden by "latency_settings" in config.json
+DEFAULT_LATENCY_SETTINGS = {
+    "window": 300,            # Samples kept per stage for the rolling percentiles
+    "report_interval": 10.0,  # Seconds between log lines / CSV rows, 0 disables reporting
+    "csv_path": "",           # Append percentiles here on every report, empty to only log
+    "overlay": True           # Show the per-stage p50/p95 on the camera window
+}
+
+logger = logging.getLogger(__name__)
+
+
+# Per-stage timing of the tracking loop with rolling p50/p95/p99 for each stage
+class LatencyMonitor:
+    def __init__(self, settings=None):
+        merged = dict(DEFAULT_LATENCY_SETTINGS)
+        merged.update(settings or {})
+        self.report_interval = merged["report_interval"]
+        self.csv_path = merged["csv_path"]
+        self.show_overlay = merged["overlay"]
+
+        self.samples = {stage: deque(maxlen=merged["window"]) for stage in STAGES}
+        self.lock = threading.Lock()  # ack samples arrive from the dispatcher thread
+        self.frame_start = 0.0
+        self.last_mark = 0.0
+        self.last_report = time.perf_counter()
+
+    # Start timing a frame, capture_time is the time.time() stamp of when the camera delivered it
+    def beginFrame(self, capture_time):
+        now = time.perf_counter()
+        capture_age = max(time.time() - capture_time, 0.0)
+        self.frame_start = now - capture_age  # Everything is measured from when the frame was captured
+        self.last_mark = now
+        self.record("capture", capture_age)
+
+    # Record the time since the previous mark as the duration of this stage
+    def mark(self, stage):
+        now = time.perf_counter()
+        self.record(stage, now - self.last_mark)
+        self.last_mark = now
+
+    def endFrame(self):
+        self.record("total", time.perf_counter() - self.frame_start)
+
+    # Time from capture until the arm accepted the command behind future (coalesced commands are skipped)
+    def trackCommand(self, future):
+        frame_start = self.frame_start
+
+        def done(finished):
+            if not finished.cancelled() and finished.exception() is None:
+                self.record("ack", time.perf_counter() - frame_start)
+        future.add_done_callback(done)
+
+    def record(self, stage, seconds):
+        with self.lock:
+            self.samples[stage].append(seconds)
+
+    # {stage: (count, p50, p95, p99)} in milliseconds
+    def percentiles(self):
+        with self.lock:
+            snapshot = {stage: list(values) for stage, values in self.samples.items() if values}
+        return {stage: (len(values), *(np.percentile(values, [50, 95, 99]) * 1000).tolist())
+                for stage, values in snapshot.items()}
+
+    # Overlay entries for the renderer (see FrameRenderer), one line per stage
+    def overlay(self, origin=(20, 120)):
+        if not self.show_overlay:
+            return []
+        items = []
+        for row, (stage, (_, p50, p95, _)) in enumerate(self.percentiles().items()):
+            text = f"{stage}: {p50:.1f} / {p95:.1f} ms"
+            items.append(("text", text, (origin[0], origin[1] + row * 30), 0.8, (0, 0, 0), 2))
+        return items
+
+    # Log (and optionally append to CSV) the percentiles every report_interval seconds
+    def report(self):
+        now = time.perf_counter()
+        if not self.report_interval or now - self.last_report < self.report_interval:
+            return
+        self.last_report = now
+
+        stats = self.percentiles()
+        logger.info("latency ms (p50/p95/p99): %s", ", ".join(
+            f"{stage} {p50:.1f}/{p95:.1f}/{p99:.1f}" for stage, (_, p50, p95, p99) in stats.items()))
+
+        if self.csv_path:
+            write_header = not os.path.exists(self.csv_path)
+            try:
+                with open(self.csv_path, "a", newline="") as f:
+                    writer = csv.writer(f)
+                    if write_header:
+                        writer.writerow(["time", "stage", "count", "p50_ms", "p95_ms", "p99_ms"])
+                    stamp = time.strftime("%Y-%m-%d %H:%M:%S")
+                    for stage, (count, p50, p95, p99) in stats.items():
+                        writer.writerow([stamp, stage, count, f"{p50:.3f}", f"{p95:.3f}", f"{p99:.3f}"])
+            except OSError as e:
+                print(f"Error writing latency CSV {self.csv_path}: {e}")
@@ -0,0 +1,271 @@
+import struct
+import time
+from concurrent.futures import Future
+import cv2
+import numpy as np
+from DoBotArm import gestureInterpretation, coordProcessing
+from DoBotArm.JogControl import JogController
+
+# Binary session recordings of the tracking loop, everything downstream of hand inference can be replayed from them.
+#
+# File layout (little endian):
+#   header:  magic "HGSR", version, flags, pix_w, pix_h
+#   frames:  FRAME_HEADER (timestamp, has_hand, handedness, command count, image bytes)
+#            + 21x3 float32 landmarks (only when has_hand)
+#            + COMMAND records (command id + 5 float32 args, unused args are 0)
+#            + JPEG image (only when image bytes > 0)
+SESSION_MAGIC = b"HGSR"
+SESSION_VERSION = 1
+FLAG_FRAMES = 1  # The recording contains compressed camera frames
+
+FILE_HEADER = struct.Struct("<4sHHHH")
+FRAME_HEADER = struct.Struct("<dBBBI")
+COMMAND = struct.Struct("<B5f")
+LANDMARK_BYTES = coordProcessing.NUM_LANDMARKS * 3 * 4
+
+HANDEDNESS = {None: 0, "Left": 1, "Right": 2}
+HANDEDNESS_NAMES = {code: name for name, code in HANDEDNESS.items()}
+
+# Arm commands that are recorded, in the order they get their id
+COMMAND_NAMES = ["move_to", "rail_move_to", "enableRail", "set_gripper_state", "jog"]
+COMMAND_IDS = {name: index + 1 for index, name in enumerate(COMMAND_NAMES)}
+
+# Default settings, overridden by "recording_settings" in config.json
+DEFAULT_RECORDING_SETTINGS = {
+    "enabled": False,
+    "path": "session.hgsr",
+    "record_frames": False,   # Also store the tracking camera image (JPEG), makes files much larger
+    "jpeg_quality": 70
+}
+
+
+class SessionFormatError(Exception):
+    pass
+
+
+# Handedness label ("Left"/"Right") of the last detected hand, None when the detector does not report it
+def detectedHandedness(results):
+    handedness = getattr(results, "multi_handedness", None)
+    if not handedness:
+        return None
+    return handedness[-1].classification[0].label
+
+
+# Writes frames as the tracker produces them, commands submitted during a frame are stored with that frame
+class SessionRecorder:
+    def __init__(self, path, pix_w, pix_h, record_frames=False, jpeg_quality=70):
+        self.path = path
+        self.record_frames = record_frames
+        self.encode_params = [cv2.IMWRITE_JPEG_QUALITY, int(jpeg_quality)]
+        self.commands = []
+        self.frames = 0
+
+        self.file = open(path, "wb")
+        self.file.write(FILE_HEADER.pack(SESSION_MAGIC, SESSION_VERSION, FLAG_FRAMES if record_frames else 0, pix_w, pix_h))
+
+    def recordCommand(self, name, args):
+        values = [float(value) for value in args[:5]]
+        self.commands.append(COMMAND.pack(COMMAND_IDS[name], *values, *([0.0] * (5 - len(values)))))
+
+    # points is the (21, 3) landmark array or None when no hand was seen, img is only stored when record_frames is set
+    def writeFrame(self, timestamp, points, handedness=None, img=None):
+        if self.file is None:
+            return
+        image = b""
+        if self.record_frames and img is not None:
+            success, encoded = cv2.imencode(".jpg", img, self.encode_params)
+            if success:
+                image = encoded.tobytes()
+
+        self.file.write(FRAME_HEADER.pack(timestamp, points is not None, HANDEDNESS.get(handedness, 0),
+                                          len(self.commands), len(image)))
+        if points is not None:
+            self.file.write(np.ascontiguousarray(points, dtype="<f4").tobytes())
+        self.file.write(b"".join(self.commands))
+        self.file.write(image)
+        self.commands.clear()
+        self.frames += 1
+
+    # Wraps the arm (or its dispatcher) so every command it receives is also recorded
+    def wrap(self, arm):
+        return CommandRecorder(arm, self)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+# Forwards everything to the wrapped arm, recording the arm commands on the way through
+class CommandRecorder:
+    def __init__(self, arm, recorder):
+        self.arm = arm
+        self.recorder = recorder
+
+    def __getattr__(self, name):
+        attribute = getattr(self.arm, name)
+        if name not in COMMAND_IDS:
+            return attribute
+
+        def command(*args, **kwargs):
+            self.recorder.recordCommand(name, args)
+            return attribute(*args, **kwargs)
+        return command
+
+
+class RecordedFrame:
+    __slots__ = ("timestamp", "points", "handedness", "commands", "image")
+
+    def __init__(self, timestamp, points, handedness, commands, image):
+        self.timestamp = timestamp
+        self.points = points          # Read only (21, 3) float32 view into the file data, None without a hand
+        self.handedness = handedness  # "Left", "Right" or None
+        self.commands = commands      # [(name, (arg, ...)), ...]
+        self.image = image            # JPEG bytes or None
+
+    def decodeImage(self):
+        if self.image is None:
+            return None
+        return cv2.imdecode(np.frombuffer(self.image, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+
+# Argument counts so recorded commands come back with the same arguments they were sent with
+COMMAND_ARGS = {"move_to": 3, "rail_move_to": 4, "enableRail": 1, "set_gripper_state": 1, "jog": 2}
+
+
+# Loads a whole recording into memory, landmarks are views into it so iterating allocates almost nothing
+class SessionReader:
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.data = f.read()
+        if len(self.data) < FILE_HEADER.size:
+            raise SessionFormatError(f"{path} is too short to be a session recording")
+
+        magic, version, flags, self.pix_w, self.pix_h = FILE_HEADER.unpack_from(self.data, 0)
+        if magic != SESSION_MAGIC:
+            raise SessionFormatError(f"{path} is not a session recording")
+        if version != SESSION_VERSION:
+            raise SessionFormatError(f"{path} has unsupported version {version}")
+        self.has_frames = bool(flags & FLAG_FRAMES)
+
+    def __iter__(self):
+        data = self.data
+        offset = FILE_HEADER.size
+        while offset + FRAME_HEADER.size <= len(data):
+            timestamp, has_hand, handedness, command_count, image_bytes = FRAME_HEADER.unpack_from(data, offset)
+            offset += FRAME_HEADER.size
+
+            points = None
+            if has_hand:
+                points = np.frombuffer(data, dtype="<f4", count=coordProcessing.NUM_LANDMARKS * 3, offset=offset)
+                points = points.reshape(coordProcessing.NUM_LANDMARKS, 3)
+                offset += LANDMARK_BYTES
+
+            commands = []
+            for _ in range(command_count):
+                command_id, *args = COMMAND.unpack_from(data, offset)
+                name = COMMAND_NAMES[command_id - 1]
+                commands.append((name, tuple(args[:COMMAND_ARGS[name]])))
+                offset += COMMAND.size
+
+            image = data[offset:offset + image_bytes] if image_bytes else None
+            offset += image_bytes
+            if offset > len(data):
+                raise SessionFormatError("Recording ends in the middle of a frame")
+
+            yield RecordedFrame(timestamp, points, HANDEDNESS_NAMES.get(handedness), commands, image)
+
+
+# Runs recorded landmarks through the same gesture and coordinate processing as GUI.Tracker's loop,
+# returning the commands the tracker would send for each frame. Nothing talks to an arm, so this runs
+# as fast as the processing allows (realtime=True sleeps between frames to match the recording instead).
+# jog_settings should match the recorded session's, sessions recorded in velocity mode replay to jog commands.
+class SessionReplay:
+    def __init__(self, gesture_settings=None, pix_w=1080, pix_h=720, jog_settings=None):
+        gesture_settings = gesture_settings or {}
+        self.gesture_state = gestureInterpretation.GestureStateMachine(
+            gesture_settings.get("window_ms", gestureInterpretation.GESTURE_WINDOW_MS),
+            gesture_settings.get("hold_ms", gestureInterpretation.GESTURE_HOLD_MS),
+            gesture_settings.get("min_share", gestureInterpretation.GESTURE_MIN_SHARE))
+        self.hand_physics = coordProcessing.HandPhysics()
+        self.pix_w = pix_w
+        self.pix_h = pix_h
+        self.track = False
+        self.controlMode = 1
+        self.commands = []
+        self.jog_control = JogController(self, jog_settings)
+
+    # Collects the jog controller's commands for the frame being replayed
+    def jog(self, cmd, speed_ratio=100):
+        self.commands.append(("jog", (cmd, speed_ratio)))
+        future = Future()
+        future.set_result(None)
+        return future
+
+    # Commands for one frame as [(name, (arg, ...)), ...]
+    def step(self, frame):
+        commands = self.commands = []
+        if frame.points is None:
+            if self.jog_control.enabled:
+                self.jog_control.stop()
+            return commands
+        landmarks = coordProcessing.arrayToLandmarks(frame.points)
+
+        palm_x, palm_y = coordProcessing.palmCentroid(landmarks, self.pix_w, self.pix_h)
+        palm_x, palm_y, lineaRail_x = coordProcessing.palmToDobot(palm_x, palm_y, self.pix_w, self.pix_h)
+        palm_z = coordProcessing.CoordinateProcessing.determineZCoord(landmarks)
+
+        gesture = self.gesture_state.update(gestureInterpretation.interpretHandGest(landmarks), frame.timestamp)
+        if gesture == 1:
+            self.track = not self.track
+            self.jog_control.reset()
+        elif gesture == 2:
+            self.controlMode = 1
+            self.jog_control.reset()
+            commands.append(("enableRail", (1,)))
+        elif gesture == 3:
+            self.controlMode = 2
+            self.jog_control.reset()
+            commands.append(("enableRail", (0,)))
+        elif gesture == 4:
+            commands.append(("set_gripper_state", (1,)))
+        elif gesture == 5:
+            commands.append(("set_gripper_state", (0,)))
+
+        predicted_position = self.hand_physics.predictNextPosition((palm_y, palm_x, palm_z), 0.1, frame.timestamp)
+        lineaRail = lineaRail_x * 1000
+
+        reachable = self.track and coordProcessing.CoordinateProcessing.isPositionValid(self.controlMode, palm_y, palm_x, palm_z, lineaRail)
+        if reachable and self.jog_control.enabled and self.controlMode == 2:
+            reachable = coordProcessing.CoordinateProcessing.isPositionValid(self.controlMode, *predicted_position, lineaRail)
+        if self.jog_control.enabled:
+            if self.track and not reachable:
+                self.jog_control.stop()
+            elif self.track and self.controlMode == 1:
+                self.jog_control.moveRail(lineaRail)
+            elif self.track and self.controlMode == 2:
+                self.jog_control.move(palm_y, palm_x, palm_z)
+        elif reachable:
+            if self.controlMode == 1:
+                commands.append(("rail_move_to", (200, 0, 0, lineaRail)))
+            elif self.controlMode == 2:
+                commands.append(("move_to", tuple(predicted_position.tolist())))
+        return commands
+
+    def run(self, frames, realtime=False):
+        previous = None
+        for frame in frames:
+            if realtime and previous is not None and frame.timestamp > previous:
+                time.sleep(frame.timestamp - previous)
+            previous = frame.timestamp
+            yield frame, self.step(frame)
+
+
+# True when a replayed frame sent the same commands the recording did (arguments compared at float32 precision)
+def commandsMatch(recorded, replayed, tolerance=1e-3):
+    if len(recorded) != len(replayed):
+        return False
+    for (name1, args1), (name2, args2) in zip(recorded, replayed):
+        if name1 != name2 or not np.allclose(np.float32(args1), np.float32(args2), atol=tolerance):
+            return False
+    return True
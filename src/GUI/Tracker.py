@@ -1,22 +1,35 @@
 import cv2
-import mediapipe as mp
 import time, sys
 import numpy as np
 import json
+import logging
+import argparse
 from DoBotArm import gestureInterpretation, coordProcessing
+from DoBotArm.CommandDispatcher import CommandDispatcher
+from DoBotArm.JogControl import JogController
+from DoBotArm.MultiArm import MultiArmManager
+from DoBotArm.ShadowState import ShadowArm
 from fileLoading.fileLoader import *
-from GUI.CameraSelector import getCameraOne, getCameraTwo
+from GUI.CameraStream import CameraStream, STARTUP_TIMEOUT
+from GUI.HandDetector import createHandDetector
+from GUI.FramePipeline import FramePipeline
+from GUI.FrameRenderer import FrameRenderer
+from GUI.LatencyMonitor import LatencyMonitor
+from GUI.SessionRecording import SessionRecorder, DEFAULT_RECORDING_SETTINGS, detectedHandedness
 import atexit
 
 
 WRIST_IDX = 0
 MID_KNUCKLE_IDX = 9
 RING_KNUCKLE_IDX = 13
-GESTURE_UPDATE_INTERVAL = 10
+STATUS_INTERVAL = 5.0 # Seconds between headless status log lines
+
+logger = logging.getLogger(__name__)
 
 
 # Detects arm type and connect to it
-def initialize_robotic_arm(arm_type):
+# overrides: settings merged over the arm type's config entry (e.g. the port of one of several arms of that type)
+def initialize_robotic_arm(arm_type, overrides=None):
     # config_path = "config.json"
 
     # Load the configuration
@@ -33,11 +46,18 @@ def initialize_robotic_arm(arm_type):
     arm_config = next((arm for arm in config["robotic_arms"] if arm["arm_type"] == arm_type), None)
     if not arm_config:
         raise ValueError(f"Robotic arm type '{arm_type}' not found in configuration.")
+    arm_config = dict(arm_config)
+    arm_config.update(overrides or {})
 
     # Load the appropriate robotic arm class
     if arm_config["arm_type"] == "Dobot":
         from DoBotArm.DobotArm import DobotArm  # type: ignore
-        robotic_arm = DobotArm()
+        robotic_arm = DobotArm(backend=arm_config.get("backend"), retry_policy=arm_config.get("retry_policy"),
+                               streaming=arm_config.get("cp_streaming"), telemetry=arm_config.get("telemetry"))
+    elif arm_config["arm_type"] == "SimulatedDobot":
+        from DoBotArm.DobotArm import DobotArm  # type: ignore
+        robotic_arm = DobotArm(backend="sim", streaming=arm_config.get("cp_streaming"), telemetry=arm_config.get("telemetry"),
+                               simulation=arm_config.get("simulation"))
     elif arm_config["arm_type"] == "uArm":
         from RoboticArms.uArm import UArm  # type: ignore
         robotic_arm = UArm()
@@ -56,83 +76,190 @@ def initialize_robotic_arm(arm_type):
         print(f"Failed to connect to {arm_type}.")
         sys.exit(f"Program terminated: Unable to connect to {arm_type}.")
 
-# Cam display settings & variables functions
-def camSettings(img1, img2):
-    # Resize camera images to fit side by side & Concatenate images side by side
-    # img1_resized = cv2.resize(img1, (640, 480))
-    img1_resized = cv2.resize(img1, (1080, 720))
-
-
-    if img2 is not None:
-        # img2_resized = cv2.resize(img2, (640, 480))
-        img2_resized = cv2.resize(img2, (1080, 720))
-        combined_img = np.hstack((img1_resized, img2_resized))
-    else:
-        combined_img = img1_resized
-        img2_resized = None
-
-
-    # Process the first camera feed for hand tracking
-    imgRGB1 = cv2.cvtColor(img1_resized, cv2.COLOR_BGR2RGB)
+#*****************************************************************
 
-    return (img1_resized, img2_resized, combined_img, imgRGB1)
+# Camera index ("0") or device/file path from the config or command line
+def parseCameraSource(source):
+    if isinstance(source, str) and source.isdigit():
+        return int(source)
+    return source
+
+
+# Headless mode replaces the window overlay with periodic log lines
+class TrackingStatus:
+    def __init__(self, interval=STATUS_INTERVAL):
+        self.interval = interval
+        self.reset(time.time())
+
+    def reset(self, now):
+        self.start = now
+        self.frames = 0
+        self.hand_frames = 0
+        self.gestures = []
+
+    def update(self, hand_seen, gesture):
+        self.frames += 1
+        if hand_seen:
+            self.hand_frames += 1
+        if gesture is not None:
+            self.gestures.append(gesture)
+
+    # telemetries: (arm name, ArmTelemetry) of every arm that samples its state (name None for a single arm),
+    # adds their poses and alarms to the line
+    def report(self, track, controlMode, arm_commands, videoCap1, telemetries=()):
+        now = time.time()
+        elapsed = now - self.start
+        if elapsed < self.interval:
+            return
+        poses, alarms = [], []
+        for name, telemetry in telemetries:
+            sample = telemetry.latest()
+            prefix = "" if name is None else name + "="
+            poses.append(prefix + ("-" if sample is None else "(%.0f, %.0f, %.0f)" % sample.pose[:3]))
+            alarms.append(prefix + ("-" if sample is None else str(list(sample.alarms))))
+        logger.info("fps=%.1f frames=%d hand=%.0f%% gestures=%s tracking=%s mode=%s arm_pending=%d arm_coalesced=%d "
+                    "arm_suppressed=%d camera_dropped=%d arm_pose=%s arm_alarms=%s",
+                    self.frames / elapsed, self.frames, 100 * self.hand_frames / max(self.frames, 1), self.gestures,
+                    track, "rail" if controlMode == 1 else "arm", arm_commands.pendingCount(), arm_commands.coalesced,
+                    sum(arm_commands.suppressed.values()), videoCap1.droppedFrames,
+                    " ".join(poses) or "-", " ".join(alarms) or "-")
+        self.reset(now)
 
-#*****************************************************************
 
 # Camera & Tracking Function
-def beginTracking(arm_type):
+# headless: None reads "headless_settings" from the config, True/False overrides it
+# tracking_camera/vision_camera: camera index or path, skips the camera selector when given
+# record_path: write a session recording there (see GUI.SessionRecording), overrides "recording_settings"
+def beginTracking(arm_type, headless=None, tracking_camera=None, vision_camera=None, record_path=None):
     videoCap1 = None
     videoCap2 = None
     img2 = None
+    vision_lost = False
+
+    renderer = None
+    recorder = None
 
     def cleanUp():
+        if renderer is not None:
+            renderer.stop()
+        if recorder is not None:
+            recorder.close()
         if videoCap1 is not None:
-            videoCap1.release()
+            videoCap1.stop()
         if videoCap2 is not None:
-            videoCap2.release()
-        cv2.destroyAllWindows()
+            videoCap2.stop()
 
     atexit.register(cleanUp)
 
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s") # Status and latency reports
+    config = load_json_file("fileLoading/config.json") or {}
+    headless_settings = config.get("headless_settings", {})
+    if headless is None:
+        headless = headless_settings.get("enabled", False)
+
     # Open cameras (0 for the default camera, 1 for an additional camera)
     # Declare the type of robotic arm that is being used
-    robotic_arm = initialize_robotic_arm(arm_type)
+    multi_arm_settings = config.get("multi_arm_settings", {})
+    if multi_arm_settings.get("enabled"):
+        # Every listed arm follows the hand, each on its own dispatcher thread so their serial links run in parallel
+        arm_commands = MultiArmManager(config.get("shadow_settings"))
+        for index, entry in enumerate(multi_arm_settings["arms"]):
+            arm_commands.add(entry.get("name", f"arm{index + 1}"), initialize_robotic_arm(entry["arm_type"], entry), entry.get("offset"))
+        atexit.register(arm_commands.stop) # Registered after connect so it runs before the arms disconnect
+        telemetries = [(slot.name, slot.telemetry) for slot in arm_commands.slots if slot.telemetry is not None]
+    else:
+        robotic_arm = initialize_robotic_arm(arm_type)
+
+        # Arm commands run on their own thread so the camera loop never waits on the serial link
+        arm_commands = CommandDispatcher(robotic_arm)
+        atexit.register(arm_commands.stop) # Registered after connect so it runs before the arm disconnects
+        arm_commands = ShadowArm(arm_commands, config.get("shadow_settings")) # Drops commands that would not change anything
+        telemetry = getattr(robotic_arm, "telemetry", None)
+        telemetries = [(None, telemetry)] if telemetry is not None else []
+    # Sampled state of every arm with telemetry enabled, read without touching the serial links
+    alarms = {name: () for name, _ in telemetries}
     hand_physics = coordProcessing.HandPhysics()
 
 
     #Get the index of the cameras we want to us
-    cam1 = getCameraOne()
-    cam2 = getCameraTwo()
+    if headless:
+        # No GUI: the tracking camera comes from the caller or the config, the vision camera is display only
+        cam1 = parseCameraSource(tracking_camera if tracking_camera is not None else headless_settings.get("tracking_camera", 0))
+        cam2 = None
+        source1, source2 = cam1, cam2
+    elif tracking_camera is not None:
+        cam1 = parseCameraSource(tracking_camera)
+        cam2 = parseCameraSource(vision_camera)
+        source1, source2 = cam1, cam2
+    else:
+        from GUI.CameraSelector import getCameraOne, getCameraTwo, openCamera
+        cam1 = getCameraOne()
+        cam2 = getCameraTwo()
+
+        # Reuse the handles the camera selector already opened instead of closing and reopening the devices
+        source1 = openCamera(cam1)
+        source2 = openCamera(cam2) if cam2 is not None else None
 
 
-    videoCap1 = cv2.VideoCapture(cam1)  # Camera 1 for hand tracking
+    # Each camera is read on its own thread so a slow camera never stalls tracking
+    videoCap1 = CameraStream(source1, "TrackingCamera")  # Camera 1 for hand tracking
 
-    if(videoCap1 is None):
+    if not videoCap1.isOpened():
         print("Error: Camera 1 did not work correctly.")
         quit(1)
+    videoCap1.configure(config.get("capture_settings"))
+    videoCap1.start()
 
     if(cam2 is not None):
-        videoCap2 = cv2.VideoCapture(cam2)  # Camera 2 for live feed
+        videoCap2 = CameraStream(source2, "VisionCamera").start()  # Camera 2 for live feed
     else:
         videoCap2 = None
 
+    # Cameras can take seconds to deliver their first frame, wait for it once here instead of failing the first read
+    for stream in (videoCap1, videoCap2):
+        if stream is not None and not stream.waitForFirstFrame():
+            print(f"Error: {stream.name} did not deliver a frame within {STARTUP_TIMEOUT:.0f} seconds.")
+            quit(1)
+
     # Initialize required variables
     lastFrameTime = 0
     frame = 0
-    handSolution = mp.solutions.hands
-    hands = handSolution.Hands()
-    robotic_arm.enableRail(0) # Disable Rail
-    robotic_arm.set_gripper_state(0)
+    hands = createHandDetector(config.get("inference_settings"))
+    frame_pipeline = FramePipeline(config.get("frame_settings"), display=not headless)
+    pix_w, pix_h = frame_pipeline.display_size
+    arm_commands.enableRail(0) # Disable Rail
+    arm_commands.set_gripper_state(0)
     track = False
     controlMode = 1
-    lastGesture = 0
-
-    # Bring combined window to the foreground
-    cv2.namedWindow("Combined Camera Output", cv2.WINDOW_NORMAL)
-
-
+    gesture_settings = config.get("gesture_settings", {})
+    gesture_state = gestureInterpretation.GestureStateMachine(
+        gesture_settings.get("window_ms", gestureInterpretation.GESTURE_WINDOW_MS),
+        gesture_settings.get("hold_ms", gestureInterpretation.GESTURE_HOLD_MS),
+        gesture_settings.get("min_share", gestureInterpretation.GESTURE_MIN_SHARE))
+    landmark_points = np.empty((coordProcessing.NUM_LANDMARKS, 3), dtype=np.float32) # Reused by every recorded frame
+    latency = LatencyMonitor(config.get("latency_settings"))
+
+    # Optionally record landmarks and arm commands so the session can be replayed offline
+    recording_settings = dict(DEFAULT_RECORDING_SETTINGS)
+    recording_settings.update(config.get("recording_settings", {}))
+    if record_path is not None or recording_settings["enabled"]:
+        recorder = SessionRecorder(record_path or recording_settings["path"], pix_w, pix_h,
+                                   recording_settings["record_frames"], recording_settings["jpeg_quality"])
+        arm_commands = recorder.wrap(arm_commands)
+        logger.info("Recording session to %s.", recorder.path)
+
+    # Velocity mode: hand displacement from where tracking started becomes JOG commands instead of position targets
+    jog_control = JogController(arm_commands, config.get("jog_settings"))
+    if jog_control.enabled:
+        jog_control.configure()
+
+    # Bring combined window to the foreground, it is drawn on its own thread at a capped frame rate
     # cv2.resizeWindow("Combined Camera Output", 720, 360)
-    cv2.resizeWindow("Combined Camera Output", 1920, 1080)
+    if headless:
+        status = TrackingStatus(headless_settings.get("status_interval", STATUS_INTERVAL))
+        logger.info("Headless tracking started on camera %s.", cam1)
+    else:
+        renderer = FrameRenderer(max_fps=config.get("frame_settings", {}).get("max_render_fps", 30), window_size=(1920, 1080)).start()
 
     #todo figure out why the window isn't responding when opened at home we can comment out anycomands to the arm
 
@@ -140,120 +267,157 @@ def beginTracking(arm_type):
     # Video camera loop
     while True:
         frame += 1
-        # Reading images from both cameras
-        success1, img1 = videoCap1.read()
-        if videoCap2 is not None:
-            success2, img2 = videoCap2.read()
-        else:
-            im2 = None
-            success2 = True
-
-        # Ensure camera is working and define camera settings (including frame rate calculations)
-        if not(success1 and (videoCap2 is None or success2)): # Quit program if camera error occurs
-            print("Error: One camera did not work correctly.")
+        overlay = [] # Drawn by the renderer thread on its own copy of the frame
+        gesture = None
+        landmarks = None
+        # Wait for the next tracking frame, but only take whatever vision frame is newest
+        success1, img1, _, captureTime = videoCap1.read(wait=True)
+        if not success1:
+            if videoCap1.running:
+                continue # No new frame within the read timeout, the camera is only slow
+            print("Error: The tracking camera stopped delivering frames.") # Quit program if camera error occurs
             quit(1)
-        else:
-            (img1_resized, img2_resized, combined_img, imgRGB1) = camSettings(img1, img2)
-            recHands1 = hands.process(imgRGB1)
-
-            # FPS calculation for the first camera feed
-            thisFrameTime = time.time()
+        latency.beginFrame(captureTime)
+        if videoCap2 is not None:
+            success2, frame2, _, _ = videoCap2.read(wait=False)
+            if success2:
+                img2 = frame2
+            elif not vision_lost:
+                vision_lost = True # Keep showing its last frame, the vision feed is not needed for tracking
+                logger.warning("Vision camera stopped delivering frames, showing its last frame.")
+
+        # Define camera settings (including frame rate calculations)
+        (img1_resized, img2_resized, combined_img, imgRGB1) = frame_pipeline.compose(img1, img2)
+        latency.mark("preprocess")
+        recHands1 = hands.process(imgRGB1)
+        latency.mark("inference")
+
+        # FPS calculation for the first camera feed (no FPS until there are two frames to compare)
+        thisFrameTime = time.time()
+        if lastFrameTime > 0 and thisFrameTime > lastFrameTime:
             fps = 1 / (thisFrameTime - lastFrameTime)
-            lastFrameTime = thisFrameTime
-
             # Display FPS on the first camera feed
-            cv2.putText(combined_img, f'FPS: {int(fps)}', (20, 70), cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 0, 0), 3)
+            overlay.append(("text", f'FPS: {int(fps)}', (20, 70), 2, (0, 0, 0), 3))
+        lastFrameTime = thisFrameTime
 
         # Hand tracking and gesture recognition
         if recHands1.multi_hand_landmarks:
             for hand in recHands1.multi_hand_landmarks:
-                sum_x = sum_y = palm_x = palm_y = 0
-
-                # Draw landmarks on the hand
-                for datapoint_id, point in enumerate(hand.landmark):
-                    pix_h, pix_w, c = img1_resized.shape
-                    x, y = int(point.x * pix_w), int(point.y * pix_h)
-                    if datapoint_id in [MID_KNUCKLE_IDX, RING_KNUCKLE_IDX, WRIST_IDX]:
-                        cv2.circle(combined_img, (x, y), 10, (0, 0, 255), cv2.FILLED)
-                        sum_x += x
-                        sum_y += y
-                    else:
-                        cv2.circle(combined_img, (x, y), 10, (255, 0, 255), cv2.FILLED)
+                landmarks = hand.landmark
+
+                # Draw landmarks on the hand (nothing to draw on when headless)
+                if renderer is not None:
+                    for datapoint_id, point in enumerate(landmarks):
+                        x, y = int(point.x * pix_w), int(point.y * pix_h)
+                        if datapoint_id in [MID_KNUCKLE_IDX, RING_KNUCKLE_IDX, WRIST_IDX]:
+                            overlay.append(("circle", (x, y), 10, (0, 0, 255)))
+                        else:
+                            overlay.append(("circle", (x, y), 10, (255, 0, 255)))
 
                 # Calculate palm coordinates
-                palm_x = sum_x / 3
-                palm_y = sum_y / 3
-                cv2.circle(combined_img, (int(palm_x), int(palm_y)), 10, (255, 0, 0), cv2.FILLED)
-                print("\nX: ", round(palm_x), "  -  Y: ", round(palm_y))
-
-                invertedY = pix_h - palm_y # Invert Y because 0 Y is top of the camera
-                invertedX = pix_w - palm_x # Invert X because 0 X is left of the camera
-                normalPalm_x = invertedX / pix_w
-                lineaRail_x = palm_x / pix_w # linearRail x value will be different than an invertedX
-                palm_x = (normalPalm_x * 760) - 380 # Translate into a +/- 380 x-axis
-                palm_y = ((invertedY / pix_h) * 516) - 16 # Translate into a +500/-16 y-axis
-
-                print("Dobot X: ", round(palm_x), "  -  Dobot Y: ", round(palm_y))
-
-                palm_z = coordProcessing.CoordinateProcessing.determineZCoord(hand.landmark)
-
-            # Check for gesture updates
-            if frame % GESTURE_UPDATE_INTERVAL == 0:
-
-                # Gesture handling
-                gesture = gestureInterpretation.interpretHandGest(hand.landmark)
-                if lastGesture != gesture: # Only process gestures when the user intends one
-                    if gesture == 1:  # Toggle tracking
-                        track = not track
-                    elif gesture == 2:  # Rail control mode
-                        controlMode = 1
-                        robotic_arm.enableRail(1) # Enable Rail
-                    elif gesture == 3:  # Arm control mode
-                        controlMode = 2
-                        robotic_arm.enableRail(0) # Disable Rail
-                    elif gesture == 4:  # Close gripper
-                        robotic_arm.set_gripper_state(1)
-                    elif gesture == 5:  # Open gripper
-                        robotic_arm.set_gripper_state(0)
-                    lastGesture = gesture
-
-                frame = 0
+                palm_x, palm_y = coordProcessing.palmCentroid(landmarks, pix_w, pix_h)
+                overlay.append(("circle", (int(palm_x), int(palm_y)), 10, (255, 0, 0)))
+
+                palm_x, palm_y, lineaRail_x = coordProcessing.palmToDobot(palm_x, palm_y, pix_w, pix_h)
+
+                palm_z = coordProcessing.CoordinateProcessing.determineZCoord(landmarks)
+            latency.mark("coordinates")
+
+            # Classify every frame, the state machine only reports a gesture once it has been held long enough
+            gesture = gesture_state.update(gestureInterpretation.interpretHandGest(landmarks), captureTime)
+            if gesture is not None: # Only process gestures when the user intends one
+                if gesture == 1:  # Toggle tracking
+                    track = not track
+                    jog_control.reset() # Stop jogging, the hand position when tracking resumes is the new neutral point
+                elif gesture == 2:  # Rail control mode
+                    controlMode = 1
+                    jog_control.reset()
+                    arm_commands.enableRail(1) # Enable Rail
+                elif gesture == 3:  # Arm control mode
+                    controlMode = 2
+                    jog_control.reset()
+                    arm_commands.enableRail(0) # Disable Rail
+                elif gesture == 4:  # Close gripper
+                    arm_commands.set_gripper_state(1)
+                elif gesture == 5:  # Open gripper
+                    arm_commands.set_gripper_state(0)
+            latency.mark("gesture")
 
             # Predict next hand position using physics
-            predicted_position = hand_physics.predictNextPosition((palm_y, palm_x, palm_z), 0.1)
+            predicted_position = hand_physics.predictNextPosition((palm_y, palm_x, palm_z), 0.1, captureTime)
             lineaRail = lineaRail_x * 1000 # 1000 is perfect, if there are issues, its with the coordinate calibration
+            latency.mark("physics")
 
             # Movement handling (if track enables and predicted position is reachable then move to proposed position)
-            if track and coordProcessing.CoordinateProcessing.isPositionValid(controlMode, palm_y, palm_x, palm_z, lineaRail):
+            reachable = track and coordProcessing.CoordinateProcessing.isPositionValid(controlMode, palm_y, palm_x, palm_z, lineaRail)
+            if reachable and jog_control.enabled and controlMode == 2:
+                # A jog keeps the arm moving, so the position it is heading for has to be in the workspace as well
+                reachable = coordProcessing.CoordinateProcessing.isPositionValid(controlMode, *predicted_position, lineaRail)
+            latency.mark("reachability")
+            if track and jog_control.enabled:
+                # Velocity mode, a JOG command only goes out when the speed bucket of the hand's displacement changes
+                if not reachable:
+                    jogged = jog_control.stop() # Never jog out of the workspace
+                elif controlMode == 1:
+                    jogged = jog_control.moveRail(lineaRail)
+                else:
+                    jogged = jog_control.move(palm_y, palm_x, palm_z)
+                if jogged is not None:
+                    latency.trackCommand(jogged)
+                latency.mark("submit")
+                if reachable:
+                    overlay.append(("circle", (100, 100), 10, (255, 0, 0))) # Blue Tracking Indicator (Tracking Indicator)
+                else:
+                    overlay.append(("circle", (100, 100), 10, (0, 0, 255))) # Red Tracking Indicator (Not Tracking Indicator)
+            elif reachable:
                 if controlMode == 1:  # Rail control mode
-                    robotic_arm.rail_move_to(200, 0, 0, lineaRail)
-                    cv2.circle(combined_img, (100, 100), 10, (255, 0, 0), cv2.FILLED) # Blue Tracking Indicator (Tracking Indicator)
+                    latency.trackCommand(arm_commands.rail_move_to(200, 0, 0, lineaRail))
+                    latency.mark("submit")
+                    overlay.append(("circle", (100, 100), 10, (255, 0, 0))) # Blue Tracking Indicator (Tracking Indicator)
 
                 elif controlMode == 2:  # Arm control mode
-                    # Current position
-                    print("MOVING TO: ", predicted_position[0], predicted_position[1], predicted_position[2])
-                    robotic_arm.move_to(predicted_position[0], predicted_position[1], predicted_position[2])
-                    cv2.circle(combined_img, (100, 100), 10, (255, 0, 0), cv2.FILLED) # Blue Tracking Indicator (Tracking Indicator)
-            else:
-                cv2.circle(combined_img, (100, 100), 10, (0, 0, 255), cv2.FILLED) # Red Tracking Indicator (Not Tracking Indicator)
-
-            # Display the camera feed
-            # cv2.imshow("Combined Camera Output", combined_img)
-            # Get the current window size
-            win_name = "Combined Camera Output"
-            _, _, win_w, win_h = cv2.getWindowImageRect(win_name)
-
-            # Make sure width and height are valid before resizing
-            if win_w > 0 and win_h > 0:
-                display_img = cv2.resize(combined_img, (win_w, win_h))
+                    latency.trackCommand(arm_commands.move_to(predicted_position[0], predicted_position[1], predicted_position[2]))
+                    latency.mark("submit")
+                    overlay.append(("circle", (100, 100), 10, (255, 0, 0))) # Blue Tracking Indicator (Tracking Indicator)
             else:
-                display_img = combined_img
-
-            cv2.imshow(win_name, display_img)
-
-            # Detect if window is closed
-            if cv2.getWindowProperty(win_name, cv2.WND_PROP_VISIBLE) < 1:
-                break
+                overlay.append(("circle", (100, 100), 10, (0, 0, 255))) # Red Tracking Indicator (Not Tracking Indicator)
+
+        elif jog_control.enabled:
+            jog_control.stop() # Never keep jogging without a hand to follow
+
+        for row, (name, telemetry) in enumerate(telemetries):
+            sample = telemetry.latest()
+            if sample is None:
+                continue
+            label = "Arm" if name is None else f"Arm {name}"
+            if sample.alarms != alarms[name]:
+                alarms[name] = sample.alarms
+                if sample.alarms:
+                    logger.warning("%s alarms raised: %s", label, list(sample.alarms))
+                else:
+                    logger.info("%s alarms cleared.", label)
+            x, y, z = sample.pose[:3]
+            overlay.append(("text", f"{label}: {x:.0f}, {y:.0f}, {z:.0f}", (20, 460 + 30 * row), 0.8, (0, 0, 0), 2)) # Below the latency lines
+
+        latency.endFrame()
+        latency.report()
+
+        if recorder is not None:
+            points = None if landmarks is None else coordProcessing.landmarksToArray(landmarks, landmark_points)
+            recorder.writeFrame(captureTime, points, detectedHandedness(recHands1), img1)
+
+        if headless:
+            status.update(bool(recHands1.multi_hand_landmarks), gesture)
+            status.report(track, controlMode, arm_commands, videoCap1, telemetries)
+            continue
+
+        # Hand the frame and its overlay to the render thread (copied only when a redraw is due)
+        if renderer.isDue():
+            renderer.publish(combined_img, overlay + latency.overlay())
+
+        # Detect if window is closed
+        if renderer.closed:
+            break
 
 
     # old shut off function
@@ -264,3 +428,16 @@ def beginTracking(arm_type):
         #     exit(0)
         #     break
 
+
+# Run the tracker without the user interface, e.g. headless on a server or kiosk:
+#   python -m GUI.Tracker --headless --tracking-camera 0
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hand gesture tracking for the robotic arm")
+    parser.add_argument("--arm", default="Dobot", help="Arm type from fileLoading/config.json")
+    parser.add_argument("--headless", action="store_true", default=None, help="Run without any windows, report status through logs")
+    parser.add_argument("--tracking-camera", help="Tracking camera index or path (skips the camera selector)")
+    parser.add_argument("--vision-camera", help="Vision camera index or path (ignored when headless)")
+    parser.add_argument("--record", help="Record landmarks and arm commands to this session file")
+    args = parser.parse_args()
+
+    beginTracking(args.arm, args.headless, args.tracking_camera, args.vision_camera, args.record)
@@ -33,6 +33,32 @@ def load_json_file(relative_path):
         print(f"Error loading JSON file {relative_path}: {e}")
         return None
 
+# Writable folder for settings the program remembers between runs (the package folder is read-only in the exe)
+USER_DATA_DIR = os.path.join(os.path.expanduser("~"), ".RoboticArmGestureControl")
+
+def load_user_json_file(file_name):
+    """Load a JSON file from the user data folder, returns None if it does not exist or is invalid"""
+    full_path = os.path.join(USER_DATA_DIR, file_name)
+    if not os.path.exists(full_path):
+        return None
+    try:
+        with open(full_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Error loading JSON file {full_path}: {e}")
+        return None
+
+def save_user_json_file(file_name, data):
+    """Save data as a JSON file in the user data folder"""
+    try:
+        os.makedirs(USER_DATA_DIR, exist_ok=True)
+        with open(os.path.join(USER_DATA_DIR, file_name), "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        return True
+    except Exception as e:
+        print(f"Error saving JSON file {file_name}: {e}")
+        return False
+
 # This function loads a DLL from the package and returns its path for CDLL function
 def loadDll(path, dll_name, end):
     global all_Paths  # Declare global to modify the variable outside the function